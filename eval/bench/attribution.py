@@ -0,0 +1,68 @@
+"""Benchmark word->speaker attribution (assign_speakers_max_overlap) by meeting length.
+
+Usage: python -m eval.bench.attribution [--words 1000 10000 100000] [--naive-max 10000]
+
+Reuses the synthetic meetings from eval.bench.confidence (a CHiME-6 session is
+~20-40k words), keeping only a fifth of the turns so most words fall in gaps
+and the nearest-midpoint fallback is exercised too, and times the indexed attribution
+against the original per-word max()/min() scan over every turn. Prints a
+markdown table: words, turns, seconds for each, speedup.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import time
+
+from eval.bench.confidence import synthetic_meeting
+from eval.engines.base import _overlap, assign_speakers_max_overlap
+
+
+def _naive(words, turns):
+    for w in words:
+        best = max(turns, key=lambda t: _overlap(w["start"], w["end"], t["start"], t["end"]))
+        if _overlap(w["start"], w["end"], best["start"], best["end"]) > 0.0:
+            w["speaker"] = best["speaker"]
+        else:
+            wm = (w["start"] + w["end"]) / 2.0
+            w["speaker"] = min(turns, key=lambda t: abs(wm - (t["start"] + t["end"]) / 2.0))["speaker"]
+    return words
+
+
+def _case(n):
+    words, diar = synthetic_meeting(n)
+    turns = [{"speaker": spk, "start": s, "end": e} for s, e, spk in diar[::10] + diar[5::10]]
+    words = [{"word": "w", "start": w["start"], "end": w["end"], "speaker": None} for w in words]
+    return words, turns
+
+
+def run(word_counts, naive_max=10000):
+    print("| words | turns | indexed sec | naive sec | speedup |")
+    print("| --- | --- | --- | --- | --- |")
+    for n in word_counts:
+        words, turns = _case(n)
+        t0 = time.perf_counter()
+        got = assign_speakers_max_overlap(copy.deepcopy(words), turns)
+        fast = time.perf_counter() - t0
+        if n <= naive_max:
+            t0 = time.perf_counter()
+            want = _naive(copy.deepcopy(words), turns)
+            slow = time.perf_counter() - t0
+            assert [w["speaker"] for w in got] == [w["speaker"] for w in want]
+            naive, speedup = f"{slow:.3f}", f"{slow / fast:.0f}x"
+        else:
+            naive = speedup = "-"
+        print(f"| {n} | {len(turns)} | {fast:.3f} | {naive} | {speedup} |")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--words", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--naive-max", type=int, default=10000,
+                    help="skip the quadratic reference above this many words")
+    args = ap.parse_args(argv)
+    run(args.words, args.naive_max)
+
+
+if __name__ == "__main__":
+    main()
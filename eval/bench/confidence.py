@@ -0,0 +1,85 @@
+"""Benchmark word_confidences on synthetic meetings of growing length.
+
+Usage: python -m eval.bench.confidence [--words 1000 10000 100000] [--naive-max 10000]
+
+Builds a synthetic meeting (~7 words per diarization turn, like real
+conversational speech) for each word count and times the interval-indexed
+word_confidences against the original every-word-x-every-turn scan. The naive
+scan is skipped above --naive-max words (it is quadratic). Prints a markdown
+table: words, turns, seconds for each, speedup.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from tathurell.confidence import word_confidences
+
+
+def _naive(words, diar_segments):
+    out = []
+    for w in words:
+        ws, we, spk = w["start"], w["end"], w["speaker"]
+        assigned = total = 0.0
+        for ss, se, s in diar_segments:
+            overlap = min(we, se) - max(ws, ss)
+            if overlap > 0:
+                total += overlap
+                if s == spk:
+                    assigned += overlap
+        out.append(assigned / total if total > 0 else 0.0)
+    return out
+
+
+def synthetic_meeting(n_words, seed=0):
+    """(words, diar_segments) with speaker turns of ~7 words and some overlap."""
+    rng = random.Random(seed)
+    speakers = [f"SPEAKER_{i:02d}" for i in range(4)]
+    words, diar, t = [], [], 0.0
+    while len(words) < n_words:
+        spk = rng.choice(speakers)
+        start = t
+        for _ in range(rng.randint(3, 12)):
+            d = rng.uniform(0.15, 0.5)
+            words.append({"start": t, "end": t + d, "speaker": spk})
+            t += d + rng.uniform(0.0, 0.2)
+        diar.append((start, t + rng.uniform(0.0, 0.4), spk))  # tail overlaps next turn
+    return words[:n_words], diar
+
+
+def _time(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return time.perf_counter() - t0, out
+
+
+def run(word_counts, naive_max=10000):
+    print("| words | turns | indexed sec | naive sec | speedup |")
+    print("| --- | --- | --- | --- | --- |")
+    rows = []
+    for n in word_counts:
+        words, diar = synthetic_meeting(n)
+        fast, got = _time(word_confidences, words, diar)
+        if n <= naive_max:
+            slow, want = _time(_naive, words, diar)
+            assert got == want, "indexed result differs from the full scan"
+            naive, speedup = f"{slow:.3f}", f"{slow / fast:.0f}x"
+        else:
+            naive = speedup = "-"
+        rows.append((n, len(diar), fast))
+        print(f"| {n} | {len(diar)} | {fast:.3f} | {naive} | {speedup} |")
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--words", type=int, nargs="+", default=[1000, 10000, 100000])
+    ap.add_argument("--naive-max", type=int, default=10000,
+                    help="skip the quadratic reference above this many words")
+    args = ap.parse_args(argv)
+    run(args.words, args.naive_max)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark the cold CLI against the CLI backed by a warm daemon.
+
+Usage: python -m eval.bench.daemon AUDIO [--durations 30 300 3600] [--model large-v3]
+
+Cuts AUDIO (tiled if it is shorter) into clips of each duration, then times
+end-to-end `tathurell_transcribe.py` runs as a user sees them: once with
+--no-daemon (imports whisperx and loads the models every run) and once
+against a tathurell.daemon started for the benchmark and warmed by one short
+request. Both runs use --no-cache, so every run does the full pipeline.
+Prints a markdown table: wall seconds each way, the saving, and the speedup.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+from tathurell import daemon
+from tathurell.audio import SAMPLE_RATE, decode, write_wav
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+CLI = os.path.join(ROOT, "tathurell_transcribe.py")
+
+
+def _clip(audio, seconds, path):
+    n = int(seconds * SAMPLE_RATE)
+    write_wav(np.resize(audio, n), path)  # np.resize repeats the audio to fill n
+    return path
+
+
+def _cli(audio_path, env, *flags):
+    t0 = time.perf_counter()
+    subprocess.run([sys.executable, CLI, audio_path, "--no-ui", "--no-cache",
+                    "--output", os.devnull, *flags],
+                   env=env, cwd=ROOT, check=True, stdin=subprocess.DEVNULL,
+                   stdout=subprocess.DEVNULL)
+    return time.perf_counter() - t0
+
+
+def run(audio_path, durations, model="large-v3"):
+    audio = decode(audio_path)
+    rows = []
+    with tempfile.TemporaryDirectory(prefix="tathurell_bench_") as tmp:
+        env = {**os.environ, "TATHURELL_DAEMON_SOCKET": os.path.join(tmp, "d.sock")}
+        server = subprocess.Popen([sys.executable, "-m", "tathurell.daemon", "serve"],
+                                  env=env, cwd=ROOT)
+        try:
+            while daemon.ping(env["TATHURELL_DAEMON_SOCKET"]) is None:
+                if server.poll() is not None:
+                    raise RuntimeError("the daemon exited on start-up")
+                time.sleep(0.1)
+            # Load the models (same options as the timed runs) before timing.
+            _cli(_clip(audio, 5, os.path.join(tmp, "warm.wav")), env, "--model", model)
+            for sec in durations:
+                clip = _clip(audio, sec, os.path.join(tmp, f"{sec}.wav"))
+                cold = _cli(clip, env, "--model", model, "--no-daemon")
+                warm = _cli(clip, env, "--model", model)
+                rows.append((sec, cold, warm))
+        finally:
+            daemon.stop(env["TATHURELL_DAEMON_SOCKET"])
+            server.wait(timeout=60)
+
+    print(f"audio: {audio_path} ({len(audio) / SAMPLE_RATE:.0f}s, tiled to each duration)\n")
+    print("| audio | cold CLI s | daemon CLI s | saved s | speedup |")
+    print("| --- | --- | --- | --- | --- |")
+    for sec, cold, warm in rows:
+        print(f"| {sec}s | {cold:.1f} | {warm:.1f} | {cold - warm:.1f} | {cold / warm:.2f}x |")
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("audio_path")
+    ap.add_argument("--durations", type=int, nargs="+", default=[30, 300, 3600])
+    ap.add_argument("--model", default="large-v3")
+    args = ap.parse_args(argv)
+    run(args.audio_path, args.durations, args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Import-time regression check for the CLI and web app entry points.
+
+Usage: python -m eval.bench.importtime [--runs 5] [--top 5]
+
+Imports each entry point in a fresh interpreter under `python -X importtime`
+and keeps the fastest of `--runs` cumulative times. An entry point fails if
+that time is over its budget, or if it imports any of HEAVY (the model
+stack, which is meant to load only when the first transcription starts).
+Prints a markdown table with the slowest direct imports of each entry point,
+and exits 1 on any failure, so it can gate CI.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# entry point -> (module, budget in ms). The budgets leave room for slower
+# machines while sitting far below the seconds torch alone takes to import.
+ENTRY_POINTS = {
+    "cli": ("tathurell_transcribe", 400),
+    "webapp": ("tathurell.webapp", 800),
+}
+HEAVY = ("torch", "whisperx", "pandas", "pyannote", "faster_whisper", "ctranslate2",
+         "transformers")
+
+
+def parse_importtime(stderr):
+    """`-X importtime` output -> [(module, self_us, cumulative_us, depth)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # the header line
+        name = parts[2][1:].rstrip()  # one space after the "|", then 2 per level
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(parts[0]), int(parts[1]), depth))
+    return rows
+
+
+def measure(module):
+    """Import `module` in a fresh interpreter -> (cumulative ms, rows)."""
+    env = {k: v for k, v in os.environ.items() if k != "PYTHONIMPORTTIME"}
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                          cwd=ROOT, env=env, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    rows = parse_importtime(proc.stderr)
+    total = next(cum for name, _, cum, _ in reversed(rows) if name == module)
+    return total / 1000, rows
+
+
+def heavy_imports(rows):
+    """The HEAVY packages among the imported modules."""
+    return sorted({name.split(".")[0] for name, *_ in rows} & set(HEAVY))
+
+
+def run(runs=5, top=5):
+    failed = False
+    print("| entry | module | import ms (best of %d) | budget ms | heavy imports | slowest "
+          "direct imports | ok |" % runs)
+    print("| --- | --- | --- | --- | --- | --- | --- |")
+    for entry, (module, budget) in ENTRY_POINTS.items():
+        results = [measure(module) for _ in range(runs)]
+        ms, rows = min(results, key=lambda r: r[0])
+        heavy = heavy_imports(rows)
+        direct = sorted((r for r in rows if r[3] == 1), key=lambda r: -r[2])[:top]
+        slowest = ", ".join(f"{name} {cum / 1000:.0f}" for name, _, cum, _ in direct)
+        ok = ms <= budget and not heavy
+        failed |= not ok
+        print(f"| {entry} | {module} | {ms:.0f} | {budget} | {', '.join(heavy) or '-'} | "
+              f"{slowest} | {'yes' if ok else 'NO'} |")
+    return not failed
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--top", type=int, default=5, help="slowest direct imports to list")
+    args = ap.parse_args(argv)
+    sys.exit(0 if run(args.runs, args.top) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Benchmark sentence realignment: vendored reference vs the linear engine.
+
+Usage: python -m eval.bench.realign [--words 10000 100000]
+
+Builds a synthetic transcript (sentences of 3-40 words, speaker runs with
+boundary slivers) and times the vendored
+get_realigned_ws_mapping_with_punctuation path against realign_speakers as the
+pipeline calls it (inplace=True), checking both give the same labels. Prints a
+markdown table: words, seconds for each, speedup.
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from tathurell.realign import get_realigned_ws_mapping_with_punctuation, realign_speakers
+
+
+def synthetic_transcript(n_words, seed=0):
+    rng = random.Random(seed)
+    words, spk = [], "SPEAKER_00"
+    while len(words) < n_words:
+        if rng.random() < 0.5:
+            spk = f"SPEAKER_{rng.randint(0, 3):02d}"
+        length = rng.randint(3, 40)
+        for i in range(length):
+            label = spk if rng.random() > 0.08 else f"SPEAKER_{rng.randint(0, 3):02d}"
+            words.append({"word": "word." if i == length - 1 else "word",
+                          "start": 0.0, "end": 0.0, "speaker": label})
+    return words[:n_words]
+
+
+def run(word_counts):
+    print("| words | vendored sec | linear sec | speedup |")
+    print("| --- | --- | --- | --- |")
+    for n in word_counts:
+        words = synthetic_transcript(n)
+        t0 = time.perf_counter()
+        want = get_realigned_ws_mapping_with_punctuation(words)
+        slow = time.perf_counter() - t0
+        mine = [dict(w) for w in words]  # inplace mutates; keep the input pristine
+        t0 = time.perf_counter()
+        got = realign_speakers(mine, inplace=True)
+        fast = time.perf_counter() - t0
+        assert [w["speaker"] for w in got] == [w["speaker"] for w in want]
+        print(f"| {n} | {slow:.3f} | {fast:.3f} | {slow / fast:.1f}x |")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--words", type=int, nargs="+", default=[10000, 100000])
+    args = ap.parse_args(argv)
+    run(args.words)
+
+
+if __name__ == "__main__":
+    main()
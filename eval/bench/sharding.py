@@ -0,0 +1,70 @@
+"""Benchmark sharded ASR + alignment against the single-process path.
+
+Usage: python -m eval.bench.sharding AUDIO [--shards 2 4 8] [--model large-v3]
+
+Decodes AUDIO once, then times ASR + alignment (the stages sharding
+parallelises; diarization is identical in both modes and excluded) for the
+current single-process path and for each shard count. Worker start-up and
+model loading are excluded by a warm-up pass, so the numbers compare steady
+state. Prints a markdown table: wall seconds, real-time factor, speedup, words.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+from tathurell.ffmpeg import ensure_ffmpeg_on_path
+from tathurell.sharding import SAMPLE_RATE, ShardedASR
+
+
+def _words(result):
+    return sum(len(seg.get("words", [])) for seg in result["segments"])
+
+
+def run(audio_path, shard_counts, model="large-v3"):
+    import whisperx
+
+    from tathurell.whisperx_core import WhisperXTranscriber
+
+    ensure_ffmpeg_on_path()
+    audio = whisperx.load_audio(audio_path)
+    dur = len(audio) / SAMPLE_RATE
+    noop = lambda _stage: None  # noqa: E731
+    rows = []
+
+    base = WhisperXTranscriber(model=model)
+    base._asr_and_align(audio[: SAMPLE_RATE * 30], noop, None)  # warm-up (align model)
+    t0 = time.perf_counter()
+    result = base._asr_and_align(audio, noop, None)
+    single = time.perf_counter() - t0
+    rows.append(("1 (in-process)", single, _words(result)))
+
+    for n in shard_counts:
+        sharded = ShardedASR(model, "cpu", "int8", n)
+        try:
+            sharded.transcribe(audio[: SAMPLE_RATE * 30 * n])  # start + warm every worker
+            t0 = time.perf_counter()
+            result = sharded.transcribe(audio)
+            rows.append((str(n), time.perf_counter() - t0, _words(result)))
+        finally:
+            sharded.close()
+
+    print(f"audio: {audio_path} ({dur:.0f}s)\n")
+    print("| shards | sec | RTF | speedup | words |")
+    print("| --- | --- | --- | --- | --- |")
+    for label, sec, words in rows:
+        print(f"| {label} | {sec:.1f} | {sec / dur:.3f} | {single / sec:.2f}x | {words} |")
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("audio_path")
+    ap.add_argument("--shards", type=int, nargs="+", default=[2, 4])
+    ap.add_argument("--model", default="large-v3")
+    args = ap.parse_args(argv)
+    run(args.audio_path, args.shards, args.model)
+
+
+if __name__ == "__main__":
+    main()
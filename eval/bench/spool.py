@@ -0,0 +1,63 @@
+"""Benchmark spool-fleet throughput against the number of workers.
+
+Usage: python -m eval.bench.spool AUDIO [--workers 1 2 4] [--jobs 8] [--model large-v3]
+
+For each worker count, queues AUDIO `--jobs` times in a fresh spool and
+drains it with that many local worker processes (tathurell.spool stand-ins
+for nodes), each given an equal share of the cores and no result cache.
+Throughput is measured over the done records, from the first job's start to
+the last job's finish, so the per-worker model load is excluded. Prints a
+markdown table: jobs per minute, speedup over one worker, scaling efficiency.
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import tempfile
+
+from tathurell.spool import Spool, run_local_fleet
+
+
+def _uncached(model, threads):
+    from tathurell.whisperx_core import WhisperXTranscriber
+
+    return WhisperXTranscriber(model=model, threads=threads)
+
+
+def run(audio_path, worker_counts, jobs=8, model="large-v3"):
+    rows = []
+    cores = os.cpu_count() or 1
+    for n in worker_counts:
+        with tempfile.TemporaryDirectory(prefix="tathurell_spool_") as root:
+            spool = Spool(root)
+            for _ in range(jobs):
+                spool.submit(audio_path)
+            factory = functools.partial(_uncached, model, max(1, cores // n))
+            run_local_fleet(root, factory, n, exit_when_empty=True, poll_sec=0.2)
+            st = spool.status()
+            rows.append((n, st["jobs_per_min"], st["mean_job_sec"], st["failed"]))
+
+    base = rows[0][1] / rows[0][0]  # per-worker rate of the first row
+    print(f"audio: {audio_path}, {jobs} jobs per run, {cores} cores\n")
+    print("| workers | jobs/min | mean job s | speedup | efficiency | failed |")
+    print("| --- | --- | --- | --- | --- | --- |")
+    for n, rate, job_sec, failed in rows:
+        speedup = rate / base
+        print(f"| {n} | {rate:.2f} | {job_sec:.1f} | {speedup:.2f}x | "
+              f"{speedup / n:.0%} | {failed} |")
+    return rows
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("audio_path")
+    ap.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    ap.add_argument("--jobs", type=int, default=8)
+    ap.add_argument("--model", default="large-v3")
+    args = ap.parse_args(argv)
+    run(args.audio_path, args.workers, args.jobs, args.model)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""Benchmark the post-ASR stages on word dicts vs a WordTable.
+
+Usage: python -m eval.bench.wordtable [--words 100000]
+
+Runs what happens after ASR on a synthetic transcript (eval.bench.confidence's
+meeting generator): build the word list, realign speakers, attach
+confidences, group runs and pick speaker samples. It runs once over a list
+of dicts (the previous pipeline shape) and once over a WordTable. Peak traced
+memory (tracemalloc), memory still held by the result, and wall time are
+reported for each. Prints a markdown
+table.
+"""
+from __future__ import annotations
+
+import argparse
+import time
+import tracemalloc
+
+from eval.bench.confidence import synthetic_meeting
+from tathurell.confidence import word_confidences
+from tathurell.naming import group_by_speaker
+from tathurell.realign import realign_speakers
+from tathurell.sampling import pick_speaker_samples
+from tathurell.wordtable import WordTable
+
+
+def _as_dicts(raw, diar):
+    words = [{"word": w["word"], "start": w["start"], "end": w["end"],
+              "speaker": w["speaker"]} for w in raw]
+    words = realign_speakers(words, inplace=True)
+    for w, c in zip(words, word_confidences(words, diar)):
+        w["confidence"] = c
+    return words, group_by_speaker(words), pick_speaker_samples(words)
+
+
+def _as_table(raw, diar):
+    words = WordTable([w["word"] for w in raw], [w["start"] for w in raw],
+                      [w["end"] for w in raw], [w["speaker"] for w in raw])
+    realign_speakers(words, inplace=True)
+    words.set_confidence(word_confidences(words, diar))
+    return words, group_by_speaker(words), pick_speaker_samples(words)
+
+
+def _measure(fn, raw, diar):
+    """(seconds, peak bytes, bytes still held by the result, result). Timed on
+    an untraced run; tracemalloc slows allocation-heavy code unevenly."""
+    t0 = time.perf_counter()
+    fn(raw, diar)
+    sec = time.perf_counter() - t0
+    tracemalloc.start()
+    out = fn(raw, diar)
+    held, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return sec, peak, held, out
+
+
+def run(n_words):
+    raw, diar = synthetic_meeting(n_words)
+    for w, tok in zip(raw, ("so", "we", "out", "of", "yes.", "ok", "right?") * n_words):
+        w["word"] = tok
+    rows = []
+    for label, fn in (("dicts", _as_dicts), ("WordTable", _as_table)):
+        sec, peak, held, out = _measure(fn, raw, diar)
+        rows.append((label, sec, peak, held, out))
+    assert rows[0][4][1] == rows[1][4][1], "grouped runs differ"
+    print(f"{n_words} words\n")
+    print("| representation | sec | peak MB | held MB |")
+    print("| --- | --- | --- | --- |")
+    for label, sec, peak, held, _ in rows:
+        print(f"| {label} | {sec:.2f} | {peak / 1e6:.1f} | {held / 1e6:.1f} |")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--words", type=int, default=100000)
+    args = ap.parse_args(argv)
+    run(args.words)
+
+
+if __name__ == "__main__":
+    main()
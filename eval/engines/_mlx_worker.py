@@ -6,22 +6,28 @@ verified 2026-06-14). The mlx engine adapter needs torch (for pyannote
 diarization), so it runs this worker as a separate process — which imports ONLY
 mlx_whisper, never torch — and reads the word list back as JSON on stdout.
 
-Usage: python -m eval.engines._mlx_worker <audio_path>
+Usage: python -m eval.engines._mlx_worker <audio_path | decoded.npy>
 Output: JSON list of {"word","start","end"} to stdout.
 
+A .npy argument is a 16 kHz mono float32 decode (tathurell.audio); it is
+memory-mapped and passed to mlx_whisper as an array, so the file is not
+decoded again here.
+
 Keep this module torch-free: import nothing that pulls in torch.
 """
 import json
 import sys
 
 import mlx_whisper
+import numpy as np
 
 MLX_REPO = "mlx-community/whisper-large-v3-mlx"
 
 
 def transcribe_words(audio_path: str) -> list:
+    audio = np.load(audio_path, mmap_mode="r") if audio_path.endswith(".npy") else audio_path
     out = mlx_whisper.transcribe(
-        audio_path, path_or_hf_repo=MLX_REPO, word_timestamps=True
+        audio, path_or_hf_repo=MLX_REPO, word_timestamps=True
     )
     words = []
     for seg in out["segments"]:
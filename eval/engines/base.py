@@ -9,9 +9,17 @@ word to the diarization turn it overlaps most in time; if it overlaps no turn
 (falls in a silence gap or past the last turn), assign the nearest turn by
 midpoint distance. This replaces the original "first turn not yet ended"
 heuristic, which ignored word end and turn start.
+
+Attribution is sub-quadratic so full-session corpora stay cheap: overlapping
+turns come from tathurell.intervals' sweep, and the fallback bisects sorted
+turn midpoints. Ties resolve exactly as a linear scan of `turns` would (the
+earliest turn in list order wins).
 """
+from bisect import bisect_left
 from typing import Protocol
 
+from tathurell.intervals import overlap_candidates
+
 
 class Engine(Protocol):
     name: str
@@ -25,16 +33,44 @@ def _overlap(a_start, a_end, b_start, b_end):
     return max(0.0, min(a_end, b_end) - max(a_start, b_start))
 
 
+def _nearest_by_midpoint(mids, wm):
+    """Index of the turn whose midpoint is nearest wm; ties -> lowest index.
+
+    mids: sorted [(midpoint, turn index)]. Distance only grows moving away
+    from wm's insertion point, so the tied-nearest turns form a contiguous
+    run on each side of it.
+    """
+    pos = bisect_left(mids, (wm,))
+    left = abs(wm - mids[pos - 1][0]) if pos > 0 else float("inf")
+    right = abs(wm - mids[pos][0]) if pos < len(mids) else float("inf")
+    best = min(left, right)
+    found = []
+    i = pos - 1
+    while i >= 0 and abs(wm - mids[i][0]) == best:
+        found.append(mids[i][1])
+        i -= 1
+    i = pos
+    while i < len(mids) and abs(wm - mids[i][0]) == best:
+        found.append(mids[i][1])
+        i += 1
+    return min(found)
+
+
 def assign_speakers_max_overlap(words, turns):
-    for w in words:
-        if not turns:
+    if not turns:
+        for w in words:
             w["speaker"] = None
-            continue
-        best = max(turns, key=lambda t: _overlap(w["start"], w["end"], t["start"], t["end"]))
-        if _overlap(w["start"], w["end"], best["start"], best["end"]) > 0.0:
-            w["speaker"] = best["speaker"]
-        else:
-            wm = (w["start"] + w["end"]) / 2.0
-            nearest = min(turns, key=lambda t: abs(wm - (t["start"] + t["end"]) / 2.0))
-            w["speaker"] = nearest["speaker"]
+        return words
+    spans = [(t["start"], t["end"]) for t in turns]
+    mids = sorted(((t["start"] + t["end"]) / 2.0, i) for i, t in enumerate(turns))
+    cands = overlap_candidates(spans, [(w["start"], w["end"]) for w in words])
+    for w, idx in zip(words, cands):
+        best, best_ov = None, 0.0
+        for i in idx:  # ascending, so the first maximal turn wins as with max()
+            ov = _overlap(w["start"], w["end"], spans[i][0], spans[i][1])
+            if ov > best_ov:
+                best, best_ov = i, ov
+        if best is None:
+            best = _nearest_by_midpoint(mids, (w["start"] + w["end"]) / 2.0)
+        w["speaker"] = turns[best]["speaker"]
     return words
@@ -16,11 +16,12 @@ import subprocess
 import sys
 from pathlib import Path
 
+import numpy as np
 import torch
-import torchaudio
 from pyannote.audio import Pipeline
 
 from eval.engines.base import assign_speakers_max_overlap
+from tathurell.audio import SAMPLE_RATE, default_store
 
 # Repo root (parent of the eval/ package) so the subprocess can `-m eval...`.
 _REPO_ROOT = Path(__file__).resolve().parents[2]
@@ -35,9 +36,9 @@ class MlxWhisperPyannote:
             "pyannote/speaker-diarization-3.1", token=os.environ["HF_TOKEN"]
         ).to(torch.device("mps"))
 
-    def _diarize(self, audio_path):
-        waveform, sr = torchaudio.load(audio_path)
-        out = self._dia({"waveform": waveform, "sample_rate": sr})
+    def _diarize(self, audio):
+        waveform = torch.from_numpy(np.asarray(audio))[None, :]
+        out = self._dia({"waveform": waveform, "sample_rate": SAMPLE_RATE})
         # pyannote 4.x returns a DiarizeOutput whose Annotation is
         # .speaker_diarization; pyannote 3.x returned the Annotation directly.
         annotation = getattr(out, "speaker_diarization", out)
@@ -46,10 +47,10 @@ class MlxWhisperPyannote:
             for turn, _, spk in annotation.itertracks(yield_label=True)
         ]
 
-    def _asr(self, audio_path):
-        """Run mlx-whisper in a torch-free subprocess; return word dicts."""
+    def _asr(self, decoded_path):
+        """Run mlx-whisper in a torch-free subprocess on the decoded .npy; return word dicts."""
         proc = subprocess.run(
-            [sys.executable, "-m", "eval.engines._mlx_worker", audio_path],
+            [sys.executable, "-m", "eval.engines._mlx_worker", decoded_path],
             capture_output=True,
             text=True,
             cwd=str(_REPO_ROOT),
@@ -61,4 +62,7 @@ class MlxWhisperPyannote:
         return json.loads(proc.stdout)
 
     def transcribe(self, audio_path):
-        return assign_speakers_max_overlap(self._asr(audio_path), self._diarize(audio_path))
+        # Decode once: diarization uses the mapped array, the worker maps the same .npy.
+        store = default_store()
+        audio = store.load(audio_path, writable=True)  # torch.from_numpy wants writable
+        return assign_speakers_max_overlap(self._asr(store.path(audio_path)), self._diarize(audio))
@@ -8,12 +8,11 @@ import os
 
 import numpy as np
 import torch
-import torchaudio
-from pydub import AudioSegment
 from vosk import Model, KaldiRecognizer
 from pyannote.audio import Pipeline
 
 from eval.engines.base import assign_speakers_max_overlap
+from tathurell.audio import SAMPLE_RATE, load_audio
 
 VOSK_MODEL = "/Users/benmorsillo/code/ASSISTANTS/JOAN/models/vosk-model-en-us-0.42-gigaspeech"
 
@@ -28,9 +27,9 @@ class VoskPyannote:
             "pyannote/speaker-diarization-3.1", token=os.environ["HF_TOKEN"]
         ).to(torch.device("mps"))
 
-    def _diarize(self, audio_path):
-        waveform, sr = torchaudio.load(audio_path)
-        out = self._dia({"waveform": waveform, "sample_rate": sr})
+    def _diarize(self, audio):
+        waveform = torch.from_numpy(np.asarray(audio))[None, :]
+        out = self._dia({"waveform": waveform, "sample_rate": SAMPLE_RATE})
         # pyannote 4.x returns a DiarizeOutput whose Annotation is
         # .speaker_diarization; pyannote 3.x returned the Annotation directly.
         annotation = getattr(out, "speaker_diarization", out)
@@ -39,22 +38,14 @@ class VoskPyannote:
             for turn, _, spk in annotation.itertracks(yield_label=True)
         ]
 
-    def _asr(self, audio_path):
-        rec = KaldiRecognizer(self._model, 16000)
+    def _asr(self, audio):
+        rec = KaldiRecognizer(self._model, SAMPLE_RATE)
         rec.SetWords(True)
-        # set_sample_width(2) forces 16-bit PCM. The corpus loaders emit float32
-        # WAVs; casting those samples straight to int16 truncates every value in
-        # [-1, 1] to 0 (silence), which makes vosk error or emit garbage. pydub's
-        # set_sample_width(2) does the proper float->int16 rescaling first.
-        audio = (
-            AudioSegment.from_file(audio_path)
-            .set_frame_rate(16000)
-            .set_channels(1)
-            .set_sample_width(2)
-        )
-        # get_array_of_samples() returns the raw PCM samples without any header,
-        # unlike np.frombuffer(wav_with_header) which would include the 44-byte WAV header.
-        pcm = np.array(audio.get_array_of_samples(), dtype=np.int16)
+        # vosk wants 16-bit PCM. The decoded audio is float32 in [-1, 1]; casting
+        # it straight to int16 truncates every sample to 0 (silence), which makes
+        # vosk error or emit garbage, so rescale first. The decode came from
+        # s16le / 32768, so this recovers ffmpeg's samples exactly.
+        pcm = np.clip(np.round(np.asarray(audio) * 32768.0), -32768, 32767).astype(np.int16)
         words = []
         for i in range(0, len(pcm), 4000):
             if rec.AcceptWaveform(pcm[i:i + 4000].tobytes()):
@@ -68,6 +59,8 @@ class VoskPyannote:
         return words
 
     def transcribe(self, audio_path):
-        turns = self._diarize(audio_path)
-        words = self._asr(audio_path)
+        # Decoded once, shared by both stages; writable for torch.from_numpy.
+        audio = load_audio(audio_path, writable=True)
+        turns = self._diarize(audio)
+        words = self._asr(audio)
         return assign_speakers_max_overlap(words, turns)
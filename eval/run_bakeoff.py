@@ -22,30 +22,42 @@ from collections import defaultdict
 from pathlib import Path
 from typing import Any
 
+from tathurell.wordtable import WordTable
+
 # ---------------------------------------------------------------------------
 # Pure helper functions — no I/O, no models, unit-tested independently.
 # ---------------------------------------------------------------------------
 
-def words_to_hyp(words: list[dict]) -> tuple[dict[str, str], str]:
+def _word_speaker_rows(words: list[dict] | WordTable) -> list[tuple]:
+    """[(word, start, end, speaker)] from a word-dict list or a WordTable."""
+    if isinstance(words, WordTable):
+        return list(zip(words.words, words.start.tolist(), words.end.tolist(),
+                        words.speaker_labels()))
+    return [(w["word"], w["start"], w["end"], w["speaker"]) for w in words]
+
+
+def words_to_hyp(words: list[dict] | WordTable) -> tuple[dict[str, str], str]:
     """Group engine words by predicted speaker -> ({speaker: text}, flat_text).
 
     Args:
-        words: list of {"word": str, "start": float, "end": float, "speaker": str}
+        words: list of {"word": str, "start": float, "end": float, "speaker": str},
+            or a WordTable
 
     Returns:
         (per_spk_dict, flat_text) where per_spk_dict maps each predicted speaker
         label to its concatenated words (in word order) and flat_text is all words
         joined regardless of speaker (used for speaker-agnostic WER).
     """
+    rows = _word_speaker_rows(words)
     by_spk: defaultdict[str, list[str]] = defaultdict(list)
-    for w in words:
-        by_spk[w["speaker"]].append(w["word"])
+    for word, _, _, spk in rows:
+        by_spk[spk].append(word)
     per_spk = {spk: " ".join(ws) for spk, ws in by_spk.items()}
-    flat = " ".join(w["word"] for w in words)
+    flat = " ".join(word for word, _, _, _ in rows)
     return per_spk, flat
 
 
-def words_to_rttm(words: list[dict], uri: str) -> str:
+def words_to_rttm(words: list[dict] | WordTable, uri: str) -> str:
     """Collapse consecutive same-speaker words into turns -> RTTM text.
 
     Adjacent words from the same speaker are merged into a single RTTM segment
@@ -53,22 +65,23 @@ def words_to_rttm(words: list[dict], uri: str) -> str:
     new segment. Empty word lists produce an empty string (no SPEAKER lines).
 
     Args:
-        words: list of {"word": str, "start": float, "end": float, "speaker": str}
+        words: list of {"word": str, "start": float, "end": float, "speaker": str},
+            or a WordTable
         uri:   Recording URI used in the RTTM SPEAKER line (e.g. "ami_sdm_ES2011a").
 
     Returns:
         NIST RTTM text with one SPEAKER line per collapsed turn, terminated by \\n.
     """
     segs: list[dict] = []
-    for w in words:
-        if segs and segs[-1]["speaker"] == w["speaker"]:
+    for _, start, end, spk in _word_speaker_rows(words):
+        if segs and segs[-1]["speaker"] == spk:
             # Extend the current segment to cover this word.
-            segs[-1]["end"] = w["end"]
+            segs[-1]["end"] = end
         else:
             segs.append({
-                "speaker": str(w["speaker"]),
-                "start": w["start"],
-                "end": w["end"],
+                "speaker": str(spk),
+                "start": start,
+                "end": end,
             })
     lines = [
         f"SPEAKER {uri} 1 {s['start']:.3f} {s['end'] - s['start']:.3f}"
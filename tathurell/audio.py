@@ -0,0 +1,258 @@
+"""Decode-once audio: 16 kHz mono float32, cached as .npy and memory-mapped.
+
+One input file used to be decoded by an ffmpeg subprocess for ASR, again for
+every speaker sample and /span clip, and again by the eval engines. Here it is
+decoded once (the bundled ffmpeg, same conversion as whisperx.load_audio:
+s16le mono 16 kHz scaled by 1/32768; a WAV already in that format is read
+natively) into {digest}.npy under the decoded-audio directory, and every
+consumer memory-maps that file. Clips are slices of the mapped array, so
+repeat work on the same file does no further decoding and pages are shared
+between consumers by the OS.
+
+Files are keyed by the audio's content digest (tathurell.result_cache), so a
+re-upload of the same bytes under another name reuses the decode. A decode
+holds an flock on {digest}.npy.lock, so processes sharing the directory (the
+web app and its worker children) wait for one another's decode instead of
+repeating it. The
+directory is kept under `max_bytes` by evicting least-recently-used files.
+Default location: $TATHURELL_CACHE_DIR/audio, else ~/.cache/tathurell/audio.
+"""
+import contextlib
+import fcntl
+import os
+import subprocess
+import tempfile
+import threading
+import wave
+
+import numpy as np
+
+from tathurell.ffmpeg import ffmpeg_exe
+from tathurell.lru import LRUCache
+from tathurell.result_cache import audio_digest, cache_root
+
+SAMPLE_RATE = 16000
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024 * 1024  # ~18 hours of decoded audio
+
+
+def _decode_wav(audio_path, sr):
+    """16-bit PCM mono WAV already at `sr`, read in-process; None otherwise.
+
+    That is exactly what the ffmpeg conversion would produce, so no subprocess
+    is needed. Anything else (compressed, other rate/width/channels) needs
+    ffmpeg's resampler and down-mixer.
+    """
+    try:
+        with wave.open(audio_path, "rb") as w:
+            if (w.getnchannels(), w.getsampwidth(), w.getframerate()) != (1, 2, sr):
+                return None
+            frames = w.readframes(w.getnframes())
+    except (wave.Error, EOFError):
+        return None
+    return np.frombuffer(frames, "<i2").astype(np.float32) / 32768.0
+
+
+def decode(audio_path, sr=SAMPLE_RATE):
+    """Decode an audio file to a mono float32 array at `sr`.
+
+    16 kHz mono 16-bit WAV is read natively; everything else goes through the
+    bundled ffmpeg.
+    """
+    native = _decode_wav(audio_path, sr)
+    if native is not None:
+        return native
+    cmd = [
+        ffmpeg_exe(), "-nostdin", "-threads", "0", "-i", audio_path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr), "-",
+    ]
+    proc = subprocess.run(cmd, capture_output=True)
+    if proc.returncode != 0:
+        raise RuntimeError(
+            f"ffmpeg failed to decode {audio_path!r}: "
+            f"{proc.stderr.decode(errors='replace')}"
+        )
+    return np.frombuffer(proc.stdout, np.int16).flatten().astype(np.float32) / 32768.0
+
+
+@contextlib.contextmanager
+def _file_lock(path):
+    """Hold an exclusive flock on `path` (created, and removed on release)."""
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        fcntl.flock(fd, fcntl.LOCK_EX)
+        try:
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                break
+        except FileNotFoundError:
+            pass
+        os.close(fd)  # the previous holder removed the file we waited on; lock anew
+    try:
+        yield
+    finally:
+        os.unlink(path)
+        os.close(fd)
+
+
+class DecodedAudio:
+    """Size-bounded directory of decoded {digest}.npy files.
+
+    load() returns a read-only memory map, shared by every caller in the
+    process: open maps are kept in a small in-process LRU so repeat loads don't
+    even re-open the file. A consumer that needs a writable array (e.g. for
+    torch.from_numpy) asks for writable=True and gets its own copy-on-write
+    map of the file: its writes stay in its map, and pages are only copied
+    when written.
+    """
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root or os.path.join(cache_root(), "audio")
+        self.max_bytes = max_bytes
+        self._maps = LRUCache(maxsize=8)
+        # One decode at a time per file: path -> [lock, threads using it].
+        # Different files decode in parallel; _lock guards the dict.
+        self._path_locks = {}
+        self._lock = threading.Lock()
+
+    def path(self, audio_path):
+        """Where the decoded array for audio_path lives (may not exist yet)."""
+        return os.path.join(self.root, f"{audio_digest(audio_path)}.npy")
+
+    def load(self, audio_path, writable=False):
+        """The decoded audio as a memory-mapped float32 array (decodes on first use)."""
+        path = self.path(audio_path)
+        if writable:
+            return self._open(audio_path, path, "c")
+        return self._maps.get_or_load(path, lambda: self._open(audio_path, path, "r"))
+
+    @contextlib.contextmanager
+    def _path_lock(self, path):
+        with self._lock:
+            entry = self._path_locks.setdefault(path, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._path_locks[path]
+
+    def _open(self, audio_path, path, mode):
+        with self._path_lock(path):
+            if os.path.exists(path):
+                os.utime(path)  # mark as recently used for eviction
+            else:
+                os.makedirs(self.root, exist_ok=True)
+                with _file_lock(f"{path}.lock"):
+                    if not os.path.exists(path):  # else another process decoded it
+                        self._write(path, decode(audio_path))
+                        self._evict()
+            return np.load(path, mmap_mode=mode)
+
+    def _write(self, path, audio):
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, audio)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def _entries(self):
+        out = []
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return out
+        for name in names:
+            if not name.endswith(".npy"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            out.append((st.st_mtime, st.st_size, path))
+        return out
+
+    def _evict(self):
+        # Unlinking a file another consumer has mapped is safe on POSIX: the
+        # mapping keeps the pages until it is closed. Files still being
+        # written or opened (they hold a path lock) are kept.
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                if path in self._path_locks:
+                    continue
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_store():
+    """The process-wide DecodedAudio store under the cache root."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = DecodedAudio()
+        return _default
+
+
+def load_audio(audio_path, writable=False):
+    """Decoded 16 kHz mono float32 audio for audio_path, decoded at most once
+    (read-only unless writable; see DecodedAudio)."""
+    return default_store().load(audio_path, writable)
+
+
+def clip(audio, start, end, sr=SAMPLE_RATE):
+    """The [start, end] second slice of a decoded buffer (a view, no copy)."""
+    a = max(0, int(start * sr))
+    return audio[a:max(a, int(end * sr))]
+
+
+def encode_stream(audio_path, out_dir):
+    """Transcode audio_path once into a compact file for the browser to stream.
+
+    Returns (path, mimetype). Normally 16 kHz mono AAC in MP4 at 32 kbps
+    (~240 KB a minute; the index is written up front so playback and seeking
+    start after the first range request). The input is the shared decode piped
+    to ffmpeg, so the original file is not decoded again and the stream's
+    timeline matches the transcript's. If ffmpeg can't encode it, a 16 kHz
+    mono 16-bit WAV is written instead.
+    """
+    audio = load_audio(audio_path)
+    out = os.path.join(out_dir, "stream.m4a")
+    cmd = [
+        ffmpeg_exe(), "-nostdin", "-y", "-f", "f32le", "-ar", str(SAMPLE_RATE), "-ac", "1",
+        "-i", "pipe:0", "-c:a", "aac", "-b:a", "32k", "-movflags", "+faststart", out,
+    ]
+    pcm = memoryview(np.ascontiguousarray(audio, dtype="<f4")).cast("B")  # no copy of the map
+    proc = subprocess.run(cmd, input=pcm, capture_output=True)
+    if proc.returncode == 0:
+        return out, "audio/mp4"
+    out = os.path.join(out_dir, "stream.wav")
+    write_wav(audio, out)
+    return out, "audio/wav"
+
+
+def write_wav(samples, out, sr=SAMPLE_RATE):
+    """Write float samples in [-1, 1] to `out` (path or binary file) as 16-bit PCM WAV."""
+    pcm = np.clip(np.round(np.asarray(samples) * 32768.0), -32768, 32767).astype("<i2")
+    with wave.open(out, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sr)
+        w.writeframes(pcm.tobytes())
@@ -0,0 +1,262 @@
+"""Batch transcription: many files, one model load, decode pipelined with ASR.
+
+  python -m tathurell.batch PATH_OR_GLOB... [--manifest FILE] [--names FILE]
+                            [--output-dir DIR] [--summary FILE]
+
+tathurell_transcribe.py handles one file and loads every model for it; a
+nightly run over hundreds of recordings paid that load per file. Here one
+WhisperXTranscriber serves the whole batch. While file N is transcribed, file
+N+1 is decoded in a background thread into the shared decode store
+(tathurell.audio), so the transcriber finds it already decoded.
+
+Inputs are paths, globs (expanded here, for quoted patterns) and manifest files
+of one path per line (blank lines and # comments skipped; relative paths are
+relative to the manifest). Duplicates are dropped, keeping the first.
+
+Runs are non-interactive. --names is a JSON object mapping a speaker label to
+a name for every file ({"SPEAKER_00": "Alice"}), and/or a file path or file
+name to such a mapping for that file alone ({"a.wav": {"SPEAKER_01": "Bob"}}).
+Speakers without a name keep their label.
+
+Each file is written like the CLI's output: <audio>.transcription.txt, or
+<output-dir>/<file name>.transcription.txt. Files from different directories
+that share a name would write the same transcript there: the first keeps it
+and each later one fails without being transcribed. A failure is recorded and
+the batch moves on. Each file gets one summary record (path, status, audio_sec,
+decode_wait_sec, transcribe_sec, words, output, error). The records are
+written as JSON lines to --summary and printed as a table. The exit status is
+1 if any file failed.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tathurell.audio import SAMPLE_RATE, load_audio
+from tathurell.diar_windows import check_window
+from tathurell.naming import apply_names, group_by_speaker
+from tathurell.progress import RtfHistory
+from tathurell.result_cache import ResultCache
+
+_GLOB_CHARS = "*?["
+
+
+def read_manifest(path):
+    """Audio paths listed in a manifest file, one per line."""
+    base = os.path.dirname(os.path.abspath(path))
+    out = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                out.append(os.path.join(base, os.path.expanduser(line)))
+    return out
+
+
+def expand_inputs(paths, manifests=()):
+    """Paths, expanded globs and manifest entries, in order, without duplicates."""
+    out, seen = [], set()
+    candidates = []
+    for p in paths:
+        if any(c in p for c in _GLOB_CHARS):
+            candidates.extend(sorted(glob.glob(os.path.expanduser(p), recursive=True)))
+        else:
+            candidates.append(p)
+    for m in manifests:
+        candidates.extend(read_manifest(m))
+    for p in candidates:
+        key = os.path.abspath(p)
+        if key not in seen:
+            seen.add(key)
+            out.append(p)
+    return out
+
+
+def load_names(path):
+    """The --names mapping (see the module docstring); {} without a file."""
+    if path is None:
+        return {}
+    with open(path) as f:
+        names = json.load(f)
+    if not isinstance(names, dict):
+        raise ValueError(f"{path}: expected a JSON object")
+    return names
+
+
+def names_for(names, audio_path):
+    """{speaker: name} for one file: the global entries, overridden by the
+    entry for its path or file name."""
+    out = {k: v for k, v in names.items() if isinstance(v, str)}
+    for key in (os.path.basename(audio_path), audio_path, os.path.abspath(audio_path)):
+        if isinstance(names.get(key), dict):
+            out.update(names[key])
+    return out
+
+
+def output_path(audio_path, output_dir=None):
+    if output_dir is None:
+        return f"{audio_path}.transcription.txt"
+    return os.path.join(output_dir, f"{os.path.basename(audio_path)}.transcription.txt")
+
+
+def _prefetch(audio_path):
+    # Decoding the next file is best effort: if it fails, the transcription
+    # of that file fails the same way and records the error.
+    try:
+        load_audio(audio_path)
+    except Exception:
+        pass
+
+
+def run_batch(paths, transcriber, names=None, output_dir=None, cache=None, model="large-v3",
+              checkpoint_dir=None, summary=None, prefetch=_prefetch, log=sys.stderr,
+              settings=None):
+    """Transcribe every path with one transcriber -> the summary records.
+
+    cache: optional ResultCache (the transcriber's), checked first for
+    `model` and `settings` (the transcriber's pipeline_settings arguments) so
+    a cached file is neither decoded nor transcribed. summary:
+    optional path; each record is appended as a JSON line as soon as its file
+    is done.
+    """
+    names = names or {}
+    if output_dir is not None:
+        os.makedirs(output_dir, exist_ok=True)
+
+    def cached(path):
+        if cache is None:
+            return None
+        try:
+            return cache.get(cache.key(path, model=model, settings=settings))
+        except OSError:
+            return None  # unreadable file: let the transcription report it
+
+    # Inputs whose transcript path an earlier input already writes: index ->
+    # that input. They fail rather than overwrite it.
+    owners, clashes = {}, {}
+    for i, path in enumerate(paths):
+        out = os.path.abspath(output_path(path, output_dir))
+        if out in owners:
+            clashes[i] = owners[out]
+        else:
+            owners[out] = path
+
+    records = []
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="tathurell-decode") as pool:
+        pending = None
+        for i, path in enumerate(paths):
+            rec = {"path": path, "status": "ok", "audio_sec": None, "decode_wait_sec": 0.0,
+                   "transcribe_sec": 0.0, "words": 0, "output": None, "error": None}
+            try:
+                if i in clashes:
+                    raise ValueError(f"{output_path(path, output_dir)} is already the "
+                                     f"transcript of {clashes[i]}")
+                words = cached(path)
+                if words is not None:
+                    rec["status"] = "cached"
+                else:
+                    t0 = time.perf_counter()
+                    if pending is not None:
+                        pending.result()
+                    rec["decode_wait_sec"] = time.perf_counter() - t0
+                # Decode the next uncached file while this one runs.
+                pending = None
+                if (i + 1 < len(paths) and i + 1 not in clashes
+                        and cached(paths[i + 1]) is None):
+                    pending = pool.submit(prefetch, paths[i + 1])
+                if words is None:
+                    t0 = time.perf_counter()
+                    words = transcriber.transcribe(path, checkpoint_dir=checkpoint_dir)
+                    rec["transcribe_sec"] = time.perf_counter() - t0
+                    rec["audio_sec"] = len(load_audio(path)) / SAMPLE_RATE
+                rec["words"] = len(words)
+                text = apply_names(group_by_speaker(words), names_for(names, path))
+                rec["output"] = output_path(path, output_dir)
+                with open(rec["output"], "w") as f:
+                    f.write(text)
+            except Exception as exc:
+                rec["status"], rec["error"] = "error", f"{type(exc).__name__}: {exc}"
+            records.append(rec)
+            print(f"[tathurell] {i + 1}/{len(paths)} {rec['status']}: {path}"
+                  + (f" ({rec['error']})" if rec["error"] else ""), file=log)
+            if summary is not None:
+                with open(summary, "a") as f:
+                    f.write(json.dumps(rec) + "\n")
+    return records
+
+
+def format_summary(records):
+    """The summary records as a markdown table, with a totals row."""
+    lines = ["| file | status | audio s | decode wait s | transcribe s | RTF | words |",
+             "| --- | --- | --- | --- | --- | --- | --- |"]
+    for r in records:
+        audio = r["audio_sec"]
+        rtf = f"{r['transcribe_sec'] / audio:.3f}" if audio else "-"
+        lines.append(f"| {os.path.basename(r['path'])} | {r['status']} | "
+                     f"{'-' if audio is None else format(audio, '.0f')} | "
+                     f"{r['decode_wait_sec']:.1f} | {r['transcribe_sec']:.1f} | {rtf} | "
+                     f"{r['words']} |")
+    failed = sum(r["status"] == "error" for r in records)
+    total = sum(r["transcribe_sec"] for r in records)
+    lines.append(f"| **{len(records)} files, {failed} failed** | | | | {total:.1f} | | |")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Transcribe many audio files with one model load.")
+    ap.add_argument("paths", nargs="*", help="audio files or glob patterns")
+    ap.add_argument("--manifest", action="append", default=[],
+                    help="file listing audio paths, one per line (repeatable)")
+    ap.add_argument("--names", default=None,
+                    help="JSON mapping of speaker labels to names (see tathurell.batch)")
+    ap.add_argument("--output-dir", default=None,
+                    help="write transcripts here (default: next to each audio file)")
+    ap.add_argument("--summary", default=None,
+                    help="append one JSON line of timings per file to this path")
+    ap.add_argument("--model", default="large-v3", help="Whisper model (default: large-v3)")
+    ap.add_argument("--concurrent", action="store_true",
+                    help="run diarization alongside ASR + alignment")
+    ap.add_argument("--threads", type=int, default=None, help="total CPU threads for the models")
+    ap.add_argument("--shards", type=int, default=1,
+                    help="split long audio into N shards transcribed in parallel processes")
+    ap.add_argument("--diar-window", type=float, default=None, metavar="SECONDS",
+                    help="diarize in overlapping windows of this length (over the 30s "
+                         "overlap)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignore the transcription result cache (always re-run the models)")
+    ap.add_argument("--checkpoint-dir", default=None,
+                    help="save pipeline stages here so a crashed file resumes on rerun")
+    args = ap.parse_args(argv)
+    if args.diar_window is not None:
+        try:
+            check_window(args.diar_window)
+        except ValueError as exc:
+            ap.error(str(exc))
+
+    paths = expand_inputs(args.paths, args.manifest)
+    if not paths:
+        ap.error("no audio files given (paths, globs or --manifest)")
+    names = load_names(args.names)
+    cache = None if args.no_cache else ResultCache()
+
+    from tathurell.whisperx_core import WhisperXTranscriber
+
+    t0 = time.perf_counter()
+    transcriber = WhisperXTranscriber(model=args.model, concurrent=args.concurrent,
+                                      threads=args.threads, cache=cache, shards=args.shards,
+                                      diar_window=args.diar_window, history=RtfHistory())
+    print(f"[tathurell] models loaded in {time.perf_counter() - t0:.1f}s; "
+          f"{len(paths)} file(s)", file=sys.stderr)
+    settings = {"shards": args.shards, "diar_window": args.diar_window}
+    records = run_batch(paths, transcriber, names=names, output_dir=args.output_dir,
+                        cache=cache, model=args.model, checkpoint_dir=args.checkpoint_dir,
+                        summary=args.summary, settings=settings)
+    print(format_summary(records))
+    return 1 if any(r["status"] == "error" for r in records) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
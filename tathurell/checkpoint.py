@@ -0,0 +1,124 @@
+"""Stage-level checkpoints, so a crashed transcription resumes instead of restarting.
+
+WhisperXTranscriber can persist each expensive stage's output (raw ASR
+segments, aligned segments, the diarization dataframe) into a job directory.
+A rerun on the same audio + settings loads whatever stages completed and
+continues from the first missing one, e.g. a crash in assign_word_speakers
+after a two-hour ASR pass resumes straight into assignment.
+
+The job directory is named by the transcription key (result_cache), and a
+meta.json inside it records the full key; a directory whose key doesn't match
+is wiped rather than trusted. Stage files are pickles written atomically
+(temp file + os.replace), so a crash mid-write never leaves a torn stage.
+
+A run holds an exclusive flock on <dir>.lock from construction until clear()
+or release(), so two jobs on the same audio never share (or clear) one
+directory: the second takes the next free one (<key[:16]>.1, .2, ...). The
+lock dies with its process, so a crashed run's directory is free for the rerun.
+"""
+import fcntl
+import itertools
+import json
+import os
+import pickle
+import shutil
+import tempfile
+
+STAGES = ("asr", "aligned", "diarization")
+
+
+def _try_lock(path):
+    """An fd holding an exclusive flock on `path`, or None if another run has it."""
+    while True:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+        try:
+            if os.fstat(fd).st_ino == os.stat(path).st_ino:
+                return fd
+        except FileNotFoundError:
+            pass
+        os.close(fd)  # a finishing run unlinked the file we opened; lock the new one
+
+
+class StageCheckpoint:
+    """Completed-stage store for one transcription in `root`/<key[:16]>
+    (or the first such directory no other run holds)."""
+
+    def __init__(self, root, key):
+        self.key = key
+        os.makedirs(root, exist_ok=True)
+        for n in itertools.count():
+            name = key[:16] if n == 0 else f"{key[:16]}.{n}"
+            self._lock_fd = _try_lock(os.path.join(root, f"{name}.lock"))
+            if self._lock_fd is not None:
+                break
+        self.dir = os.path.join(root, name)
+        os.makedirs(self.dir, exist_ok=True)
+        meta = os.path.join(self.dir, "meta.json")
+        try:
+            with open(meta) as f:
+                stored = json.load(f).get("key")
+        except (FileNotFoundError, json.JSONDecodeError):
+            stored = None
+        if stored != key:
+            for stage in STAGES:
+                self._discard(stage)
+            with open(meta, "w") as f:
+                json.dump({"key": key}, f)
+
+    def _path(self, stage):
+        if stage not in STAGES:
+            raise ValueError(f"unknown stage {stage!r}; expected one of {STAGES}")
+        return os.path.join(self.dir, f"{stage}.pkl")
+
+    def _discard(self, stage):
+        try:
+            os.unlink(self._path(stage))
+        except FileNotFoundError:
+            pass
+
+    def has(self, stage):
+        return os.path.exists(self._path(stage))
+
+    def load(self, stage):
+        """The saved output of `stage`, or None if it never completed."""
+        try:
+            with open(self._path(stage), "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError):
+            self._discard(stage)  # unreadable -> recompute that stage
+            return None
+
+    def save(self, stage, value):
+        fd, tmp = tempfile.mkstemp(dir=self.dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, self._path(stage))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+
+    def clear(self):
+        """Remove the job directory (call once the final words exist) and
+        release it."""
+        shutil.rmtree(self.dir, ignore_errors=True)
+        if self._lock_fd is not None:
+            try:
+                os.unlink(f"{self.dir}.lock")
+            except FileNotFoundError:
+                pass
+        self.release()
+
+    def release(self):
+        """Let another run use the directory; the saved stages stay for it."""
+        if self._lock_fd is not None:
+            os.close(self._lock_fd)
+            self._lock_fd = None
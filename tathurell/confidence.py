@@ -5,21 +5,34 @@ assignment discards the overlap margin. We recompute it: a word's confidence is
 the fraction of its total speaker-overlap that went to its assigned (post-realign)
 speaker. ~1.0 = cleanly inside one turn; ~0.5 = straddling a boundary; 0.0 = a
 gap-filled word or one realign moved to a speaker with no local overlap.
+
+Each word only visits the segments that can overlap it (tathurell.intervals
+sweep), in the original segment order, so results are identical to scanning
+every segment but cost O((W + S) log S) instead of O(W x S).
 """
+from tathurell.intervals import overlap_candidates
+from tathurell.wordtable import WordTable
 
 
 def word_confidences(words, diar_segments):
     """Return one confidence in [0, 1] per word, matching `words` order.
 
-    words: [{"start","end","speaker", ...}]
+    words: [{"start","end","speaker", ...}] or a WordTable.
     diar_segments: [(start, end, speaker), ...] from the diarization dataframe.
     """
+    diar_segments = list(diar_segments)
+    if isinstance(words, WordTable):
+        spans = list(zip(words.start.tolist(), words.end.tolist()))
+        labels = words.speaker_labels()
+    else:
+        spans = [(w["start"], w["end"]) for w in words]
+        labels = [w["speaker"] for w in words]
     out = []
-    for w in words:
-        ws, we, spk = w["start"], w["end"], w["speaker"]
+    for spk, (ws, we), cands in zip(labels, spans, overlap_candidates(diar_segments, spans)):
         assigned = 0.0
         total = 0.0
-        for ss, se, s in diar_segments:
+        for i in cands:
+            ss, se, s = diar_segments[i]
             overlap = min(we, se) - max(ws, ss)
             if overlap > 0:
                 total += overlap
@@ -0,0 +1,271 @@
+"""Long-running transcription daemon on a Unix socket, and its client.
+
+Every CLI run used to import whisperx/torch and load large-v3 plus pyannote
+before touching the audio, a fixed cost far larger than the inference on a
+short voicemail. The daemon keeps warm WhisperXTranscribers (one ModelPool per
+distinct set of options, the MAX_MODELS most recently used kept) and serves
+transcriptions over a Unix domain socket; tathurell_transcribe.py uses it when
+it is running and transcribes in-process otherwise.
+
+Protocol: one request per connection, newline-delimited JSON both ways.
+
+  -> {"op": "transcribe", "audio_path": abs path, "options": {...},
+      "checkpoint_dir": abs path | null, "stats": bool}
+  <- {"event": {...}}  zero or more progress events (tathurell.progress)
+  <- {"ok": true, "words": [...], "stats": {...} | null}
+     or {"ok": false, "error": "..."}
+
+  -> {"op": "ping"}      <- {"ok": true, "pid": ..., "models": n}
+  -> {"op": "shutdown"}  <- {"ok": true}
+
+`options` are WhisperXTranscriber settings (OPTIONS); requests with the same
+options share a transcriber, leased one job at a time. Paths are opened by the
+daemon, so the client sends them absolute. The socket is created owner-only
+(0600): only the user running the daemon can submit work to it.
+
+Socket: $TATHURELL_DAEMON_SOCKET, else daemon.sock under the cache root.
+
+  python -m tathurell.daemon [serve] [--preload]   run in the foreground
+  python -m tathurell.daemon status | stop
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+
+from tathurell.lru import LRUCache
+from tathurell.model_pool import ModelPool
+from tathurell.result_cache import cache_root
+
+# WhisperXTranscriber settings a request may choose, with the CLI's defaults.
+# "cache" selects the on-disk result cache (ResultCache) or none.
+OPTIONS = {"model": "large-v3", "concurrent": False, "threads": None, "shards": 1,
+           "diar_window": None, "cache": True, "stats_log": None}
+MAX_MODELS = int(os.environ.get("TATHURELL_DAEMON_MAX_MODELS", "2"))
+CONNECT_TIMEOUT_SEC = 1.0
+
+
+class DaemonUnavailable(Exception):
+    """No daemon is listening on the socket."""
+
+
+def socket_path():
+    return os.environ.get("TATHURELL_DAEMON_SOCKET") or os.path.join(cache_root(), "daemon.sock")
+
+
+def _options(options):
+    unknown = set(options) - set(OPTIONS)
+    if unknown:
+        raise ValueError(f"unknown transcriber options: {sorted(unknown)}")
+    return {**OPTIONS, **options}
+
+
+def _default_factory(cache=True, **options):
+    from tathurell.progress import RtfHistory
+    from tathurell.result_cache import ResultCache
+    from tathurell.whisperx_core import WhisperXTranscriber
+
+    return WhisperXTranscriber(cache=ResultCache() if cache else None,
+                               history=RtfHistory(), **options)
+
+
+class TranscriptionDaemon:
+    """Serve transcriptions from warm transcribers built by factory(**options)."""
+
+    def __init__(self, path=None, factory=_default_factory, max_models=MAX_MODELS):
+        self.path = path or socket_path()
+        self._factory = factory
+        self._pools = LRUCache(maxsize=max_models)  # options key -> ModelPool
+        self._server = None
+
+    def _pool(self, options):
+        options = _options(options)
+        key = json.dumps(options, sort_keys=True)
+        return self._pools.get_or_load(
+            key, lambda: ModelPool(lambda: self._factory(**options), size=1))
+
+    def preload(self, **options):
+        """Build the transcriber for `options` now, so the first request is warm."""
+        self._pool(options).preload()
+
+    def handle(self, request, send):
+        """Answer one request; progress events go to send() before the reply."""
+        op = request.get("op")
+        if op == "ping":
+            return {"ok": True, "pid": os.getpid(), "models": len(self._pools)}
+        if op == "shutdown":
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"ok": True}
+        if op != "transcribe":
+            return {"ok": False, "error": f"unknown op {op!r}"}
+        try:
+            pool = self._pool(request.get("options") or {})
+            kwargs = {"checkpoint_dir": request.get("checkpoint_dir"),
+                      "events": lambda event: send({"event": event})}
+            stats = None
+            with pool.lease() as transcriber:
+                if request.get("stats"):
+                    words, st = transcriber.transcribe_with_stats(request["audio_path"], **kwargs)
+                    stats = st.to_dict()
+                else:
+                    words = transcriber.transcribe(request["audio_path"], **kwargs)
+        except (BrokenPipeError, ConnectionResetError):
+            raise  # the client went away; nobody to answer
+        except Exception as exc:
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        return {"ok": True, "words": list(words), "stats": stats}
+
+    def _bind(self):
+        if os.path.exists(self.path):
+            if ping(self.path) is not None:
+                raise RuntimeError(f"a daemon is already listening on {self.path}")
+            os.unlink(self.path)  # stale socket from a daemon that died
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        daemon = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self):
+                def send(msg):
+                    self.wfile.write(json.dumps(msg).encode() + b"\n")
+                    self.wfile.flush()
+
+                line = self.rfile.readline()
+                if not line:
+                    return
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError as exc:
+                    send({"ok": False, "error": f"bad request: {exc}"})
+                    return
+                try:
+                    send(daemon.handle(request, send))
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+        old = os.umask(0o177)
+        try:
+            server = socketserver.ThreadingUnixStreamServer(self.path, Handler)
+        finally:
+            os.umask(old)
+        server.daemon_threads = True
+        return server
+
+    def serve_forever(self):
+        """Listen until shutdown() (or a "shutdown" request); removes the socket after."""
+        self._server = self._bind()
+        try:
+            self._server.serve_forever()
+        finally:
+            self._server.server_close()
+            try:
+                os.unlink(self.path)
+            except FileNotFoundError:
+                pass
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+
+
+def _request(msg, path=None, events=None):
+    """Send one request and return the daemon's reply, passing progress events
+    to events(). DaemonUnavailable if nothing is listening."""
+    path = path or socket_path()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT_SEC)
+        try:
+            sock.connect(path)
+        except OSError as exc:  # missing/stale socket, refused, path too long
+            raise DaemonUnavailable(f"no daemon on {path}: {exc}") from None
+        sock.settimeout(None)  # a transcription takes as long as it takes
+        sock.sendall(json.dumps(msg).encode() + b"\n")
+        with sock.makefile("rb") as f:
+            for line in f:
+                reply = json.loads(line)
+                if "event" in reply:
+                    if events is not None:
+                        events(reply["event"])
+                    continue
+                return reply
+    finally:
+        sock.close()
+    raise RuntimeError(f"daemon on {path} closed the connection without replying")
+
+
+def ping(path=None):
+    """The daemon's ping reply, or None if none is running."""
+    try:
+        return _request({"op": "ping"}, path)
+    except DaemonUnavailable:
+        return None
+
+
+def transcribe(audio_path, path=None, events=None, checkpoint_dir=None, stats=False,
+               **options):
+    """Transcribe via the daemon -> (words, stats dict or None).
+
+    DaemonUnavailable if no daemon is running; RuntimeError if it failed."""
+    reply = _request({
+        "op": "transcribe",
+        "audio_path": os.path.abspath(audio_path),
+        "options": options,
+        "checkpoint_dir": checkpoint_dir and os.path.abspath(checkpoint_dir),
+        "stats": stats,
+    }, path, events)
+    if not reply.get("ok"):
+        raise RuntimeError(f"daemon: {reply.get('error')}")
+    return reply["words"], reply.get("stats")
+
+
+def stop(path=None):
+    """Ask a running daemon to exit; False if none is running."""
+    try:
+        _request({"op": "shutdown"}, path)
+    except DaemonUnavailable:
+        return False
+    return True
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Keep WhisperX warm for tathurell_transcribe.py.")
+    ap.add_argument("command", nargs="?", default="serve", choices=("serve", "status", "stop"))
+    ap.add_argument("--socket", default=None, help=f"socket path (default: {socket_path()})")
+    ap.add_argument("--preload", action="store_true",
+                    help="load the default model before accepting requests")
+    ap.add_argument("--model", default=OPTIONS["model"], help="model to --preload")
+    args = ap.parse_args(argv)
+
+    if args.command == "status":
+        reply = ping(args.socket)
+        if reply is None:
+            print("[tathurell] no daemon running")
+            return 1
+        print(f"[tathurell] daemon pid {reply['pid']}, {reply['models']} model set(s) warm")
+        return 0
+    if args.command == "stop":
+        if not stop(args.socket):
+            print("[tathurell] no daemon running")
+            return 1
+        print("[tathurell] daemon stopping")
+        return 0
+
+    daemon = TranscriptionDaemon(args.socket)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=daemon.shutdown).start())
+    if args.preload:
+        print(f"[tathurell] loading {args.model}...", file=sys.stderr)
+        daemon.preload(model=args.model)
+    print(f"[tathurell] daemon listening on {daemon.path}", file=sys.stderr)
+    try:
+        daemon.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
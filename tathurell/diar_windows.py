@@ -0,0 +1,119 @@
+"""Windowed diarization for multi-hour recordings: plan windows, link speakers.
+
+pyannote's memory and clustering cost grow with the length of the file, and a
+full CHiME-6-length session can exhaust RAM. Windowed mode diarizes
+overlapping fixed-length windows independently (peak memory bounded by one
+window) and then stitches them into one global diarization:
+
+  - each window keeps only the part of its timeline it "owns": the overlap
+    with a neighbour is split at its midpoint, so every instant is described
+    by exactly one window and turns near a window edge come from the window
+    that saw more context around them;
+  - window-local speaker labels are linked to global speakers by cosine
+    similarity between the window's speaker embedding and each global
+    speaker's running-mean embedding (one-to-one within a window); a local
+    speaker with no global match above `threshold` becomes a new speaker.
+
+Pure (numpy only); whisperx_core runs the pipeline per window and builds the
+dataframe.
+"""
+import numpy as np
+
+DEFAULT_OVERLAP_SEC = 30.0
+
+
+def check_window(window_sec, overlap_sec=DEFAULT_OVERLAP_SEC):
+    """Raise ValueError unless windows of window_sec can overlap by overlap_sec."""
+    if window_sec <= overlap_sec:
+        raise ValueError(f"the diarization window ({window_sec:g}s) must be longer "
+                         f"than its overlap ({overlap_sec:g}s)")
+
+
+def plan_windows(n_samples, window_sec, overlap_sec, sr=16000):
+    """[(start, end)] sample ranges of length window_sec overlapping by overlap_sec,
+    covering [0, n_samples). One window if the audio fits in one."""
+    window = int(window_sec * sr)
+    step = window - int(overlap_sec * sr)
+    if step <= 0:
+        raise ValueError("overlap must be shorter than the window")
+    if n_samples <= window:
+        return [(0, n_samples)]
+    out = []
+    start = 0
+    while True:
+        end = min(start + window, n_samples)
+        out.append((start, end))
+        if end == n_samples:
+            return out
+        start += step
+
+
+def _unit(vec):
+    v = np.asarray(vec, dtype=np.float64)
+    norm = np.linalg.norm(v)
+    return v / norm if norm > 0 else v
+
+
+def link_windows(windows, threshold=0.5):
+    """Merge per-window diarization into global [(start, end, speaker)] turns.
+
+    windows: in time order, each {"start": sec, "end": sec, "segments":
+    [(start, end, local_speaker)] in window-relative seconds, "embeddings":
+    {local_speaker: vector} (a speaker without an embedding can't be linked
+    and becomes a new global speaker)}.
+    Global speakers are named SPEAKER_00, SPEAKER_01, ... in order of first
+    appearance.
+    """
+    centroids = []  # per global speaker: sum of its unit embeddings (None if none yet)
+    turns = []
+    open_at_cut = {}  # label -> index of its turn ending at the previous cut
+    for k, win in enumerate(windows):
+        own_start = win["start"] if k == 0 else (win["start"] + windows[k - 1]["end"]) / 2
+        own_end = win["end"] if k == len(windows) - 1 else (win["end"] + windows[k + 1]["start"]) / 2
+
+        local = sorted({spk for _, _, spk in win["segments"]})
+        embs = {spk: _unit(v) for spk, v in (win.get("embeddings") or {}).items()
+                if v is not None}
+        pairs = []  # (similarity, local, global index)
+        for spk in local:
+            if spk not in embs:
+                continue
+            for g, total in enumerate(centroids):
+                if total is not None:
+                    pairs.append((float(np.dot(embs[spk], _unit(total))), spk, g))
+        mapping, taken = {}, set()
+        for sim, spk, g in sorted(pairs, key=lambda p: -p[0]):
+            if sim < threshold:
+                break
+            if spk in mapping or g in taken:
+                continue
+            mapping[spk] = g
+            taken.add(g)
+        for spk in local:
+            if spk not in mapping:
+                mapping[spk] = len(centroids)
+                centroids.append(None)
+            if spk in embs:
+                g = mapping[spk]
+                centroids[g] = embs[spk] if centroids[g] is None else centroids[g] + embs[spk]
+
+        # Turns clipped at the previous cut are extended, not duplicated, when
+        # the same speaker continues across it (own_start == previous own_end).
+        at_cut = {}
+        for s, e, spk in sorted(win["segments"]):
+            s, e = max(s + win["start"], own_start), min(e + win["start"], own_end)
+            if e <= s:
+                continue
+            label = f"SPEAKER_{mapping[spk]:02d}"
+            if k > 0 and s == own_start and label in open_at_cut:
+                i = open_at_cut.pop(label)
+                turns[i] = (turns[i][0], e, label)
+            else:
+                i = len(turns)
+                turns.append((s, e, label))
+            if e == own_end:
+                at_cut[label] = i
+        open_at_cut = at_cut
+
+    turns.sort(key=lambda t: (t[0], t[1]))
+    return turns
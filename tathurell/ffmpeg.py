@@ -1,6 +1,6 @@
 """Resolve and activate the bundled ffmpeg, so the tool needs no system ffmpeg.
 
-whisperx.load_audio() and tathurell.sampling.extract_clip both decode via ffmpeg.
+tathurell.audio decodes via ffmpeg, as does whisperx.load_audio().
 imageio-ffmpeg ships a static ffmpeg inside its wheel; this module exposes that
 binary and makes a bare `ffmpeg` on PATH resolve to it (whisperx hardcodes a
 `subprocess.run(["ffmpeg", ...])` we cannot patch).
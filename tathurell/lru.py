@@ -0,0 +1,90 @@
+"""Small thread-safe in-process LRU cache.
+
+Used for things that are expensive to load and worth keeping warm for the life
+of the process (e.g. per-language alignment models in whisperx_core, review
+clips in the web app).
+"""
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Keep at most `maxsize` entries, evicting the least recently used.
+
+    get_or_load(key, loader) returns the cached value or calls loader() and
+    caches the result. The loader runs outside the lock, so a slow load doesn't
+    stall hits on other keys; if two threads race to load the same key, the
+    first value stored wins and both callers get it.
+
+    With `weigh`, maxsize bounds the summed weigh(value) of the entries instead
+    of their count (e.g. weigh=len for a budget in bytes). A value heavier than
+    the whole budget is returned to the caller but not cached.
+    """
+
+    def __init__(self, maxsize, weigh=None):
+        if maxsize < 1:
+            raise ValueError(f"maxsize must be >= 1, got {maxsize}")
+        self.maxsize = maxsize
+        self._weigh = weigh or (lambda _value: 1)
+        self.weight = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._put(key, value)
+
+    def _put(self, key, value):
+        if key in self._data:
+            self.weight -= self._weigh(self._data.pop(key))
+        w = self._weigh(value)
+        if w > self.maxsize:
+            return
+        self._data[key] = value
+        self.weight += w
+        while self.weight > self.maxsize:
+            _, old = self._data.popitem(last=False)
+            self.weight -= self._weigh(old)
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            if key in self._data:
+                self.hits += 1
+                self._data.move_to_end(key)
+                return self._data[key]
+            self.misses += 1
+        value = loader()
+        with self._lock:
+            if key in self._data:  # lost a load race; keep the first value
+                self._data.move_to_end(key)
+                return self._data[key]
+            self._put(key, value)
+        return value
+
+    def discard_if(self, predicate):
+        """Drop every entry whose key satisfies predicate(key)."""
+        with self._lock:
+            for key in [k for k in self._data if predicate(k)]:
+                self.weight -= self._weigh(self._data.pop(key))
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
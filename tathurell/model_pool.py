@@ -0,0 +1,147 @@
+"""Process-wide pool of warm transcribers, shared by every job in the process.
+
+Building a WhisperXTranscriber loads large-v3 and the pyannote pipeline from
+disk (tens of seconds, a large RSS jump). The pool builds it lazily on first
+use and hands the same instance to every later job, so only the first job pays
+the load. Load time and the RSS the load added are recorded on the pool,
+separately from any job's inference time.
+
+Instances are leased, not shared concurrently: the whisperx pipeline keeps
+per-call state (tokenizer/options) on the object, so it is not re-entrant.
+`size` caps how many instances the pool will build; a lease blocks until one
+is free.
+"""
+import resource
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+def peak_rss_mb():
+    """Process-cumulative peak RSS in megabytes (ru_maxrss is bytes on macOS,
+    kilobytes on Linux)."""
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return rss / (1024 * 1024)
+    return rss / 1024
+
+
+def current_rss_mb():
+    """Resident set size right now, in megabytes (/proc on Linux; elsewhere
+    falls back to the peak, an upper bound)."""
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+    return pages * resource.getpagesize() / (1024 * 1024)
+
+
+class ModelPool:
+    """Lazily build up to `size` transcribers via `factory()` and lease them out."""
+
+    def __init__(self, factory, size=1):
+        if size < 1:
+            raise ValueError(f"pool size must be >= 1, got {size}")
+        self._factory = factory
+        self._size = size
+        self._cond = threading.Condition()
+        self._idle = []      # built, not leased
+        self._building = 0   # factory() calls in flight
+        self._built = 0
+        self.load_sec = []   # per instance, in build order
+        self.load_rss_mb = []
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def loaded(self):
+        with self._cond:
+            return self._built
+
+    def _build(self):
+        # Current, not peak, RSS: once an earlier job has set the peak, a
+        # later instance's load would not move it.
+        rss0 = current_rss_mb()
+        t0 = time.perf_counter()
+        inst = self._factory()
+        return inst, time.perf_counter() - t0, current_rss_mb() - rss0
+
+    def _acquire(self):
+        with self._cond:
+            while True:
+                if self._idle:
+                    return self._idle.pop()
+                if self._built + self._building < self._size:
+                    self._building += 1
+                    break
+                self._cond.wait()
+        # Build outside the lock so other leases (and stats()) aren't blocked
+        # behind a multi-second model load.
+        try:
+            inst, sec, rss = self._build()
+        except BaseException:
+            with self._cond:
+                self._building -= 1
+                self._cond.notify()
+            raise
+        with self._cond:
+            self._building -= 1
+            self._built += 1
+            self.load_sec.append(sec)
+            self.load_rss_mb.append(rss)
+        return inst
+
+    def _release(self, inst):
+        with self._cond:
+            self._idle.append(inst)
+            self._cond.notify()
+
+    @contextmanager
+    def lease(self):
+        """Check out a warm transcriber (building one if under `size`)."""
+        inst = self._acquire()
+        try:
+            yield inst
+        finally:
+            self._release(inst)
+
+    def preload(self):
+        """Build one instance now (no-op if one is already built)."""
+        if self.loaded == 0:
+            with self.lease():
+                pass
+
+    def stats(self):
+        """JSON-safe load report: instances built, and per-instance load cost."""
+        with self._cond:
+            return {
+                "size": self._size,
+                "loaded": self._built,
+                "load_sec": list(self.load_sec),
+                "load_rss_mb": list(self.load_rss_mb),
+            }
+
+
+_shared = {}  # factory -> ModelPool
+_shared_lock = threading.Lock()
+
+
+def shared_pool(factory, size=1):
+    """The process-wide pool for `factory` (created on first request).
+
+    A later call asking for a larger `size` grows the existing pool's cap; it
+    never shrinks (instances already built stay warm).
+    """
+    with _shared_lock:
+        pool = _shared.get(factory)
+        if pool is None:
+            pool = _shared[factory] = ModelPool(factory, size=size)
+        elif size > pool._size:
+            with pool._cond:
+                pool._size = size
+                pool._cond.notify_all()
+        return pool
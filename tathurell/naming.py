@@ -4,6 +4,7 @@ A word is {"word": str, "speaker": str | None, ...}. group_by_speaker collapses
 consecutive same-speaker words into runs; the word that triggers a speaker change
 starts the new run (the bug the original code had: it dropped that word).
 """
+from tathurell.wordtable import WordTable
 
 
 def group_by_speaker(words):
@@ -13,23 +14,32 @@ def group_by_speaker(words):
     span the run and confidence is the MIN of the run's word confidences (one
     shaky word flags the run). start/end/confidence default to 0.0/0.0/1.0 for
     words that lack them, so callers passing bare {word,speaker} still work.
+    Also accepts a WordTable (read column-wise, no per-word views).
     """
+    if isinstance(words, WordTable):
+        conf = ([1.0] * len(words) if words.confidence is None
+                else words.confidence.tolist())
+        rows = zip(words.words, words.speaker_labels(), words.start.tolist(),
+                   words.end.tolist(), conf)
+    else:
+        rows = ((w["word"], w["speaker"], w.get("start", 0.0), w.get("end", 0.0),
+                 w.get("confidence", 1.0)) for w in words)
     groups = []
-    for w in words:
-        spk = w["speaker"]
-        start = w.get("start", 0.0)
-        end = w.get("end", 0.0)
-        conf = w.get("confidence", 1.0)
+    texts = []  # per group: its words, joined once at the end
+    for word, spk, start, end, conf in rows:
         if groups and groups[-1]["speaker"] == spk:
             g = groups[-1]
-            g["text"] += f" {w['word']}"
+            texts[-1].append(word)
             g["end"] = end
             g["confidence"] = min(g["confidence"], conf)
         else:
             groups.append({
-                "speaker": spk, "text": w["word"],
+                "speaker": spk, "text": None,
                 "start": start, "end": end, "confidence": conf,
             })
+            texts.append([word])
+    for g, ws in zip(groups, texts):
+        g["text"] = " ".join(ws)
     return groups
 
 
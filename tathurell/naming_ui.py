@@ -1,21 +1,18 @@
 """Local browser modal for naming speakers by ear.
 
 create_app builds the Flask app (pure-ish, test-client friendly). collect_names
-(Task 5) extracts clips, runs the app on a free port, opens the browser, and
-blocks until the form is submitted.
+(Task 5) encodes a clip per speaker in memory, runs the app on a free port,
+opens the browser, and blocks until the form is submitted.
 """
-import os
-import shutil
 import sys
-import tempfile
 import threading
 import webbrowser
 from html import escape
 
-from flask import Flask, request, send_file
+from flask import Flask, Response, request
 from werkzeug.serving import make_server
 
-from tathurell.sampling import extract_clip
+from tathurell.sampling import clip_wav_bytes
 
 _PAGE = """<!doctype html><html><head><meta charset="utf-8"><title>Name the speakers</title>
 <style>body{{font-family:sans-serif;max-width:760px;margin:2rem auto}}
@@ -32,10 +29,10 @@ _ROW = """<div class="row"><b>{spk}</b>
 <label>Name: <input name="{spk}" placeholder="{spk}"></label></div>"""
 
 
-def create_app(samples, clip_dir, result, done):
+def create_app(samples, clips, result, done):
     """Flask app for the naming modal.
 
-    samples: {speaker: {"start","end","text"}}; clip_dir: holds <speaker>.wav;
+    samples: {speaker: {"start","end","text"}}; clips: {speaker: WAV bytes};
     result: dict filled with {speaker: name} on submit; done: Event set on submit.
     """
     app = Flask(__name__)
@@ -50,9 +47,9 @@ def create_app(samples, clip_dir, result, done):
 
     @app.route("/clip/<speaker>")
     def clip(speaker):
-        if speaker not in samples:
+        if speaker not in samples or speaker not in clips:
             return ("unknown speaker", 404)
-        return send_file(os.path.join(clip_dir, f"{speaker}.wav"), mimetype="audio/wav")
+        return Response(clips[speaker], mimetype="audio/wav")
 
     @app.route("/submit", methods=["POST"])
     def submit():
@@ -66,28 +63,23 @@ def create_app(samples, clip_dir, result, done):
 
 
 def collect_names(samples, audio_path, open_browser=True):
-    """Extract a clip per speaker, serve the modal, block until submit; return names.
+    """Encode a clip per speaker, serve the modal, block until submit; return names.
 
     Returns {speaker: name}. On Ctrl-C (tab closed without submitting) falls back
     to using each speaker's label as its name.
     """
-    clip_dir = tempfile.mkdtemp(prefix="tathurell_clips_")
     result, done = {}, threading.Event()
+    clips = {spk: clip_wav_bytes(audio_path, s["start"], s["end"]) for spk, s in samples.items()}
+    app = create_app(samples, clips, result, done)
+    server = make_server("127.0.0.1", 0, app)  # port 0 -> OS picks a free port
+    url = f"http://127.0.0.1:{server.server_port}/"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"[tathurell] Name the speakers at {url} (opening browser)...", file=sys.stderr)
+    if open_browser:
+        webbrowser.open(url)
     try:
-        for spk, s in samples.items():
-            extract_clip(audio_path, s["start"], s["end"], os.path.join(clip_dir, f"{spk}.wav"))
-        app = create_app(samples, clip_dir, result, done)
-        server = make_server("127.0.0.1", 0, app)  # port 0 -> OS picks a free port
-        url = f"http://127.0.0.1:{server.server_port}/"
-        threading.Thread(target=server.serve_forever, daemon=True).start()
-        print(f"[tathurell] Name the speakers at {url} (opening browser)...", file=sys.stderr)
-        if open_browser:
-            webbrowser.open(url)
-        try:
-            done.wait()
-        except KeyboardInterrupt:
-            result = {spk: spk for spk in samples}
-        server.shutdown()
-        return result
-    finally:
-        shutil.rmtree(clip_dir, ignore_errors=True)
+        done.wait()
+    except KeyboardInterrupt:
+        result = {spk: spk for spk in samples}
+    server.shutdown()
+    return result
@@ -0,0 +1,203 @@
+"""Fine-grained pipeline progress, with an ETA learned from past runs.
+
+WhisperXTranscriber's `progress` callback only names the coarse stage. With
+`events=` it also reports structured progress dicts:
+
+  {"stage": "aligning", "done": 120, "total": 480, "unit": "segments",
+   "fraction": 0.25, "elapsed_sec": 31.2, "eta_sec": 410.0}
+
+`done`/`total`/`unit` say what was counted in the current stage (audio seconds
+for ASR, segments for alignment, windows for windowed diarization); they and
+`fraction` are None when a stage can't report its own progress. `eta_sec` is
+the estimated time left for the whole transcription, or None when there is
+nothing to base it on.
+
+The ETA comes from a per-machine history of real-time factors (stage seconds
+per audio second), kept per configuration (model, device, compute type,
+concurrency, shards, cores) in $TATHURELL_CACHE_DIR/rtf_history.json. For the
+running stage, a measured fraction past MIN_MEASURED is extrapolated from the
+stage's own rate; below that the history's estimate is used.
+"""
+import inspect
+import json
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from tathurell.result_cache import cache_root
+
+STAGES = ("transcribing", "aligning", "diarizing", "finishing")
+MIN_MEASURED = 0.05  # trust a stage's own rate once this much of it is done
+MAX_RUNS = 20        # runs kept per configuration
+
+
+def accepts_kwarg(fn, name):
+    """True if calling fn(name=...) is allowed (fn takes it or **kwargs)."""
+    try:
+        params = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in params or any(p.kind is p.VAR_KEYWORD for p in params.values())
+
+
+def format_eta(sec):
+    """'2h05m', '4m10s', '12s' (for log lines and the UI)."""
+    sec = int(round(sec))
+    if sec >= 3600:
+        return f"{sec // 3600}h{sec % 3600 // 60:02d}m"
+    if sec >= 60:
+        return f"{sec // 60}m{sec % 60:02d}s"
+    return f"{sec}s"
+
+
+class RtfHistory:
+    """Real-time factors of past runs, per configuration, in one JSON file."""
+
+    def __init__(self, path=None, max_runs=MAX_RUNS):
+        self.path = path or os.path.join(cache_root(), "rtf_history.json")
+        self.max_runs = max_runs
+        self._lock = threading.Lock()
+
+    def _read(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def record(self, config, audio_sec, stage_sec):
+        """Add one run: {stage: wall seconds} over audio_sec seconds of audio."""
+        if not audio_sec or audio_sec <= 0:
+            return
+        run = {stage: sec / audio_sec for stage, sec in stage_sec.items()}
+        with self._lock:
+            data = self._read()
+            runs = data.setdefault(config, [])
+            runs.append(run)
+            del runs[:-self.max_runs]
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(self.path) or ".", suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    json.dump(data, f)
+                os.replace(tmp, self.path)
+            except BaseException:
+                if os.path.exists(tmp):
+                    os.unlink(tmp)
+                raise
+
+    def estimate(self, config, stage, audio_sec):
+        """Expected seconds for `stage` on audio_sec of audio (median RTF of
+        past runs), or None without history."""
+        if not audio_sec:
+            return None
+        with self._lock:
+            runs = self._read().get(config, [])
+        rtfs = [run[stage] for run in runs if stage in run]
+        if not rtfs:
+            return None
+        return statistics.median(rtfs) * audio_sec
+
+
+class ProgressTracker:
+    """Times the stages of one transcription and emits progress events.
+
+    stage(name) starts a stage, advance(done, total, unit) reports progress
+    within it, finish() closes the last stage and records the run's stage
+    times in `history` (unless record=False, e.g. a run resumed from
+    checkpoints). Events go to emit(event); advance() emits at most every
+    `min_interval` seconds, stage changes always.
+    """
+
+    def __init__(self, audio_sec=None, emit=None, history=None, config=None,
+                 record=True, min_interval=0.5, clock=time.monotonic):
+        self.audio_sec = audio_sec
+        self._emit = emit
+        self._history = history
+        self._config = config
+        self._record = record
+        self._min_interval = min_interval
+        self._clock = clock
+        self._t0 = clock()
+        self._stage = None
+        self._stage_t0 = None
+        self._count = (None, None, None)  # done, total, unit
+        self._last_emit = None
+        self.stage_sec = {}
+
+    def _close_stage(self, now):
+        if self._stage is not None:
+            self.stage_sec[self._stage] = (self.stage_sec.get(self._stage, 0.0)
+                                           + now - self._stage_t0)
+
+    def stage(self, name):
+        now = self._clock()
+        self._close_stage(now)
+        self._stage, self._stage_t0 = name, now
+        self._count = (None, None, None)
+        self._send(now)
+
+    def advance(self, done, total, unit):
+        now = self._clock()
+        self._count = (done, total, unit)
+        if self._last_emit is not None and now - self._last_emit < self._min_interval \
+                and done < total:
+            return
+        self._send(now)
+
+    def finish(self):
+        """Close the last stage; record the run in the history."""
+        self._close_stage(self._clock())
+        self._stage = None
+        if self._record and self._history is not None and self._config is not None:
+            self._history.record(self._config, self.audio_sec, self.stage_sec)
+
+    def _expected(self, stage):
+        if self._history is None or self._config is None:
+            return None
+        return self._history.estimate(self._config, stage, self.audio_sec)
+
+    def eta(self, now=None):
+        """Estimated seconds left for the whole run, or None."""
+        if self._stage is None:
+            return None
+        now = self._clock() if now is None else now
+        in_stage = now - self._stage_t0
+        done, total, _ = self._count
+        fraction = done / total if total else None
+        if fraction is not None and fraction >= MIN_MEASURED:
+            left = in_stage * (1 - fraction) / fraction
+        else:
+            expected = self._expected(self._stage)
+            if expected is None:
+                return None
+            left = max(expected - in_stage, 0.0)
+        if self._stage in STAGES:
+            for later in STAGES[STAGES.index(self._stage) + 1:]:
+                expected = self._expected(later)
+                if expected is None:
+                    return None
+                left += expected
+        return left
+
+    def event(self, now=None):
+        """The current progress event (see the module docstring)."""
+        now = self._clock() if now is None else now
+        done, total, unit = self._count
+        return {
+            "stage": self._stage,
+            "done": done,
+            "total": total,
+            "unit": unit,
+            "fraction": min(done / total, 1.0) if total else None,
+            "elapsed_sec": now - self._t0,
+            "eta_sec": self.eta(now),
+        }
+
+    def _send(self, now):
+        self._last_emit = now
+        if self._emit is not None:
+            self._emit(self.event(now))
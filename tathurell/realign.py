@@ -38,6 +38,7 @@ NEGLIGENCE OR OTHERWISE) ARISING IN ANY WAY OUT OF THE USE OF THIS SOFTWARE, EVE
 IF ADVISED OF THE POSSIBILITY OF SUCH DAMAGE.
 ----------------------------------------------------------------------------
 """
+from tathurell.wordtable import WordTable
 
 sentence_ending_punctuations = ".?!"
 
@@ -125,19 +126,68 @@ def get_realigned_ws_mapping_with_punctuation(word_speaker_mapping, max_words_in
 
 
 # --- end vendored code ---
+#
+# get_realigned_ws_mapping_with_punctuation is kept as the reference; the
+# pipeline uses realigned_speaker_labels below, which gives identical labels in
+# one pass. In the vendored loop a rewrite only ever covers a whole sentence
+# and then jumps past it, so each sentence is decided independently and only
+# by its own original labels: it is rewritten to its mode iff it has at most
+# max_words_in_sentence words, more than one speaker, and the mode holds at
+# least len // 2 of them. (The left/right scans fail for any sentence longer
+# than that, and after the first speaker change in a sentence the left scan
+# can no longer reach the sentence start.)
+
+
+def realigned_speaker_labels(tokens, speakers, max_words_in_sentence=50):
+    """Per-sentence majority speaker labels for parallel token/speaker lists.
+
+    Same result as get_realigned_ws_mapping_with_punctuation's speakers, in
+    O(n): one pass with a running per-sentence label count. Tokens must be
+    non-empty. Returns a new list; the inputs are not modified.
+    """
+    out = list(speakers)
+    n = len(tokens)
+    start = 0
+    counts = {}
+    for k in range(n):
+        counts[speakers[k]] = counts.get(speakers[k], 0) + 1
+        if tokens[k][-1] not in sentence_ending_punctuations and k < n - 1:
+            continue
+        length = k - start + 1
+        if len(counts) > 1 and length <= max_words_in_sentence:
+            # set() of the same slice so ties break exactly as the vendored max().
+            mode = max(set(speakers[start:k + 1]), key=counts.__getitem__)
+            if counts[mode] >= length // 2:
+                out[start:k + 1] = [mode] * length
+        start = k + 1
+        counts = {}
+    return out
 
 
-def realign_speakers(words):
+def realign_speakers(words, inplace=False):
     """Return `words` with per-sentence-majority-corrected speakers.
 
     `words` is our standard word list — dicts with at least "word" (punctuated
-    token) and "speaker"; "start"/"end" are preserved. Words with an empty
-    "word" are passed through untouched (the vendored code indexes word[-1]).
-    Non-mutating: operates on copies.
+    token) and "speaker"; "start"/"end" are preserved — or a WordTable. Words
+    with an empty "word" are passed through untouched (the vendored code
+    indexes word[-1]). Non-mutating by default (one shallow copy per word, or a
+    table copy); inplace=True updates the speakers of `words` itself and
+    returns it.
     """
-    indexed = [(i, w) for i, w in enumerate(words) if w.get("word")]
-    realigned = get_realigned_ws_mapping_with_punctuation([w for _, w in indexed])
-    out = [dict(w) for w in words]
-    for (orig_i, _), fixed in zip(indexed, realigned):
-        out[orig_i] = fixed
+    if isinstance(words, WordTable):
+        table = words if inplace else words.copy()
+        labels = table.speaker_labels()
+        indexed = [i for i, w in enumerate(table.words) if w]
+        fixed = realigned_speaker_labels([table.words[i] for i in indexed],
+                                         [labels[i] for i in indexed])
+        for i, spk in zip(indexed, fixed):
+            labels[i] = spk
+        table.set_speaker_labels(labels)
+        return table
+    indexed = [i for i, w in enumerate(words) if w.get("word")]
+    labels = realigned_speaker_labels(
+        [words[i]["word"] for i in indexed], [words[i]["speaker"] for i in indexed])
+    out = words if inplace else [dict(w) for w in words]
+    for i, spk in zip(indexed, labels):
+        out[i]["speaker"] = spk
     return out
@@ -0,0 +1,181 @@
+"""Content-addressed on-disk cache of final transcription word lists.
+
+Re-transcribing the same audio with the same models gives the same words, so
+WhisperXTranscriber.transcribe can skip the whole pipeline on a repeat. The key
+is the SHA-256 of the audio bytes plus everything that shapes the output: model
+name, compute_type, device, the pipeline settings (pipeline_settings), the
+installed whisperx / pyannote / faster-whisper / ctranslate2 / torch versions,
+and PIPELINE_VERSION (bump it when realign, confidence, the settings or the
+word dict shape change). Each entry is one JSON file; the
+directory is kept under `max_bytes` by evicting least-recently-used entries
+(a hit refreshes the file's mtime).
+
+Default location: $TATHURELL_CACHE_DIR/results, else ~/.cache/tathurell/results.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from importlib import metadata
+
+PIPELINE_VERSION = 3
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+_VERSIONED = ("whisperx", "pyannote.audio", "faster-whisper", "ctranslate2", "torch")
+
+
+def cache_root():
+    """Root of tathurell's on-disk caches."""
+    return os.environ.get("TATHURELL_CACHE_DIR") or os.path.join(
+        os.path.expanduser("~"), ".cache", "tathurell")
+
+
+def library_versions():
+    """{distribution: version or None} for the libraries that shape the output."""
+    out = {}
+    for dist in _VERSIONED:
+        try:
+            out[dist] = metadata.version(dist)
+        except metadata.PackageNotFoundError:
+            out[dist] = None
+    return out
+
+
+_digests = {}  # (realpath, size, mtime_ns) -> hex digest; repeat lookups skip the hash
+_digests_lock = threading.Lock()
+
+
+def audio_digest(path):
+    """SHA-256 hex digest of the file's bytes (memoized per path/size/mtime)."""
+    st = os.stat(path)
+    memo = (os.path.realpath(path), st.st_size, st.st_mtime_ns)
+    with _digests_lock:
+        if memo in _digests:
+            return _digests[memo]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    with _digests_lock:
+        _digests[memo] = digest
+    return digest
+
+
+def pipeline_settings(shards=1, diar_window=None, diar_overlap=30.0, diar_link_threshold=0.5):
+    """The WhisperXTranscriber options beyond the model that change its words,
+    in canonical form. shards: a sharded run cuts the audio at silences, so its
+    segments (and words) can differ from a single pass. diar_*: windowed
+    diarization links speakers across windows, so its labels can differ; the
+    overlap and link threshold only matter when there is a window."""
+    out = {"shards": max(1, int(shards or 1)), "diar_window": None}
+    if diar_window is not None:
+        out.update(diar_window=float(diar_window), diar_overlap=float(diar_overlap),
+                   diar_link_threshold=float(diar_link_threshold))
+    return out
+
+
+def transcription_key(audio_path, model="large-v3", compute_type="int8", device="cpu",
+                      settings=None):
+    """Identity of one transcription: audio content + every setting and library
+    version that shapes the output. Defaults mirror WhisperXTranscriber's.
+    settings: keyword arguments for pipeline_settings (omitted ones default)."""
+    ident = {
+        "audio": audio_digest(audio_path),
+        "model": model,
+        "compute_type": compute_type,
+        "device": device,
+        "settings": pipeline_settings(**(settings or {})),
+        "versions": library_versions(),
+        "pipeline": PIPELINE_VERSION,
+    }
+    blob = json.dumps(ident, sort_keys=True).encode()
+    return hashlib.sha256(blob).hexdigest()
+
+
+class ResultCache:
+    """Size-bounded LRU directory of {key}.json word lists."""
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root or os.path.join(cache_root(), "results")
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def key(self, audio_path, model="large-v3", compute_type="int8", device="cpu",
+            settings=None):
+        """Cache key for transcribing audio_path with these settings."""
+        return transcription_key(audio_path, model, compute_type, device, settings)
+
+    def _path(self, key):
+        return os.path.join(self.root, f"{key}.json")
+
+    def get(self, key):
+        """The cached word list for key, or None on a miss."""
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                words = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        try:
+            os.utime(path)  # mark as recently used for eviction
+        except OSError:
+            pass
+        return words
+
+    def put(self, key, words):
+        """Store words under key (atomic replace), then trim to max_bytes."""
+        os.makedirs(self.root, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(words, f, separators=(",", ":"))
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            if os.path.exists(tmp):
+                os.unlink(tmp)
+            raise
+        self._evict()
+
+    def _entries(self):
+        """[(mtime, size, path)] for every cached entry."""
+        out = []
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return out
+        for name in names:
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.root, name)
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            out.append((st.st_mtime, st.st_size, path))
+        return out
+
+    def _evict(self):
+        with self._lock:
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+
+    def size_bytes(self):
+        return sum(size for _, size, _ in self._entries())
+
+    def clear(self):
+        """Delete every cached entry."""
+        for _, _, path in self._entries():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
@@ -1,8 +1,14 @@
 """Pick a representative audio sample per speaker, and extract the clip.
 
-pick_speaker_samples is pure (operates on the word list). extract_clip does I/O
-via the bundled ffmpeg binary (tathurell.ffmpeg) — no system ffmpeg required.
+pick_speaker_samples is pure (operates on the word list). clip_wav_bytes and
+extract_clip slice the decode-once audio store (tathurell.audio), so the file
+is decoded at most once however many clips are cut from it, and a clip costs
+no subprocess.
 """
+import io
+
+from tathurell.audio import clip, load_audio, write_wav
+from tathurell.wordtable import WordTable
 
 
 def pick_speaker_samples(words, max_seconds=8.0):
@@ -11,55 +17,54 @@ def pick_speaker_samples(words, max_seconds=8.0):
     Returns {speaker: {"start": float, "end": float, "text": str}}. The window is
     the longest run's first-word start to either the run end or start+max_seconds,
     whichever is sooner; text is the run's words whose start falls in that window.
-    Words with speaker None are ignored (not a nameable speaker).
+    Words with speaker None are ignored (not a nameable speaker). `words` may
+    also be a WordTable.
     """
-    runs = []  # list of (speaker, [word, ...])
-    for w in words:
-        spk = w.get("speaker")
+    if isinstance(words, WordTable):
+        rows = list(zip(words.words, words.speaker_labels(), words.start.tolist(),
+                        words.end.tolist()))
+    else:
+        rows = [(w["word"], w.get("speaker"), w["start"], w["end"]) for w in words]
+
+    runs = []  # list of (speaker, [row, ...])
+    for row in rows:
+        spk = row[1]
         if spk is None:
             continue
         if runs and runs[-1][0] == spk:
-            runs[-1][1].append(w)
+            runs[-1][1].append(row)
         else:
-            runs.append((spk, [w]))
+            runs.append((spk, [row]))
 
-    best = {}  # speaker -> (duration, run_words)
-    for spk, ws in runs:
-        dur = ws[-1]["end"] - ws[0]["start"]
+    best = {}  # speaker -> (duration, run_rows)
+    for spk, rs in runs:
+        dur = rs[-1][3] - rs[0][2]
         if spk not in best or dur > best[spk][0]:
-            best[spk] = (dur, ws)
+            best[spk] = (dur, rs)
 
     out = {}
-    for spk, (_dur, ws) in best.items():
-        start = ws[0]["start"]
+    for spk, (_dur, rs) in best.items():
+        start = rs[0][2]
         cap_end = start + max_seconds
-        end = min(ws[-1]["end"], cap_end)
-        text = " ".join(w["word"] for w in ws if w["start"] < cap_end)
+        end = min(rs[-1][3], cap_end)
+        text = " ".join(word for word, _, s, _ in rs if s < cap_end)
         out[spk] = {"start": start, "end": end, "text": text}
     return out
 
 
+def clip_wav_bytes(audio_path, start, end):
+    """The [start, end] second slice of audio_path as WAV bytes, built in memory
+    (16 kHz mono 16-bit PCM, which the browser plays directly)."""
+    buf = io.BytesIO()
+    write_wav(clip(load_audio(audio_path), start, end), buf)
+    return buf.getvalue()
+
+
 def extract_clip(audio_path, start, end, out_path):
     """Write the [start, end] second slice of audio_path to out_path as a WAV.
 
-    Calls the bundled ffmpeg directly (tathurell.ffmpeg) so no system ffmpeg is
-    needed. Output is 44.1 kHz stereo 16-bit PCM, which the naming modal plays
-    in-browser. `-ss` before `-i` is a fast seek (cheap on long files); `-vn`
-    drops any video/cover-art stream.
+    Slices the memory-mapped decode of audio_path (decoding it with the bundled
+    ffmpeg on first use only, so no system ffmpeg is needed). Output is 16 kHz
+    mono 16-bit PCM, which the naming modal plays in-browser.
     """
-    import subprocess
-
-    from tathurell.ffmpeg import ffmpeg_exe
-
-    cmd = [
-        ffmpeg_exe(), "-nostdin", "-y",
-        "-ss", str(start), "-i", audio_path, "-t", str(end - start),
-        "-vn", "-ac", "2", "-ar", "44100", "-c:a", "pcm_s16le",
-        out_path,
-    ]
-    proc = subprocess.run(cmd, capture_output=True)
-    if proc.returncode != 0:
-        raise RuntimeError(
-            f"ffmpeg failed to extract clip from {audio_path!r}: "
-            f"{proc.stderr.decode(errors='replace')}"
-        )
+    write_wav(clip(load_audio(audio_path), start, end), out_path)
@@ -0,0 +1,188 @@
+"""Sharded ASR + alignment for long recordings, across a process pool.
+
+One CTranslate2 instance on a 3-hour file leaves most cores idle. Sharded mode
+splits the decoded audio at low-energy points (silence between utterances)
+into N contiguous shards and runs ASR + alignment on each in its own worker
+process. The decoded buffer is placed once in multiprocessing.shared_memory;
+workers map it and slice their shard, so no audio is pickled across processes.
+Word/segment times come back shard-relative and are shifted into global time
+and concatenated; diarization and speaker assignment then run once over the
+whole file as usual (whisperx_core).
+
+plan_shards and stitch_segments are pure (numpy only). Workers import whisperx
+lazily, so importing this module stays cheap.
+"""
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import resource_tracker, shared_memory
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+
+def plan_shards(audio, n, sr=SAMPLE_RATE, search_sec=15.0, frame_sec=0.03,
+                min_shard_sec=30.0):
+    """Split `audio` into up to n contiguous [start, end) sample ranges.
+
+    Each cut is placed at the quietest frame (lowest RMS over frame_sec)
+    within +-search_sec of the even split point, so shards break in pauses
+    rather than mid-word. Audio too short for n shards of min_shard_sec gets
+    fewer shards. The ranges cover the whole buffer with no gaps.
+    """
+    total = len(audio)
+    n = max(1, min(int(n), int(total / (min_shard_sec * sr)) or 1))
+    if n == 1:
+        return [(0, total)]
+    frame = max(1, int(frame_sec * sr))
+    n_frames = total // frame
+    frames = np.asarray(audio[:n_frames * frame], dtype=np.float32).reshape(n_frames, frame)
+    energy = np.sqrt(np.mean(frames * frames, axis=1))
+    search = int(search_sec * sr / frame)
+
+    cuts = [0]
+    for k in range(1, n):
+        target = (k * total // n) // frame
+        lo = max(target - search, cuts[-1] // frame + 1)
+        hi = min(target + search + 1, n_frames)
+        if lo >= hi:
+            continue
+        quiet = lo + int(np.argmin(energy[lo:hi]))
+        cuts.append(quiet * frame + frame // 2)
+    cuts.append(total)
+    return [(a, b) for a, b in zip(cuts, cuts[1:]) if b > a]
+
+
+def stitch_segments(shard_results):
+    """Merge [(offset_sec, aligned_result)] into one aligned result in global time.
+
+    Shifts every segment and word start/end by its shard's offset (words that
+    alignment could not time have no start/end and are left untimed). Shards
+    are concatenated in offset order.
+    """
+    segments = []
+    for offset, result in sorted(shard_results, key=lambda r: r[0]):
+        for seg in result["segments"]:
+            seg = dict(seg)
+            for k in ("start", "end"):
+                if k in seg:
+                    seg[k] = float(seg[k]) + offset
+            if "words" in seg:
+                words = []
+                for w in seg["words"]:
+                    w = dict(w)
+                    for k in ("start", "end"):
+                        if k in w:
+                            w[k] = float(w[k]) + offset
+                    words.append(w)
+                seg["words"] = words
+            segments.append(seg)
+    return {"segments": segments}
+
+
+# --- worker process side ---------------------------------------------------
+
+_worker = {}  # per-process: whisper model, device, align models by language
+
+
+def _init_worker(model, device, compute_type, threads):
+    import torch
+    import whisperx
+
+    from tathurell.ffmpeg import ensure_ffmpeg_on_path
+
+    ensure_ffmpeg_on_path()
+    torch.set_num_threads(threads)
+    _worker["model"] = whisperx.load_model(model, device, compute_type=compute_type,
+                                           threads=threads)
+    _worker["device"] = device
+    _worker["align"] = {}
+
+
+def _asr_align(chunk):
+    import whisperx
+
+    device = _worker["device"]
+    result = _worker["model"].transcribe(chunk, batch_size=8)
+    lang = result["language"]
+    if lang not in _worker["align"]:
+        _worker["align"][lang] = whisperx.load_align_model(language_code=lang, device=device)
+    align_model, meta = _worker["align"][lang]
+    aligned = whisperx.align(result["segments"], align_model, meta, chunk, device)
+    return {"segments": aligned["segments"]}
+
+
+def _run_shard(shm_name, length, start, end):
+    """ASR + align samples [start, end) of the shared buffer; shard-relative times."""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    # Attaching registers the segment with this process's resource tracker,
+    # which would unlink it (and warn) when the worker exits. The parent owns
+    # its lifetime, so opt out here.
+    resource_tracker.unregister(shm._name, "shared_memory")
+    audio = None
+    try:
+        audio = np.ndarray((length,), dtype=np.float32, buffer=shm.buf)
+        return start / SAMPLE_RATE, _asr_align(audio[start:end])
+    finally:
+        audio = None  # drop the buffer view before close()
+        try:
+            shm.close()
+        except BufferError:
+            pass  # a traceback still references the view; freed with the frame
+
+
+class ShardedASR:
+    """A warm pool of `shards` worker processes, each holding its own model.
+
+    The pool starts on first use and is reused across files; close() stops it.
+    Each worker gets cpu_count // shards threads (or `threads` total split
+    evenly) so the shards together fill, but don't oversubscribe, the machine.
+    """
+
+    def __init__(self, model, device, compute_type, shards, threads=None):
+        self._shards = shards
+        total = threads or os.cpu_count() or 1
+        self._args = (model, device, compute_type, max(1, total // shards))
+        self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            # spawn: a forked child would inherit the parent's torch/ctranslate2
+            # thread pools in an undefined state.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self._shards,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=self._args,
+            )
+        return self._pool
+
+    def transcribe(self, audio, progress=None):
+        """Aligned result ({"segments": [...]}) for the whole float32 buffer.
+
+        progress(done_sec, total_sec) is called as each shard finishes, with
+        the audio seconds covered by the finished shards.
+        """
+        audio = np.ascontiguousarray(audio, dtype=np.float32)
+        plan = plan_shards(audio, self._shards)
+        shm = shared_memory.SharedMemory(create=True, size=max(1, audio.nbytes))
+        try:
+            np.ndarray(audio.shape, dtype=np.float32, buffer=shm.buf)[:] = audio
+            pool = self._executor()
+            futures = {pool.submit(_run_shard, shm.name, len(audio), a, b): b - a
+                       for a, b in plan}
+            done = 0
+            for f in as_completed(futures):
+                done += futures[f]
+                if progress is not None:
+                    progress(done / SAMPLE_RATE, len(audio) / SAMPLE_RATE)
+            return stitch_segments([f.result() for f in futures])
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
@@ -0,0 +1,382 @@
+"""Multi-node transcription: workers on any machine drain a shared spool directory.
+
+  python -m tathurell.spool submit SPOOL PATH_OR_GLOB... [--manifest FILE]
+  python -m tathurell.spool worker SPOOL [--processes N] [--exit-when-empty]
+  python -m tathurell.spool status SPOOL
+
+A spool is a directory on a filesystem every node mounts (NFS, SMB, a local
+disk for one box):
+
+  queued/   {job}~{attempt}.json           waiting for a worker
+  leased/   {job}~{attempt}.json@{worker}  claimed by that worker
+  done/     {job}.json                     job plus result record
+  failed/   {job}.json                     job plus the last error
+  results/  {job}.json, {job}.txt          words, and the transcript with labels
+
+A job file names audio on the shared filesystem. Every state change is one
+rename, which is atomic on POSIX filesystems and NFS. A worker claims a job by
+renaming it from queued/ into leased/ under its own id; when two workers race,
+exactly one rename succeeds. While it works, the worker touches the lease file
+every lease_sec / 4 (the heartbeat). Finished work is committed by renaming
+the lease into done/. The results are written before that rename, so a
+committed job always has its results.
+
+Any worker reaps leases whose heartbeat is older than lease_sec (a crashed or
+partitioned worker). It renames them back into queued/ with the attempt count
+bumped, or into failed/ once max_attempts is reached. A transcription that
+raises is retried the same way. If a slow worker was reaped but still finishes,
+its commit rename finds no lease and its result is dropped; the retry writes
+the same result files. Lease ages compare file mtimes with the local clock, so
+nodes need roughly synchronised clocks (NTP); the default lease of 10 minutes
+leaves a wide margin.
+
+Workers share nothing but the directory, so throughput scales with their
+number until the filesystem or the CPUs saturate. `worker --processes N`
+starts N local workers for one box or a one-machine test of the fleet; by
+default each is given an equal share of the cores.
+"""
+import argparse
+import functools
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+from tathurell.batch import expand_inputs
+from tathurell.model_pool import ModelPool
+from tathurell.naming import apply_names, group_by_speaker
+
+LEASE_SEC = 600.0
+MAX_ATTEMPTS = 3
+POLL_SEC = 2.0
+_DIRS = ("queued", "leased", "done", "failed", "results")
+
+
+def _write_json(path, data):
+    """Write via a dot-file in the same directory and rename into place."""
+    d, name = os.path.split(path)
+    tmp = os.path.join(d, f".{name}.{uuid.uuid4().hex[:8]}.tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f)
+    os.replace(tmp, path)
+
+
+def _parse(name):
+    """'{job}~{attempt}.json[@{worker}]' -> (job, attempt, worker or None)."""
+    name, _, worker = name.partition(".json")
+    job, _, attempt = name.rpartition("~")
+    return job, int(attempt), worker[1:] or None
+
+
+class Lease:
+    """A job claimed by one worker: heartbeat it, then complete or fail it."""
+
+    def __init__(self, spool, path, job):
+        self.spool = spool
+        self.path = path
+        self.job = job
+        self.job_id, self.attempt, self.worker = _parse(os.path.basename(path))
+
+    def heartbeat(self):
+        """Renew the lease; False if it was reaped or committed already."""
+        try:
+            os.utime(self.path)
+        except FileNotFoundError:
+            return False
+        return True
+
+    @contextmanager
+    def keepalive(self, interval):
+        """Heartbeat every `interval` seconds in the background."""
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(interval) and self.heartbeat():
+                pass
+
+        t = threading.Thread(target=beat, daemon=True)
+        t.start()
+        try:
+            yield
+        finally:
+            stop.set()
+            t.join()
+
+    def complete(self, record):
+        """Commit: lease -> done/. False if the lease was lost (reaped)."""
+        done = os.path.join(self.spool.root, "done", f"{self.job_id}.json")
+        try:
+            os.rename(self.path, done)
+        except FileNotFoundError:
+            return False
+        _write_json(done, {**self.job, **record})
+        return True
+
+    def fail(self, error, max_attempts=MAX_ATTEMPTS):
+        """Release for a retry, or to failed/ after max_attempts."""
+        return self.spool._requeue(self.path, error, max_attempts)
+
+
+class Spool:
+    """The spool directory (see the module docstring)."""
+
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+        for d in _DIRS:
+            os.makedirs(os.path.join(self.root, d), exist_ok=True)
+
+    def _dir(self, name):
+        return os.path.join(self.root, name)
+
+    def _names(self, name):
+        return sorted(n for n in os.listdir(self._dir(name)) if not n.startswith("."))
+
+    def count(self, state):
+        """Jobs in one state directory ("queued", "leased", "done", "failed")."""
+        return len(self._names(state))
+
+    def submit(self, audio_path):
+        """Queue one audio file -> its job id (time-ordered, so FIFO by name)."""
+        job_id = f"{time.time_ns():020d}-{uuid.uuid4().hex[:8]}"
+        job = {"job_id": job_id, "audio_path": os.path.abspath(audio_path),
+               "submitted_at": time.time()}
+        _write_json(os.path.join(self._dir("queued"), f"{job_id}~1.json"), job)
+        return job_id
+
+    def claim(self, worker_id):
+        """Lease the oldest queued job for worker_id; None if the queue is empty."""
+        for name in self._names("queued"):
+            src = os.path.join(self._dir("queued"), name)
+            dst = os.path.join(self._dir("leased"), f"{name}@{worker_id}")
+            try:
+                # Fresh mtime before the rename, so the new lease never looks
+                # expired to a reaper on another node.
+                os.utime(src)
+                os.rename(src, dst)
+            except FileNotFoundError:
+                continue  # another worker got it first
+            with open(dst) as f:
+                return Lease(self, dst, json.load(f))
+        return None
+
+    def _requeue(self, lease_path, error, max_attempts):
+        """Move a lease back to queued/ (attempt + 1) or to failed/ ->
+        "queued", "failed", or None if someone else moved it first."""
+        job_id, attempt, _worker = _parse(os.path.basename(lease_path))
+        if attempt < max_attempts:
+            dst = os.path.join(self._dir("queued"), f"{job_id}~{attempt + 1}.json")
+            state = "queued"
+        else:
+            dst = os.path.join(self._dir("failed"), f"{job_id}.json")
+            state = "failed"
+        try:
+            os.rename(lease_path, dst)
+        except FileNotFoundError:
+            return None
+        if state == "failed":
+            with open(dst) as f:
+                job = json.load(f)
+            _write_json(dst, {**job, "attempts": attempt, "error": error})
+        return state
+
+    def reap(self, lease_sec=LEASE_SEC, max_attempts=MAX_ATTEMPTS, now=None):
+        """Requeue (or fail) leases whose heartbeat is older than lease_sec ->
+        [(job_id, state)]."""
+        now = time.time() if now is None else now
+        out = []
+        for name in self._names("leased"):
+            path = os.path.join(self._dir("leased"), name)
+            try:
+                age = now - os.stat(path).st_mtime
+            except FileNotFoundError:
+                continue
+            if age <= lease_sec:
+                continue
+            job_id, _attempt, worker = _parse(name)
+            state = self._requeue(path, f"lease expired: worker {worker} stopped "
+                                        f"heartbeating ({age:.0f}s)", max_attempts)
+            if state is not None:
+                out.append((job_id, state))
+        return out
+
+    def write_result(self, job_id, words):
+        """results/{job}.json (words) and {job}.txt (labelled transcript)."""
+        base = os.path.join(self._dir("results"), job_id)
+        _write_json(base + ".json", list(words))
+        tmp = os.path.join(self._dir("results"), f".{job_id}.{uuid.uuid4().hex[:8]}.tmp")
+        with open(tmp, "w") as f:
+            f.write(apply_names(group_by_speaker(words), {}))
+        os.replace(tmp, base + ".txt")
+        return base + ".txt"
+
+    def status(self):
+        """Counts per state, plus fleet throughput from the done records."""
+        counts = {d: self.count(d) for d in ("queued", "leased", "done", "failed")}
+        spans, busy = [], 0.0
+        for name in self._names("done"):
+            try:
+                with open(os.path.join(self._dir("done"), name)) as f:
+                    rec = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue  # being rewritten right now
+            if "started_at" in rec:
+                spans.append((rec["started_at"], rec["finished_at"]))
+                busy += rec["finished_at"] - rec["started_at"]
+        out = dict(counts)
+        if spans:
+            wall = max(f for _, f in spans) - min(s for s, _ in spans)
+            out["jobs_per_min"] = 60 * len(spans) / wall if wall > 0 else None
+            out["mean_job_sec"] = busy / len(spans)
+            out["active_workers"] = len({n.rpartition("@")[2] for n in self._names("leased")})
+        return out
+
+
+def worker_id():
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+class SpoolWorker:
+    """Claim, transcribe and commit jobs until stopped (or the queue is empty)."""
+
+    def __init__(self, spool, factory, worker=None, lease_sec=LEASE_SEC,
+                 max_attempts=MAX_ATTEMPTS, poll_sec=POLL_SEC, log=sys.stderr):
+        self.spool = spool
+        self.pool = ModelPool(factory, size=1)  # built on the first job
+        self.worker = worker or worker_id()
+        self.lease_sec = lease_sec
+        self.max_attempts = max_attempts
+        self.poll_sec = poll_sec
+        self._log = log
+        self.stop_event = threading.Event()
+
+    def _say(self, message):
+        print(f"[tathurell] {self.worker}: {message}", file=self._log)
+
+    def process(self, lease):
+        started = time.time()
+        try:
+            with lease.keepalive(self.lease_sec / 4), self.pool.lease() as transcriber:
+                words = transcriber.transcribe(lease.job["audio_path"])
+                result = self.spool.write_result(lease.job_id, words)
+        except Exception as exc:
+            state = lease.fail(f"{type(exc).__name__}: {exc}", self.max_attempts)
+            self._say(f"{lease.job_id} attempt {lease.attempt} failed ({exc}); {state}")
+            return False
+        finished = time.time()
+        committed = lease.complete({
+            "worker": self.worker, "attempt": lease.attempt, "started_at": started,
+            "finished_at": finished, "words": len(words), "result": result,
+        })
+        if committed:
+            self._say(f"{lease.job_id} done in {finished - started:.1f}s")
+        else:
+            self._say(f"{lease.job_id} finished after its lease was reaped; dropped")
+        return committed
+
+    def run(self, exit_when_empty=False):
+        """Work until stop_event is set; with exit_when_empty, also return once
+        nothing is queued or leased -> jobs committed by this worker."""
+        done = 0
+        while not self.stop_event.is_set():
+            for job_id, state in self.spool.reap(self.lease_sec, self.max_attempts):
+                self._say(f"reaped expired lease {job_id}; {state}")
+            lease = self.spool.claim(self.worker)
+            if lease is None:
+                if exit_when_empty and not self.spool.count("leased"):
+                    break
+                self.stop_event.wait(self.poll_sec)
+                continue
+            done += self.process(lease)
+        return done
+
+
+def _default_factory(model, threads):
+    from tathurell.progress import RtfHistory
+    from tathurell.result_cache import ResultCache
+    from tathurell.whisperx_core import WhisperXTranscriber
+
+    return WhisperXTranscriber(model=model, threads=threads, cache=ResultCache(),
+                               history=RtfHistory())
+
+
+def _worker_main(root, factory, kwargs, exit_when_empty):
+    try:
+        SpoolWorker(Spool(root), factory, **kwargs).run(exit_when_empty)
+    except KeyboardInterrupt:
+        pass
+
+
+def run_local_fleet(root, factory, processes, exit_when_empty=False, **kwargs):
+    """Run `processes` SpoolWorkers as local processes (factory must be
+    picklable) and wait for them. Stand-ins for nodes, or one node's workers."""
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_worker_main, args=(root, factory, kwargs, exit_when_empty),
+                         name=f"tathurell-spool-{i}")
+             for i in range(processes)]
+    for p in procs:
+        p.start()
+    try:
+        for p in procs:
+            p.join()
+    except KeyboardInterrupt:
+        # Their leases expire and are retried by the rest of the fleet.
+        for p in procs:
+            p.terminate()
+        for p in procs:
+            p.join()
+        raise
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Transcribe from a shared spool directory.")
+    sub = ap.add_subparsers(dest="command", required=True)
+    p = sub.add_parser("submit", help="queue audio files")
+    p.add_argument("spool")
+    p.add_argument("paths", nargs="*", help="audio files or glob patterns")
+    p.add_argument("--manifest", action="append", default=[],
+                   help="file listing audio paths, one per line (repeatable)")
+    p = sub.add_parser("worker", help="process queued jobs")
+    p.add_argument("spool")
+    p.add_argument("--processes", type=int, default=1, help="local worker processes")
+    p.add_argument("--threads", type=int, default=None,
+                   help="CPU threads per worker (default: cores / processes)")
+    p.add_argument("--model", default="large-v3", help="Whisper model (default: large-v3)")
+    p.add_argument("--lease", type=float, default=LEASE_SEC,
+                   help="seconds without a heartbeat before a job is retried elsewhere")
+    p.add_argument("--max-attempts", type=int, default=MAX_ATTEMPTS)
+    p.add_argument("--exit-when-empty", action="store_true",
+                   help="stop once nothing is queued or leased")
+    p = sub.add_parser("status", help="print job counts and throughput")
+    p.add_argument("spool")
+    args = ap.parse_args(argv)
+
+    spool = Spool(args.spool)
+    if args.command == "submit":
+        paths = expand_inputs(args.paths, args.manifest)
+        for path in paths:
+            spool.submit(path)
+        print(f"[tathurell] queued {len(paths)} file(s) in {spool.root}")
+    elif args.command == "status":
+        print(json.dumps(spool.status(), indent=2))
+    else:
+        threads = args.threads or max(1, (os.cpu_count() or 1) // args.processes)
+        factory = functools.partial(_default_factory, args.model, threads)
+        kwargs = {"lease_sec": args.lease, "max_attempts": args.max_attempts}
+        if args.processes == 1:
+            _worker_main(spool.root, factory, kwargs, args.exit_when_empty)
+        else:
+            try:
+                run_local_fleet(spool.root, factory, args.processes,
+                                exit_when_empty=args.exit_when_empty, **kwargs)
+            except KeyboardInterrupt:
+                pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,133 @@
+"""Per-stage wall time, CPU time and memory for one transcription.
+
+WhisperXTranscriber wraps each pipeline stage (decode, asr, align_model_load,
+align, diarize, assign, realign, confidence) in `stats.stage(name)`. With
+stats disabled the collector is NULL_STATS, whose stage() is a shared no-op
+context manager, so the hooks cost a method call per stage.
+
+For each stage a TranscriptionStats records:
+
+  wall_sec      elapsed time
+  cpu_sec       process CPU time (all threads, including the native ones in
+                CTranslate2 and torch); stages that overlap, as ASR and
+                diarization do in concurrent mode, each count the shared CPU
+  peak_rss_mb   highest resident set size seen while the stage ran, sampled
+                every `sample_sec` by a background thread
+  rss_delta_mb  resident size at the end minus at the start
+
+to_dict() is JSON-safe and write_jsonl() appends it as one line; table()
+renders the per-stage breakdown the CLI prints with --stats.
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+from tathurell.model_pool import current_rss_mb
+
+STAGES = ("decode", "asr", "align_model_load", "align", "diarize", "assign",
+          "realign", "confidence")
+
+
+class _NullStats:
+    """Disabled collector: every hook is a no-op."""
+
+    enabled = False
+    _null = nullcontext()
+
+    def stage(self, name):
+        return self._null
+
+    def set(self, **fields):
+        pass
+
+
+NULL_STATS = _NullStats()
+
+
+class TranscriptionStats:
+    """Stage measurements for one transcription (see the module docstring)."""
+
+    enabled = True
+
+    def __init__(self, sample_sec=0.05):
+        self.sample_sec = sample_sec
+        self.stages = []   # [{"stage", "wall_sec", "cpu_sec", "peak_rss_mb", "rss_delta_mb"}]
+        self.fields = {}   # run-level facts: audio path/seconds, model, cache hit...
+        self._t0 = time.perf_counter()
+        self._open = {}    # id -> peak RSS seen so far, for stages in progress
+        self._lock = threading.Lock()
+        self._sampler = None
+        self._stop = threading.Event()
+
+    def set(self, **fields):
+        self.fields.update(fields)
+
+    def _sample(self):
+        while not self._stop.wait(self.sample_sec):
+            rss = current_rss_mb()
+            with self._lock:
+                for key, peak in self._open.items():
+                    if rss > peak:
+                        self._open[key] = rss
+
+    @contextmanager
+    def stage(self, name):
+        rss0 = current_rss_mb()
+        key = object()
+        with self._lock:
+            self._open[key] = rss0
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample, daemon=True)
+                self._sampler.start()
+        wall0, cpu0 = time.perf_counter(), time.process_time()
+        try:
+            yield
+        finally:
+            wall, cpu = time.perf_counter() - wall0, time.process_time() - cpu0
+            rss1 = current_rss_mb()
+            with self._lock:
+                peak = max(self._open.pop(key), rss1)
+                self.stages.append({
+                    "stage": name,
+                    "wall_sec": wall,
+                    "cpu_sec": cpu,
+                    "peak_rss_mb": peak,
+                    "rss_delta_mb": rss1 - rss0,
+                })
+
+    def close(self):
+        """Stop the RSS sampler (the stats stay readable)."""
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        self.fields.setdefault("total_wall_sec", time.perf_counter() - self._t0)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild (closed) stats from to_dict() output, e.g. sent by the daemon."""
+        st = cls()
+        st.fields = {k: v for k, v in data.items() if k != "stages"}
+        st.stages = [dict(s) for s in data.get("stages", [])]
+        return st
+
+    def to_dict(self):
+        return {**self.fields, "stages": [dict(s) for s in self.stages]}
+
+    def write_jsonl(self, path):
+        """Append this run as one JSON line to `path`."""
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(self.to_dict(), separators=(",", ":")) + "\n")
+
+    def table(self):
+        """The per-stage breakdown as a markdown table."""
+        total = sum(s["wall_sec"] for s in self.stages) or 1.0
+        lines = ["| stage | wall s | % | cpu s | peak RSS MB | RSS delta MB |",
+                 "| --- | --- | --- | --- | --- | --- |"]
+        for s in self.stages:
+            lines.append(f"| {s['stage']} | {s['wall_sec']:.2f} | "
+                         f"{100 * s['wall_sec'] / total:.0f} | {s['cpu_sec']:.2f} | "
+                         f"{s['peak_rss_mb']:.0f} | {s['rss_delta_mb']:+.0f} |")
+        return "\n".join(lines)
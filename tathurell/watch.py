@@ -0,0 +1,404 @@
+"""Watch-folder ingestion: discover new recordings, queue them durably, transcribe.
+
+  python -m tathurell.watch DIR... [--workers N] [--db PATH] [--output-dir DIR]
+  python -m tathurell.watch status [--db PATH]
+
+Recorders drop files into shared directories. The watcher polls them every
+`interval` seconds. An audio file is enqueued once its size and mtime have
+not changed for `settle_sec`, so a file still being written is left alone.
+The queue is a SQLite table (WorkQueue). An item is one (path, size, mtime),
+so a file is processed once, however often it is rescanned or the service
+restarted, and a file overwritten in place counts as new work.
+
+Several services on one host can drain one queue. The database must be on a
+local filesystem: it runs in WAL mode, which needs memory shared between its
+connections, so a network filesystem is not supported. A running item
+records its owner's pid, and the owner refreshes the item's heartbeat every
+scan. The next scan of any service queues an item again once its owner's pid
+is gone or its heartbeat is older than STALE_SEC (a pid reused by another
+process after a crash or reboot sends none). Items of live owners stay put.
+
+`workers` threads take items in arrival order and transcribe them with warm
+transcribers leased from one ModelPool, so the models are loaded at most once
+per worker for the life of the service. Transcripts are written like the
+batch mode's (tathurell.batch: next to the audio or in --output-dir, names
+from --names, else speaker labels). A failed item is marked `error` with its
+message and is not retried.
+
+Every item records when it was enqueued, started and finished. stats() (and
+the `status` command, which reads the database from any process) reports the
+queue depth, counts by state, and the median / p95 queue wait, processing
+time and total latency of the last LATENCY_WINDOW finished items.
+"""
+import argparse
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import threading
+import time
+
+from tathurell.batch import load_names, names_for, output_path
+from tathurell.model_pool import ModelPool
+from tathurell.naming import apply_names, group_by_speaker
+from tathurell.result_cache import cache_root
+
+AUDIO_EXTS = frozenset({".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus", ".aac",
+                        ".wma", ".mp4", ".webm"})
+SETTLE_SEC = 10.0      # size/mtime unchanged this long -> the writer is done
+SCAN_INTERVAL_SEC = 5.0
+LATENCY_WINDOW = 200   # finished items the latency percentiles cover
+STALE_SEC = 300.0      # running item without a heartbeat this long -> its owner died
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS items (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    state TEXT NOT NULL DEFAULT 'queued',  -- queued | running | done | error
+    enqueued_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    output TEXT,
+    error TEXT,
+    owner TEXT,            -- pid of the service running it
+    heartbeat_at REAL,
+    UNIQUE (path, size, mtime_ns)
+);
+CREATE INDEX IF NOT EXISTS items_state ON items (state, id);
+"""
+
+
+def this_owner():
+    """This process's pid, as recorded on the items it claims."""
+    return str(os.getpid())
+
+
+def _owner_alive(owner, heartbeat_at, cutoff):
+    """Whether the service that claimed an item may still be running it: its
+    pid exists and it has sent a heartbeat since `cutoff`."""
+    if owner is None or heartbeat_at is None or heartbeat_at < cutoff:
+        return False  # never owned, or its owner stopped beating
+    try:
+        os.kill(int(owner), 0)
+    except (ProcessLookupError, ValueError):  # ValueError: not a pid
+        return False
+    except PermissionError:
+        pass  # alive, owned by another user
+    return True
+
+
+def default_db():
+    return os.path.join(cache_root(), "watch.sqlite3")
+
+
+def _percentiles(values):
+    if not values:
+        return {"median": None, "p95": None}
+    values = sorted(values)
+    return {"median": statistics.median(values),
+            "p95": values[min(len(values) - 1, int(0.95 * len(values)))]}
+
+
+class WorkQueue:
+    """Durable FIFO of audio files in a SQLite database (see the module docstring).
+
+    Safe to share between threads; claim() takes a write lock on the database,
+    so several processes on this host can also drain the same queue. Items
+    claimed here are owned by `owner` (default: this process, see this_owner).
+    """
+
+    def __init__(self, path=None, clock=time.time, owner=None):
+        self.path = path or default_db()
+        self._clock = clock
+        self.owner = owner or this_owner()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._db = sqlite3.connect(self.path, isolation_level=None, check_same_thread=False,
+                                   timeout=30)
+        self._lock = threading.Lock()
+        with self._lock:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+            columns = {row[1] for row in self._db.execute("PRAGMA table_info(items)")}
+            for column, kind in (("owner", "TEXT"), ("heartbeat_at", "REAL")):
+                if column not in columns:  # a database from before owners
+                    self._db.execute(f"ALTER TABLE items ADD COLUMN {column} {kind}")
+
+    def close(self):
+        with self._lock:
+            self._db.close()
+
+    def requeue_running(self, stale_sec=STALE_SEC):
+        """Put items whose owner died back in the queue -> how many (see the
+        module docstring). Items of live owners, this one included, stay."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                cutoff = self._clock() - stale_sec
+                dead = [(item_id,) for item_id, owner, beat in self._db.execute(
+                    "SELECT id, owner, heartbeat_at FROM items WHERE state = 'running'")
+                    if not _owner_alive(owner, beat, cutoff)]
+                self._db.executemany(
+                    "UPDATE items SET state = 'queued', started_at = NULL, owner = NULL,"
+                    " heartbeat_at = NULL WHERE id = ?", dead)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return len(dead)
+
+    def heartbeat(self):
+        """Mark this owner's running items as still in progress."""
+        with self._lock:
+            self._db.execute(
+                "UPDATE items SET heartbeat_at = ? WHERE state = 'running' AND owner = ?",
+                (self._clock(), self.owner))
+
+    def known(self, path, size, mtime_ns):
+        with self._lock:
+            return self._db.execute(
+                "SELECT 1 FROM items WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, size, mtime_ns)).fetchone() is not None
+
+    def enqueue(self, path, size, mtime_ns):
+        """Queue one version of a file; False if that version was already seen."""
+        with self._lock:
+            return self._db.execute(
+                "INSERT OR IGNORE INTO items (path, size, mtime_ns, enqueued_at)"
+                " VALUES (?, ?, ?, ?)", (path, size, mtime_ns, self._clock())).rowcount == 1
+
+    def claim(self):
+        """The oldest queued item as (id, path), now marked running; None if empty."""
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT id, path FROM items WHERE state = 'queued'"
+                    " ORDER BY id LIMIT 1").fetchone()
+                if row is not None:
+                    now = self._clock()
+                    self._db.execute(
+                        "UPDATE items SET state = 'running', started_at = ?, owner = ?,"
+                        " heartbeat_at = ?, attempts = attempts + 1 WHERE id = ?",
+                        (now, self.owner, now, row[0]))
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return row
+
+    def finish(self, item_id, output):
+        with self._lock:
+            self._db.execute(
+                "UPDATE items SET state = 'done', finished_at = ?, output = ?, error = NULL"
+                " WHERE id = ?", (self._clock(), output, item_id))
+
+    def fail(self, item_id, error):
+        with self._lock:
+            self._db.execute(
+                "UPDATE items SET state = 'error', finished_at = ?, error = ? WHERE id = ?",
+                (self._clock(), error, item_id))
+
+    def item(self, item_id):
+        """One item as a dict (all columns)."""
+        with self._lock:
+            cur = self._db.execute("SELECT * FROM items WHERE id = ?", (item_id,))
+            row = cur.fetchone()
+            return None if row is None else dict(zip([c[0] for c in cur.description], row))
+
+    def stats(self):
+        """JSON-safe queue report (see the module docstring)."""
+        with self._lock:
+            counts = dict(self._db.execute(
+                "SELECT state, COUNT(*) FROM items GROUP BY state").fetchall())
+            oldest = self._db.execute(
+                "SELECT MIN(enqueued_at) FROM items WHERE state = 'queued'").fetchone()[0]
+            recent = self._db.execute(
+                "SELECT enqueued_at, started_at, finished_at FROM items"
+                " WHERE state = 'done' ORDER BY finished_at DESC LIMIT ?",
+                (LATENCY_WINDOW,)).fetchall()
+        return {
+            "depth": counts.get("queued", 0),
+            "running": counts.get("running", 0),
+            "done": counts.get("done", 0),
+            "error": counts.get("error", 0),
+            "oldest_queued_sec": None if oldest is None else self._clock() - oldest,
+            "wait_sec": _percentiles([s - q for q, s, _ in recent]),
+            "process_sec": _percentiles([f - s for _, s, f in recent]),
+            "latency_sec": _percentiles([f - q for q, _, f in recent]),
+        }
+
+
+class Watcher:
+    """Finds audio files under `dirs` that have stopped growing and enqueues them."""
+
+    def __init__(self, dirs, queue, settle_sec=SETTLE_SEC, exts=AUDIO_EXTS,
+                 clock=time.monotonic):
+        self.dirs = [os.path.abspath(d) for d in dirs]
+        self.queue = queue
+        self.settle_sec = settle_sec
+        self.exts = exts
+        self._clock = clock
+        self._settling = {}  # path -> ((size, mtime_ns), first seen with that version)
+
+    def _files(self):
+        for root in self.dirs:
+            for dirpath, _dirnames, filenames in os.walk(root):
+                for name in filenames:
+                    if (not name.startswith(".")
+                            and os.path.splitext(name)[1].lower() in self.exts):
+                        yield os.path.join(dirpath, name)
+
+    def scan(self):
+        """One pass over the directories -> paths enqueued by it."""
+        now = self._clock()
+        seen, added = set(), []
+        for path in self._files():
+            try:
+                st = os.stat(path)
+            except FileNotFoundError:
+                continue
+            version = (st.st_size, st.st_mtime_ns)
+            seen.add(path)
+            if self.queue.known(path, *version):
+                self._settling.pop(path, None)
+                continue
+            prev = self._settling.get(path)
+            if prev is None or prev[0] != version:
+                self._settling[path] = (version, now)  # new or still being written
+            elif now - prev[1] >= self.settle_sec:
+                del self._settling[path]
+                if self.queue.enqueue(path, *version):
+                    added.append(path)
+        for path in set(self._settling) - seen:
+            del self._settling[path]  # removed before it settled
+        return added
+
+
+class WatchService:
+    """Scan, queue and transcribe until stop() (see the module docstring)."""
+
+    def __init__(self, dirs, factory, queue, workers=1, output_dir=None, names=None,
+                 settle_sec=SETTLE_SEC, interval=SCAN_INTERVAL_SEC, log=sys.stderr):
+        self.queue = queue
+        self.watcher = Watcher(dirs, queue, settle_sec=settle_sec)
+        self.pool = ModelPool(factory, size=workers)
+        self.workers = workers
+        self.output_dir = output_dir
+        self.names = names or {}
+        self.interval = interval
+        self._log = log
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._threads = []
+
+    def _say(self, message):
+        print(f"[tathurell] {message}", file=self._log)
+
+    def process(self, item_id, path):
+        t0 = time.perf_counter()
+        try:
+            with self.pool.lease() as transcriber:
+                words = transcriber.transcribe(path)
+            out = output_path(path, self.output_dir)
+            with open(out, "w") as f:
+                f.write(apply_names(group_by_speaker(words), names_for(self.names, path)))
+        except Exception as exc:
+            self.queue.fail(item_id, f"{type(exc).__name__}: {exc}")
+            self._say(f"failed {path}: {type(exc).__name__}: {exc}")
+            return
+        self.queue.finish(item_id, out)
+        self._say(f"done {path} in {time.perf_counter() - t0:.1f}s -> {out}")
+
+    def _work(self):
+        while not self._stop.is_set():
+            item = self.queue.claim()
+            if item is None:
+                self._wake.wait(self.interval)
+                self._wake.clear()
+                continue
+            self.process(*item)
+
+    def _requeue(self):
+        n = self.queue.requeue_running()
+        if n:
+            self._say(f"requeued {n} item(s) whose service stopped")
+
+    def start(self):
+        """Requeue interrupted items and start the workers (scanning is run()'s)."""
+        self._requeue()
+        if self.output_dir is not None:
+            os.makedirs(self.output_dir, exist_ok=True)
+        for i in range(self.workers):
+            t = threading.Thread(target=self._work, name=f"tathurell-watch-{i}", daemon=True)
+            t.start()
+            self._threads.append(t)
+
+    def run(self):
+        """start(), then scan every `interval` seconds until stop()."""
+        self.start()
+        while not self._stop.is_set():
+            self.queue.heartbeat()
+            self._requeue()
+            added = self.watcher.scan()
+            if added:
+                self._say(f"queued {len(added)} file(s); depth {self.queue.stats()['depth']}")
+                self._wake.set()
+            self._stop.wait(self.interval)
+        for t in self._threads:
+            t.join()
+
+    def stop(self):
+        """Stop scanning; workers finish their current item and exit."""
+        self._stop.set()
+        self._wake.set()
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Transcribe audio files as they appear in folders.")
+    ap.add_argument("dirs", nargs="*", help="directories to watch ('status' prints the queue)")
+    ap.add_argument("--db", default=None, help=f"queue database (default: {default_db()})")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="files transcribed at once, each with its own warm models")
+    ap.add_argument("--output-dir", default=None,
+                    help="write transcripts here (default: next to each audio file)")
+    ap.add_argument("--names", default=None,
+                    help="JSON mapping of speaker labels to names (see tathurell.batch)")
+    ap.add_argument("--settle", type=float, default=SETTLE_SEC,
+                    help="seconds a file's size must hold still before it is queued")
+    ap.add_argument("--interval", type=float, default=SCAN_INTERVAL_SEC,
+                    help="seconds between directory scans")
+    ap.add_argument("--model", default="large-v3", help="Whisper model (default: large-v3)")
+    args = ap.parse_args(argv)
+
+    if args.dirs == ["status"]:
+        queue = WorkQueue(args.db)
+        print(json.dumps(queue.stats(), indent=2))
+        queue.close()
+        return 0
+    if not args.dirs:
+        ap.error("give at least one directory to watch")
+
+    def factory():
+        from tathurell.progress import RtfHistory
+        from tathurell.result_cache import ResultCache
+        from tathurell.whisperx_core import WhisperXTranscriber
+
+        return WhisperXTranscriber(model=args.model, cache=ResultCache(), history=RtfHistory())
+
+    service = WatchService(args.dirs, factory, WorkQueue(args.db), workers=args.workers,
+                           output_dir=args.output_dir, names=load_names(args.names),
+                           settle_sec=args.settle, interval=args.interval)
+    print(f"[tathurell] watching {', '.join(service.watcher.dirs)}", file=sys.stderr)
+    try:
+        service.run()
+    except KeyboardInterrupt:
+        service.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
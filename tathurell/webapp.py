@@ -1,36 +1,87 @@
 """Front-door transcription web app (Phase 1).
 
 upload -> transcribe (background job, coarse stage progress) -> name speakers
--> inline preview + download. Persistent, one-shot, single job at a time.
+-> review -> inline preview + download. Each upload is a job with its own id
+and endpoints (/jobs/<id>/...); jobs queue FIFO behind `--workers` concurrent
+transcriptions and expire after JOB_TTL_SEC unused (tathurell.webapp.JobManager).
+The launcher runs them in long-lived worker processes (tathurell.workers) that
+POST /jobs/<id>/cancel can kill; `--in-process` keeps them in server threads.
 Launched via `python -m tathurell.webapp`. The CLI (tathurell_transcribe.py) and
-naming_ui.collect_names are unaffected.
+naming_ui.collect_names are unaffected. Models stay warm across jobs in a
+process-wide ModelPool (tathurell.model_pool); `--preload` starts loading them
+at launch, in the background, while the page is already served. whisperx and
+torch are not imported until a transcriber is built.
 """
+import argparse
+import collections
+import functools
+import hashlib
+import json
 import os
 import shutil
 import sys
 import tempfile
 import threading
+import time
+import uuid
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import Flask, Response, jsonify, request, send_file
 from werkzeug.serving import make_server
 
+from tathurell.audio import encode_stream
+from tathurell.lru import LRUCache
+from tathurell.model_pool import shared_pool
 from tathurell.naming import group_by_speaker, render_runs
-from tathurell.sampling import extract_clip, pick_speaker_samples
-from tathurell.whisperx_core import WhisperXTranscriber
+from tathurell.progress import RtfHistory, accepts_kwarg
+from tathurell.result_cache import ResultCache
+from tathurell.sampling import clip_wav_bytes, pick_speaker_samples
+from tathurell.workers import JobCancelled, ProcessWorker
 
+# Review clips kept in memory, by encoded size (~200 ten-second clips at 64 MB).
+CLIP_CACHE_BYTES = int(os.environ.get("TATHURELL_CLIP_CACHE_BYTES", 64 * 1024 * 1024))
+# Runs below this confidence are flagged in review (the UI slider's default)
+# and have their clips encoded ahead of the first play.
+LOW_CONFIDENCE = 0.4
+# A finished or abandoned job (and its temp dir) is dropped after this long
+# without a request touching it.
+JOB_TTL_SEC = float(os.environ.get("TATHURELL_JOB_TTL_SEC", 6 * 60 * 60))
 
-class Job:
-    """Single in-process transcription job: one-shot, lock-guarded state.
+# GET /events sends a comment this often while nothing changes, so proxies
+# and the browser keep an idle stream open.
+EVENTS_KEEPALIVE_SEC = 15.0
+
+_ACTIVE = ("queued", "transcribing", "aligning", "diarizing", "finishing")
 
-    Lifecycle of `stage`: idle -> transcribing/aligning/diarizing/finishing
-    -> naming -> done (or -> error at any point). reset() returns to idle and
-    removes the job's temp dir.
+
+class Job:
+    """One transcription job: lock-guarded state.
+
+    Lifecycle of `stage`: idle -> queued -> transcribing/aligning/diarizing/
+    finishing -> naming -> review -> done (or -> error at any point, or ->
+    cancelled while queued or running). reset() returns to idle and removes the
+    job's temp dir. `id` is set for jobs created through JobManager; the legacy
+    single-job routes use a Job without one.
+
+    Each run is a generation: claim() starts one and returns its token, and
+    the background run passes that token (`run=`) to every setter. cancel()
+    and reset() end the generation, so a run that can't be interrupted (the
+    in-thread backend) finishes without touching the job any more, even after
+    a reset has made it idle and a new upload has started the next run.
+
+    Every change bumps `version` and wakes wait_changed(), which is what GET
+    /events blocks on instead of the page polling /status.
     """
 
-    def __init__(self):
+    def __init__(self, job_id=None):
+        self.id = job_id
         self.lock = threading.Lock()
+        self._changed = threading.Condition(self.lock)
+        self.version = 0
+        self.run = 0  # generation of the current run; see claim()
         self._tmpdir = None
+        self.touched = time.monotonic()
         self._init_state()
 
     def _init_state(self):
@@ -42,57 +93,157 @@ class Job:
         self.groups = None   # [{"speaker","text"}]
         self.runs = None     # [{"speaker","text","start","end","confidence"}] for review
         self.text = None     # final named transcript
+        self.infer_sec = None  # transcribe() wall time, excluding model load
+        self.stream = None     # (path, mimetype) of the review audio stream
+        self.progress = None   # latest tathurell.progress event while running
 
     @property
     def tmpdir(self):
         return self._tmpdir
 
-    def start(self, tmpdir, audio_name, audio_path=None):
+    @property
+    def active(self):
+        """Queued or running (not idle, waiting on the user, done or failed)."""
+        return self.stage in _ACTIVE
+
+    def touch(self):
+        self.touched = time.monotonic()
+
+    def _bump(self):
+        # Caller holds self.lock.
+        self.version += 1
+        self._changed.notify_all()
+
+    def notify(self):
+        """Signal a change that lives outside the job (e.g. its queue position)."""
+        with self.lock:
+            self._bump()
+
+    def wait_changed(self, version, timeout=None):
+        """Block until `version` is stale (or timeout); the current version."""
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+    def start(self, tmpdir, audio_name, audio_path=None, stage="transcribing"):
         with self.lock:
             self._tmpdir = tmpdir
             self.audio_name = audio_name
             self.audio_path = audio_path
             self.error = None
+            self.stage = stage
+            self._bump()
+
+    def claim(self):
+        """queued -> transcribing, starting a new run -> its token; None if the
+        job was reset since it was queued (or another worker already took it)."""
+        with self.lock:
+            if self.stage != "queued":
+                return None
+            self.run += 1
             self.stage = "transcribing"
+            self._bump()
+            return self.run
 
-    def set_stage(self, stage):
+    def _stale(self, run):
+        # Caller holds self.lock. run=None: a direct update (a route, a test).
+        return run is not None and run != self.run
+
+    def current(self, run):
+        """Whether run (a claim() token) was not cancelled or reset since."""
         with self.lock:
-            self.stage = stage
+            return not self._stale(run)
+
+    def set_stage(self, stage, run=None):
+        with self.lock:
+            if not self._stale(run):
+                self.stage = stage
+                self._bump()
+
+    def set_progress(self, event, run=None):
+        with self.lock:
+            if not self._stale(run):
+                self.progress = event
+                self._bump()
+
+    def set_infer_sec(self, sec, run=None):
+        with self.lock:
+            if not self._stale(run):
+                self.infer_sec = sec
+                self._bump()
+
+    def set_stream(self, path, mimetype, run=None):
+        with self.lock:
+            if not self._stale(run):
+                self.stream = (path, mimetype)
+                self._bump()
 
-    def set_naming(self, groups, samples):
+    def set_naming(self, groups, samples, run=None):
         with self.lock:
+            if self._stale(run):
+                return
             self.groups = groups
             self.samples = samples
             self.stage = "naming"
+            self._bump()
 
-    def set_review(self, runs):
+    def set_review(self, runs, run=None):
         with self.lock:
+            if self._stale(run):
+                return
             self.runs = runs
             self.stage = "review"
+            self._bump()
 
-    def set_done(self, text):
+    def set_done(self, text, run=None):
         with self.lock:
+            if self._stale(run):
+                return
             self.text = text
             self.stage = "done"
+            self._bump()
 
-    def set_error(self, message):
+    def set_error(self, message, run=None):
         with self.lock:
+            if self._stale(run):
+                return
             self.stage = "error"
             self.error = message
+            self._bump()
+
+    def cancel(self):
+        """Mark a queued or running job cancelled (ending its run); False if it
+        is neither."""
+        with self.lock:
+            if self.stage not in _ACTIVE:
+                return False
+            self.run += 1
+            self.stage = "cancelled"
+            self._bump()
+            return True
 
     def reset(self):
         with self.lock:
             if self._tmpdir:
                 shutil.rmtree(self._tmpdir, ignore_errors=True)
                 self._tmpdir = None
+            self.run += 1  # a run still going in the background is now stale
             self._init_state()
+            self._bump()
 
     def snapshot(self):
         """JSON-safe view for GET /status."""
         with self.lock:
             snap = {"stage": self.stage}
+            if self.id is not None:
+                snap["id"] = self.id
             if self.error:
                 snap["error"] = self.error
+            if self.infer_sec is not None:
+                snap["infer_sec"] = self.infer_sec
+            if self.progress is not None and self.stage in _ACTIVE:
+                snap["progress"] = {k: self.progress[k]
+                                    for k in ("fraction", "done", "total", "unit", "eta_sec")}
             if self.stage == "naming" and self.samples:
                 snap["speakers"] = [
                     {"id": spk, "text": s["text"]} for spk, s in self.samples.items()
@@ -107,6 +258,198 @@ class Job:
             return snap
 
 
+class JobManager:
+    """Jobs by id, a FIFO queue, and `workers` threads draining it.
+
+    submit() queues a started Job; each worker claims the oldest one and runs
+    it (_run_job), leasing a transcriber from `pool`. The pool is shared by
+    every worker, so models are loaded once per instance and stay warm across
+    jobs; with workers > 1 it is grown to `workers` instances, since a
+    transcriber is not re-entrant. With `procs` (one tathurell.workers.
+    ProcessWorker per worker thread) the jobs run in those processes instead,
+    and cancel() kills the process running a job. Jobs that are not queued or
+    running and haven't been touched for `ttl` seconds are removed (temp dir
+    deleted, `on_remove(job, audio_path)` called) the next time the manager is
+    used.
+    """
+
+    def __init__(self, pool, workers=1, checkpoint_dir=None, ttl=JOB_TTL_SEC,
+                 on_remove=None, procs=None):
+        if workers < 1:
+            raise ValueError(f"workers must be >= 1, got {workers}")
+        if procs is not None and len(procs) != workers:
+            raise ValueError("need one ProcessWorker per worker")
+        self.pool = pool
+        self.workers = workers
+        self.procs = procs
+        self.ttl = ttl
+        self._checkpoint_dir = checkpoint_dir
+        self._on_remove = on_remove
+        self._jobs = {}
+        self._queue = collections.deque()
+        self._running = {}  # job -> its ProcessWorker (None for in-thread)
+        self._cond = threading.Condition()
+        self.warmup = None  # None (not started) | "loading" | "ready" | "error: ..."
+        for k in range(workers):
+            proc = procs[k] if procs is not None else None
+            threading.Thread(target=self._work, args=(proc,), daemon=True).start()
+
+    def create(self):
+        """A new idle job with a fresh id, registered with the manager."""
+        self.expire()
+        job = Job(uuid.uuid4().hex[:12])
+        with self._cond:
+            self._jobs[job.id] = job
+        return job
+
+    def get(self, job_id):
+        """The job with this id (marking it used), or None."""
+        self.expire()
+        with self._cond:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            job.touch()
+        return job
+
+    def jobs(self):
+        self.expire()
+        with self._cond:
+            return list(self._jobs.values())
+
+    def submit(self, job):
+        """Queue a started job (stage "queued") behind any already waiting."""
+        with self._cond:
+            self._queue.append(job)
+            self._cond.notify()
+
+    def position(self, job):
+        """0-based place in the queue, or None if the job isn't waiting."""
+        with self._cond:
+            try:
+                return self._queue.index(job)
+            except ValueError:
+                return None
+
+    def snapshot(self, job):
+        snap = job.snapshot()
+        if snap["stage"] == "queued":
+            pos = self.position(job)
+            if pos is not None:
+                snap["position"] = pos
+        return snap
+
+    def cancel(self, job):
+        """Stop a queued or running job; False if it was neither.
+
+        A queued job is dropped from the queue. A running job's worker process
+        is killed; an in-thread run can't be interrupted, so it finishes in the
+        background and its result is discarded.
+        """
+        with self._cond:
+            try:
+                self._queue.remove(job)
+            except ValueError:
+                pass
+            cancelled = job.cancel()
+            proc = self._running.get(job)
+            if cancelled and proc is not None:
+                # Under the lock, so the cancel can't outlive this job in
+                # _running and reach the worker's next one.
+                proc.cancel()
+        self._queue_moved()
+        return cancelled
+
+    def stats(self):
+        """JSON-safe model load report (GET /models)."""
+        if self.procs is None:
+            return {**self.pool.stats(), "warmup": self.warmup}
+        return {
+            "warmup": self.warmup,
+            "size": self.workers,
+            "loaded": sum(p.pid is not None for p in self.procs),
+            "load_sec": [sec for p in self.procs for sec in p.load_sec],
+            "load_rss_mb": [mb for p in self.procs for mb in p.load_rss_mb],
+            "rss_mb": [p.rss_mb for p in self.procs],
+            "recycled": sum(p.recycled for p in self.procs),
+        }
+
+    def preload(self):
+        """Load one set of models now, so the first job starts warm."""
+        if self.procs is None:
+            self.pool.preload()
+        else:
+            self.procs[0].preload()
+
+    def warm(self, on_done=None):
+        """preload() on a background thread, so the app serves (and queues
+        uploads) while the models load; then on_done(error message or None)."""
+        def run():
+            try:
+                self.preload()
+            except Exception as exc:  # noqa: BLE001 - reported via /models
+                self.warmup = f"error: {type(exc).__name__}: {exc}"
+                error = self.warmup
+            else:
+                self.warmup, error = "ready", None
+            if on_done is not None:
+                on_done(error)
+
+        self.warmup = "loading"
+        threading.Thread(target=run, name="tathurell-warmup", daemon=True).start()
+
+    def reset(self, job):
+        """Return a job to idle: stop it, delete its temp dir, drop its clips."""
+        self.cancel(job)
+        audio_path = job.audio_path
+        job.reset()
+        if self._on_remove is not None and audio_path is not None:
+            self._on_remove(job, audio_path)
+
+    def remove(self, job_id):
+        """Forget a job and clean it up; False if there was no such job."""
+        with self._cond:
+            job = self._jobs.pop(job_id, None)
+        if job is None:
+            return False
+        self.reset(job)
+        return True
+
+    def expire(self):
+        """Remove every job idle for longer than the TTL."""
+        cutoff = time.monotonic() - self.ttl
+        with self._cond:
+            stale = [j.id for j in self._jobs.values()
+                     if not j.active and j.touched < cutoff]
+        for job_id in stale:
+            self.remove(job_id)
+
+    def _queue_moved(self):
+        # Queue positions are part of each waiting job's status.
+        with self._cond:
+            waiting = list(self._queue)
+        for job in waiting:
+            job.notify()
+
+    def _work(self, proc):
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                job = self._queue.popleft()
+                self._running[job] = proc
+            self._queue_moved()
+            try:
+                run = job.claim()
+                if run is not None:
+                    _run_job(job, self.pool, job.audio_path, self._checkpoint_dir, proc, run)
+                    job.touch()
+            finally:
+                with self._cond:
+                    del self._running[job]
+                    if proc is not None:
+                        proc.clear_cancel()  # one that arrived as the job ended
+
+
 _SHELL = """<!doctype html><html><head><meta charset="utf-8">
 <title>Tathurell — transcribe</title><style>
 body{font-family:sans-serif;max-width:760px;margin:2rem auto;padding:0 1rem}
@@ -126,6 +469,7 @@ pre{white-space:pre-wrap;background:#f6f6f6;border-radius:8px;padding:1rem;max-h
   <p><span id="spin">◐</span> <span id="stage">Starting…</span></p>
   <p class="txt">This can take a few minutes for long audio.</p>
   <p id="err"></p>
+  <button id="working-cancel">Cancel</button>
   <button id="working-reset" class="hidden">Start over</button>
 </div>
 
@@ -153,41 +497,76 @@ pre{white-space:pre-wrap;background:#f6f6f6;border-radius:8px;padding:1rem;max-h
 </div>
 
 <script>
-var LABELS={transcribing:"Transcribing…",aligning:"Aligning words…",
+var LABELS={queued:"Waiting for a free worker…",transcribing:"Transcribing…",aligning:"Aligning words…",
   diarizing:"Identifying speakers…",finishing:"Finishing…"};
 var views=["upload","working","naming","review","result"];
 function show(v){views.forEach(function(n){
   document.getElementById("view-"+n).classList.toggle("hidden",n!==v);});}
 function el(id){return document.getElementById(id);}
+// The current job's id lives in the URL fragment, so a reload resumes it.
+var JOB=null;
+function U(path){return "/jobs/"+JOB+path;}
 
 el("go").onclick=function(){
   var f=el("file").files[0]; if(!f){alert("Pick a file first.");return;}
   var fd=new FormData(); fd.append("audio",f);
-  fetch("/upload",{method:"POST",body:fd}).then(function(r){
+  fetch("/jobs",{method:"POST",body:fd}).then(function(r){
     if(!r.ok){r.text().then(function(t){alert(t);});return;}
-    el("err").textContent=""; el("working-reset").classList.add("hidden");
-    show("working"); poll();});
+    r.json().then(function(j){
+      JOB=j.id; location.hash=JOB;
+      el("err").textContent=""; el("working-reset").classList.add("hidden");
+      el("working-cancel").classList.remove("hidden");
+      show("working"); watch();});});
 };
 
+function eta(sec){
+  sec=Math.round(sec);
+  if(sec>=3600)return Math.floor(sec/3600)+"h"+("0"+Math.floor(sec%3600/60)).slice(-2)+"m";
+  if(sec>=60)return Math.floor(sec/60)+"m"+("0"+sec%60).slice(-2)+"s";
+  return sec+"s";
+}
+// Show a status snapshot; true while the job is still queued or running.
+function render(s){
+  if(s.stage==="error"){el("stage").textContent="Something went wrong.";
+    el("err").textContent=s.error||""; el("working-cancel").classList.add("hidden");
+    el("working-reset").classList.remove("hidden");return false;}
+  if(s.stage==="cancelled"){restart();return false;}
+  if(["queued","transcribing","aligning","diarizing","finishing"].indexOf(s.stage)>=0){
+    var p=s.progress||{}, extra=[];
+    if(s.position)extra.push(s.position+" ahead");
+    if(p.fraction!=null)extra.push(Math.round(p.fraction*100)+"%");
+    if(p.eta_sec!=null)extra.push("about "+eta(p.eta_sec)+" left");
+    el("stage").textContent=LABELS[s.stage]+(extra.length?" ("+extra.join(", ")+")":"");
+    show("working");return true;}
+  if(s.stage==="naming"){renderNaming(s.speakers); show("naming");return false;}
+  if(s.stage==="review"){renderReview(s.runs, s.names); show("review");return false;}
+  if(s.stage==="done"){loadResult();return false;}
+  return true;  // unknown/transient stage: keep watching rather than freeze
+}
+
 function poll(){
-  fetch("/status").then(function(r){return r.json();}).then(function(s){
-    if(s.stage==="error"){el("stage").textContent="Something went wrong.";
-      el("err").textContent=s.error||""; el("working-reset").classList.remove("hidden");return;}
-    if(["transcribing","aligning","diarizing","finishing"].indexOf(s.stage)>=0){
-      el("stage").textContent=LABELS[s.stage]; show("working"); setTimeout(poll,1000);return;}
-    if(s.stage==="naming"){renderNaming(s.speakers); show("naming");return;}
-    if(s.stage==="review"){renderReview(s.runs, s.names); show("review");return;}
-    if(s.stage==="done"){loadResult();return;}
-    setTimeout(poll,1000);  // unknown/transient stage: keep polling rather than freeze
+  fetch(U("/status")).then(function(r){
+    if(r.status===404){forget(); return null;}  // expired or reset elsewhere
+    return r.json();}).then(function(s){
+    if(s&&render(s))setTimeout(poll,1000);
   }).catch(function(){setTimeout(poll,1000);});  // transient /status failure: retry
 }
 
+// Pushed updates while the job runs; polling if the browser or a proxy
+// can't hold the stream open.
+function watch(){
+  if(!window.EventSource){poll();return;}
+  var es=new EventSource(U("/events"));
+  es.onmessage=function(e){if(!render(JSON.parse(e.data)))es.close();};
+  es.onerror=function(){es.close(); poll();};
+}
+
 function renderNaming(speakers){
   var form=el("names"); form.innerHTML="";
   speakers.forEach(function(sp){
     var div=document.createElement("div"); div.className="row";
     // Single-quoted JS strings so the HTML attribute double-quotes need no escaping.
-    div.innerHTML='<b>'+sp.id+'</b> <audio controls src="/clip/'+sp.id+'"></audio>'+
+    div.innerHTML='<b>'+sp.id+'</b> <audio controls src="'+U("/clip/"+sp.id)+'"></audio>'+
       '<div class="txt"></div><label>Name: <input data-id="'+sp.id+'" placeholder="'+sp.id+'"></label>';
     div.querySelector(".txt").textContent='"'+sp.text+'"';
     form.appendChild(div);});
@@ -196,21 +575,25 @@ function renderNaming(speakers){
 el("save").onclick=function(){
   var names={};
   el("names").querySelectorAll("input").forEach(function(i){names[i.dataset.id]=i.value;});
-  fetch("/names",{method:"POST",headers:{"Content-Type":"application/json"},
+  fetch(U("/names"),{method:"POST",headers:{"Content-Type":"application/json"},
     body:JSON.stringify(names)}).then(function(r){
       if(r.ok){poll();} else {r.text().then(function(t){alert(t);});}});
 };
 
 function loadResult(){
-  fetch("/result").then(function(r){return r.json();}).then(function(res){
+  fetch(U("/result")).then(function(r){return r.json();}).then(function(res){
     el("preview").textContent=res.text;
+    el("download").href=U("/download");
     el("download").setAttribute("download",res.filename);
     show("result");}).catch(function(){alert("Could not load the result.");});
 }
 
-function restart(){fetch("/reset",{method:"POST"}).then(function(){
-  el("file").value=""; show("upload");});}
+function forget(){
+  JOB=null; history.replaceState(null,"",location.pathname); el("file").value=""; show("upload");}
+function restart(){fetch(U("/reset"),{method:"POST"}).then(forget);}
 el("restart").onclick=restart; el("working-reset").onclick=restart;
+// Resetting a running job cancels it (and kills its worker process) first.
+el("working-cancel").onclick=restart;
 
 var REVIEW={runs:[],names:[]};
 function tint(){
@@ -235,20 +618,33 @@ function renderReview(runs,names){
     d.appendChild(play); d.appendChild(document.createTextNode(" ")); d.appendChild(txt);
     box.appendChild(d);
   });
+  if(PLAYER)PLAYER.pause();
+  PLAYER=new Audio(U("/audio")); PLAYER.preload="metadata";
+  PLAYER.ontimeupdate=function(){if(PLAYER.currentTime>=STOP_AT)PLAYER.pause();};
   box.querySelectorAll("button[data-span]").forEach(function(b){
-    b.onclick=function(){new Audio("/span/"+b.dataset.span).play().catch(function(){});};});
+    b.onclick=function(){playRun(runs[parseInt(b.dataset.span,10)]);};});
   tint();
 }
+// One seekable stream for the whole review; the per-run clip is only a fallback.
+var PLAYER=null, STOP_AT=0;
+function playSpan(r){new Audio(U("/span/"+r.i)).play().catch(function(){});}
+function playRun(r){
+  if(PLAYER.error){playSpan(r);return;}
+  // Before metadata arrives this sets the start position the media will seek to.
+  STOP_AT=r.end; PLAYER.currentTime=r.start;
+  PLAYER.play().catch(function(){playSpan(r);});
+}
 el("conf-slider").oninput=tint;
 el("review-save").onclick=function(){
   var sel=el("runs").querySelectorAll("select"), speakers=[];
   sel.forEach(function(s){speakers[parseInt(s.dataset.i,10)]=s.value;});
-  fetch("/review",{method:"POST",headers:{"Content-Type":"application/json"},
+  fetch(U("/review"),{method:"POST",headers:{"Content-Type":"application/json"},
     body:JSON.stringify({speakers:speakers})}).then(function(r){
       if(r.ok){loadResult();} else {r.text().then(function(t){alert(t);});}});
 };
 
-show("upload");
+if(location.hash.length>1){JOB=location.hash.slice(1); show("working"); watch();}
+else show("upload");
 </script></body></html>"""
 
 
@@ -258,40 +654,183 @@ def _out_name(audio_name):
     return f"{stem}.transcription.txt"
 
 
-def _run_job(job, transcriber_factory, audio_path):
-    """Background worker: transcribe -> group + sample -> extract clips -> naming.
-    Any exception is captured into the job as an error (never kills the server)."""
+def _run_job(job, pool, audio_path, checkpoint_dir=None, worker=None, run=None):
+    """Background worker: transcribe -> group + pick samples -> naming.
+    The transcriber is leased from the warm pool (built on first use only); the
+    recorded inference time starts after the lease, so it never includes a model
+    load. With `worker` (a tathurell.workers.ProcessWorker) transcription,
+    grouping and sample picking run in that worker's process instead, and only
+    their results come back. The compact review stream (GET /audio) is encoded
+    alongside transcription, from the same decode (tathurell.audio: whichever
+    process gets there first decodes, the other waits for it). With
+    checkpoint_dir, stage outputs are saved as they complete and a re-upload of
+    the same audio resumes a crashed run. Any exception is captured into the
+    job as an error (never kills the server).
+    `run` is the token from job.claim(): every update carries it, so a run
+    that was cancelled or reset meanwhile leaves the job alone."""
+    if not job.current(run):
+        return  # cancelled between claim() and dispatch
+    kwargs = {"checkpoint_dir": checkpoint_dir} if checkpoint_dir else {}
+    set_stage = functools.partial(job.set_stage, run=run)
+    set_progress = functools.partial(job.set_progress, run=run)
     try:
-        words = transcriber_factory().transcribe(audio_path, progress=job.set_stage)
-        groups = group_by_speaker(words)
-        samples = pick_speaker_samples(words)
-        for spk, s in samples.items():
-            extract_clip(audio_path, s["start"], s["end"],
-                         os.path.join(job.tmpdir, f"{spk}.wav"))
-        job.set_naming(groups, samples)
+        with ThreadPoolExecutor(max_workers=1) as side:
+            stream = side.submit(encode_stream, audio_path, job.tmpdir)
+            if worker is not None:
+                groups, samples, infer_sec = worker.run(audio_path, set_stage,
+                                                        events=set_progress, **kwargs)
+                job.set_infer_sec(infer_sec, run=run)
+            else:
+                with pool.lease() as transcriber:
+                    if accepts_kwarg(transcriber.transcribe, "events"):
+                        kwargs["events"] = set_progress
+                    t0 = time.perf_counter()
+                    words = transcriber.transcribe(audio_path, progress=set_stage, **kwargs)
+                    job.set_infer_sec(time.perf_counter() - t0, run=run)
+                groups = group_by_speaker(words)
+                samples = pick_speaker_samples(words)
+            job.set_stream(*stream.result(), run=run)
+        job.set_naming(groups, samples, run=run)
+    except JobCancelled:
+        pass  # already marked cancelled by whoever killed the worker
     except Exception as exc:  # noqa: BLE001 - surface any failure to the UI
-        job.set_error(str(exc))
+        job.set_error(str(exc), run=run)
+
+
+def _clip(clips, audio_path, start, end):
+    """(wav bytes, etag) for a slice of audio_path, through the clip LRU. The
+    key includes the job's upload path, so a later job never hits old clips."""
+    def load():
+        data = clip_wav_bytes(audio_path, start, end)
+        return data, hashlib.sha1(data).hexdigest()[:20]
+    return clips.get_or_load((audio_path, start, end), load)
+
+
+def _clip_response(clips, audio_path, start, end):
+    """Serve a clip with an ETag and byte-range support, so <audio> can seek
+    and replay without downloading it again."""
+    data, etag = _clip(clips, audio_path, start, end)
+    resp = Response(data, mimetype="audio/wav")
+    resp.set_etag(etag)
+    resp.cache_control.no_cache = True  # /span/<i> means another clip after a reset
+    return resp.make_conditional(request, accept_ranges=True, complete_length=len(data))
+
+
+def _prefetch_clips(job, clips, audio_path, runs):
+    """Background: encode the low-confidence runs' clips while the reviewer
+    reads, stopping if the job is reset or replaced."""
+    for r in runs:
+        if job.audio_path != audio_path:
+            return
+        if r["confidence"] < LOW_CONFIDENCE:
+            try:
+                _clip(clips, audio_path, r["start"], r["end"])
+            except Exception:  # noqa: BLE001 - /span/<i> will report it if played
+                return
+
+
+def _cached_transcriber():
+    """Default factory: the real transcriber, backed by the on-disk result cache
+    so re-uploading the same file skips the pipeline, and recording run times
+    for progress ETAs. whisperx_core (whisperx, torch, pandas) is imported
+    here, on first use, so the app starts and serves without waiting for it."""
+    from tathurell.whisperx_core import WhisperXTranscriber
+
+    return WhisperXTranscriber(cache=ResultCache(), history=RtfHistory())
+
+
+def _save_upload(f):
+    """Save an uploaded file into a fresh temp dir: (tmpdir, audio_path)."""
+    tmpdir = tempfile.mkdtemp(prefix="tathurell_web_")
+    try:
+        audio_path = os.path.join(tmpdir, "input" + os.path.splitext(f.filename)[1])
+        f.save(audio_path)
+    except Exception:
+        shutil.rmtree(tmpdir, ignore_errors=True)  # don't orphan the temp dir
+        raise
+    return tmpdir, audio_path
 
 
-def create_app(transcriber_factory=WhisperXTranscriber):
+def create_app(transcriber_factory=_cached_transcriber, pool=None, checkpoint_dir=None,
+               workers=1, job_ttl=JOB_TTL_SEC, processes=False, max_worker_rss_mb=None):
     """Build the front-door app. transcriber_factory is injected so tests can
-    supply a fake (no model / no HF token)."""
+    supply a fake (no model / no HF token). Jobs lease transcribers from `pool`,
+    by default the process-wide pool for transcriber_factory, and up to
+    `workers` run at once (JobManager). With `processes`, each worker instead
+    runs its jobs in a long-lived process holding its own transcriber
+    (tathurell.workers; the factory must then be picklable), which POST
+    /cancel kills, and which is replaced after a job leaves it above
+    max_worker_rss_mb. checkpoint_dir enables stage checkpoints (see
+    _run_job).
+
+    Every job endpoint is served twice: per job under /jobs/<id>/... (POST
+    /jobs creates one), and at the top level for the original single-job API,
+    which refuses a second upload while its job is busy."""
     app = Flask(__name__)
-    job = Job()
+    pool = pool or shared_pool(transcriber_factory, size=workers)
+    clips = LRUCache(CLIP_CACHE_BYTES, weigh=lambda entry: len(entry[0]))
+    procs = None
+    if processes:
+        procs = [ProcessWorker(transcriber_factory, max_rss_mb=max_worker_rss_mb)
+                 for _ in range(workers)]
+    manager = JobManager(
+        pool, workers=workers, checkpoint_dir=checkpoint_dir, ttl=job_ttl,
+        on_remove=lambda _job, audio_path: clips.discard_if(lambda key: key[0] == audio_path),
+        procs=procs,
+    )
+    job = Job()  # the legacy top-level routes' job
     app.config["JOB"] = job  # exposed for tests
+    app.config["JOBS"] = manager
+    app.config["POOL"] = pool
+    app.config["CLIPS"] = clips
+
+    def job_route(rule, **options):
+        """Register handler(job, ...) on `rule` for the legacy job and on
+        /jobs/<job_id>`rule` for a managed one (404 if unknown or expired)."""
+        def register(handler):
+            name = handler.__name__
+            app.add_url_rule(rule, name, lambda **kw: handler(job, **kw), **options)
+
+            def by_id(job_id, **kw):
+                found = manager.get(job_id)
+                if found is None:
+                    return ("unknown job", 404)
+                return handler(found, **kw)
+
+            app.add_url_rule(f"/jobs/<job_id>{rule}", f"job_{name}", by_id, **options)
+            return handler
+        return register
+
+    def start(target, f):
+        tmpdir, audio_path = _save_upload(f)
+        target.start(tmpdir, f.filename, audio_path, stage="queued")
+        manager.submit(target)
 
     @app.route("/")
     def index():
         return _SHELL
 
-    @app.route("/status")
-    def status():
-        return jsonify(job.snapshot())
+    @app.route("/models")
+    def models():
+        return jsonify(manager.stats())
 
-    @app.route("/reset", methods=["POST"])
-    def reset():
-        job.reset()
-        return ("", 200)
+    @app.route("/jobs", methods=["GET"])
+    def list_jobs():
+        return jsonify([{"id": j.id, "stage": j.stage, "audio_name": j.audio_name}
+                        for j in manager.jobs()])
+
+    @app.route("/jobs", methods=["POST"])
+    def create_job():
+        f = request.files.get("audio")
+        if not f or not f.filename:
+            return ("no audio file", 400)
+        new = manager.create()
+        try:
+            start(new, f)
+        except Exception:
+            manager.remove(new.id)
+            raise
+        return jsonify({"id": new.id}), 202
 
     @app.route("/upload", methods=["POST"])
     def upload():
@@ -300,37 +839,77 @@ def create_app(transcriber_factory=WhisperXTranscriber):
         f = request.files.get("audio")
         if not f or not f.filename:
             return ("no audio file", 400)
-        tmpdir = tempfile.mkdtemp(prefix="tathurell_web_")
-        try:
-            audio_path = os.path.join(tmpdir, "input" + os.path.splitext(f.filename)[1])
-            f.save(audio_path)
-        except Exception:
-            shutil.rmtree(tmpdir, ignore_errors=True)  # don't orphan the temp dir
-            raise
-        job.start(tmpdir, f.filename, audio_path)
-        threading.Thread(
-            target=_run_job, args=(job, transcriber_factory, audio_path), daemon=True
-        ).start()
+        start(job, f)
         return ("", 202)
 
-    @app.route("/clip/<speaker>")
-    def clip(speaker):
+    @job_route("/status")
+    def status(job):
+        return jsonify(manager.snapshot(job))
+
+    # Server-sent events: one `data:` snapshot per change (the SSE id is the
+    # job's version), nothing while the job is idle but for keep-alives. The
+    # stream ends once the job is waiting on the user or finished.
+    @job_route("/events")
+    def events(job):
+        def stream():
+            seen = None
+            while True:
+                version = job.wait_changed(seen, timeout=EVENTS_KEEPALIVE_SEC)
+                if version == seen:
+                    yield ": keep-alive\n\n"
+                    continue
+                seen = version
+                snap = manager.snapshot(job)
+                yield f"id: {version}\ndata: {json.dumps(snap)}\n\n"
+                if snap["stage"] not in _ACTIVE:
+                    return
+
+        return Response(stream(), mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+    @job_route("/cancel", methods=["POST"])
+    def cancel(job):
+        if not manager.cancel(job):
+            return ("nothing to cancel", 409)
+        return ("", 200)
+
+    @job_route("/reset", methods=["POST"])
+    def reset(job):
+        if job.id is None:
+            manager.reset(job)
+        else:
+            manager.remove(job.id)
+        return ("", 200)
+
+    # The review page plays every run from this one compact file, seeking to
+    # each run's start/end with Range requests instead of fetching clips.
+    @job_route("/audio")
+    def audio(job):
+        if job.stream is None:
+            return ("no audio yet", 404)
+        path, mimetype = job.stream
+        resp = send_file(path, mimetype=mimetype, conditional=True)
+        resp.cache_control.no_cache = True  # same URL, new file after a reset
+        return resp
+
+    # Per-speaker samples (and the /span fallback) are sliced from the decoded
+    # audio and encoded in memory; no ffmpeg process is started per request.
+    @job_route("/clip/<speaker>")
+    def clip(job, speaker):
         if not job.samples or speaker not in job.samples:
             return ("unknown speaker", 404)
-        return send_file(os.path.join(job.tmpdir, f"{speaker}.wav"),
-                         mimetype="audio/wav")
+        s = job.samples[speaker]
+        return _clip_response(clips, job.audio_path, s["start"], s["end"])
 
-    @app.route("/span/<int:i>")
-    def span(i):
+    @job_route("/span/<int:i>")
+    def span(job, i):
         if not job.runs or i < 0 or i >= len(job.runs):
             return ("unknown run", 404)
         r = job.runs[i]
-        out = os.path.join(job.tmpdir, f"span_{i}.wav")
-        extract_clip(job.audio_path, r["start"], r["end"], out)
-        return send_file(out, mimetype="audio/wav")
+        return _clip_response(clips, job.audio_path, r["start"], r["end"])
 
-    @app.route("/names", methods=["POST"])
-    def names():
+    @job_route("/names", methods=["POST"])
+    def names(job):
         if job.groups is None or not job.samples:
             return ("no transcript to name", 409)
         data = request.get_json(silent=True) or {}
@@ -339,10 +918,12 @@ def create_app(transcriber_factory=WhisperXTranscriber):
             {**g, "speaker": resolved.get(g["speaker"], g["speaker"])} for g in job.groups
         ]
         job.set_review(named_runs)
+        threading.Thread(target=_prefetch_clips,
+                         args=(job, clips, job.audio_path, named_runs), daemon=True).start()
         return ("", 200)
 
-    @app.route("/review", methods=["POST"])
-    def review():
+    @job_route("/review", methods=["POST"])
+    def review(job):
         if job.runs is None:
             return ("not in review", 409)
         speakers = (request.get_json(silent=True) or {}).get("speakers")
@@ -352,14 +933,14 @@ def create_app(transcriber_factory=WhisperXTranscriber):
         job.set_done(render_runs(runs))
         return ("", 200)
 
-    @app.route("/result")
-    def result():
+    @job_route("/result")
+    def result(job):
         if job.text is None:
             return ("no result yet", 409)
         return jsonify({"text": job.text, "filename": _out_name(job.audio_name)})
 
-    @app.route("/download")
-    def download():
+    @job_route("/download")
+    def download(job):
         if job.text is None:
             return ("no result yet", 409)
         return Response(
@@ -372,10 +953,43 @@ def create_app(transcriber_factory=WhisperXTranscriber):
     return app
 
 
-def main():
+def main(argv=None):
     """Launch the front door: bind a free localhost port, open the browser, serve
     until interrupted (NOT block-until-submit like the CLI naming modal)."""
-    app = create_app()
+    ap = argparse.ArgumentParser(description="Tathurell front-door web app.")
+    ap.add_argument("--preload", action="store_true",
+                    help="start loading the models at launch, in the background while "
+                         "the page is served, so the first upload starts warm")
+    ap.add_argument("--checkpoint-dir", default=None,
+                    help="save pipeline stages here so a crashed job resumes on re-upload")
+    ap.add_argument("--workers", type=int, default=1,
+                    help="jobs transcribed at once (each holds its own loaded models); "
+                         "later uploads queue")
+    ap.add_argument("--in-process", action="store_true",
+                    help="run jobs in server threads instead of worker processes "
+                         "(no hard cancel, no memory recycling)")
+    ap.add_argument("--max-worker-rss-mb", type=float, default=None,
+                    help="restart a worker process after a job leaves it above this RSS")
+    args = ap.parse_args(argv)
+
+    app = create_app(checkpoint_dir=args.checkpoint_dir, workers=args.workers,
+                     processes=not args.in_process,
+                     max_worker_rss_mb=args.max_worker_rss_mb)
+    if args.preload:
+        manager = app.config["JOBS"]
+
+        def loaded(error):
+            if error:
+                print(f"[tathurell] model load failed ({error})", file=sys.stderr)
+                return
+            st = manager.stats()
+            rss = (f"+{st['load_rss_mb'][0]:.0f} MB peak RSS" if args.in_process
+                   else f"worker at {st['load_rss_mb'][0]:.0f} MB RSS")
+            print(f"[tathurell] models loaded in {st['load_sec'][0]:.1f}s ({rss})",
+                  file=sys.stderr)
+
+        print("[tathurell] loading models in the background...", file=sys.stderr)
+        manager.warm(on_done=loaded)
     server = make_server("127.0.0.1", 0, app, threaded=True)
     url = f"http://127.0.0.1:{server.server_port}/"
     print(f"[tathurell] front door at {url} (opening browser; Ctrl-C to quit)...",
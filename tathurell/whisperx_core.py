@@ -9,6 +9,7 @@ all verified during the bake-off and required for correctness:
     tokens alignment could not pin -> skip those.
 """
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 # Run fully offline from the local Hugging Face cache. The gated pyannote and
 # whisper models are already downloaded, so no live HF token or network call is
@@ -17,6 +18,7 @@ import os
 os.environ.setdefault("HF_HUB_OFFLINE", "1")
 os.environ.setdefault("TRANSFORMERS_OFFLINE", "1")
 
+import pandas as pd
 import whisperx
 
 try:
@@ -24,64 +26,338 @@ try:
 except ImportError:
     from whisperx.diarize import DiarizationPipeline
 
+from tathurell.audio import load_audio
+from tathurell.checkpoint import STAGES, StageCheckpoint
 from tathurell.confidence import word_confidences
-from tathurell.ffmpeg import ensure_ffmpeg_on_path
+from tathurell.diar_windows import DEFAULT_OVERLAP_SEC, check_window, link_windows, plan_windows
+from tathurell.lru import LRUCache
+from tathurell.progress import ProgressTracker, accepts_kwarg
 from tathurell.realign import realign_speakers
+from tathurell.result_cache import transcription_key
+from tathurell.sharding import SAMPLE_RATE, ShardedASR
+from tathurell.stats import NULL_STATS, TranscriptionStats
+from tathurell.wordtable import WordTable
+
+# wav2vec2 alignment models, keyed by (language, device) and shared by every
+# transcriber in the process, so a batch of same-language files loads the
+# model once. Each is a few hundred MB; TATHURELL_ALIGN_CACHE_SIZE caps how
+# many languages stay resident (least recently used is evicted).
+ALIGN_CACHE_SIZE = int(os.environ.get("TATHURELL_ALIGN_CACHE_SIZE", "2"))
+_align_models = LRUCache(maxsize=ALIGN_CACHE_SIZE)
+# Segments aligned per whisperx.align call. Segments align independently, so
+# batching changes nothing but how often alignment progress is reported.
+ALIGN_BATCH = 32
+
+
+def split_threads(total):
+    """Split `total` CPU threads between ASR (CTranslate2) and diarization
+    (torch) for concurrent mode -> (asr_threads, diar_threads), each >= 1.
+
+    The two stages run side by side, so giving each its own share keeps their
+    thread pools from oversubscribing the cores.
+    """
+    total = max(1, int(total))
+    asr = max(1, total // 2)
+    return asr, max(1, total - asr)
+
+
+def _checkpointed(ckpt, stage, compute):
+    """compute() unless `stage` is already saved in ckpt; save a fresh result."""
+    if ckpt is not None:
+        saved = ckpt.load(stage)
+        if saved is not None:
+            return saved
+    value = compute()
+    if ckpt is not None:
+        ckpt.save(stage, value)
+    return value
 
 
 class WhisperXTranscriber:
     """Load WhisperX (large-v3, CPU) + pyannote diarization once; transcribe to words."""
 
-    def __init__(self, model="large-v3", device="cpu", compute_type="int8"):
+    def __init__(self, model="large-v3", device="cpu", compute_type="int8",
+                 align_cache=None, concurrent=False, threads=None, cache=None,
+                 shards=1, diar_window=None, diar_overlap=DEFAULT_OVERLAP_SEC,
+                 diar_link_threshold=0.5,
+                 history=None, stats_log=None):
+        """concurrent: run diarization in a background thread alongside
+        ASR + alignment (both only need the decoded audio), joining before
+        speaker assignment, so wall time approaches max(asr, diar) rather than
+        their sum. threads: total CPU threads to use (default: all cores in
+        concurrent mode, whisperx's own default otherwise); in concurrent mode
+        they are split between CTranslate2 and torch via split_threads.
+        cache: optional tathurell.result_cache.ResultCache; a repeat of the same
+        audio + settings returns the cached words without running the pipeline.
+        shards: >1 runs ASR + alignment over that many silence-split shards in
+        a warm process pool (tathurell.sharding) instead of in this process;
+        diarization and assignment still run once over the whole file.
+        diar_window: seconds; diarize overlapping windows of this length
+        (overlapping by diar_overlap) and link speakers across them by
+        embedding similarity (tathurell.diar_windows), bounding diarization
+        memory by the window rather than the recording. None (default)
+        diarizes the whole file at once. A window no longer than the overlap
+        raises ValueError here, before any model loads.
+        history: optional tathurell.progress.RtfHistory; each completed run's
+        stage times are recorded there and used for the ETA in progress events.
+        stats_log: optional path; every transcription is then instrumented
+        (tathurell.stats) and appended there as one JSON line, and the latest
+        stats are kept in `last_stats`. Without it, only transcribe_with_stats
+        collects them.
+        """
+        if diar_window is not None:
+            check_window(diar_window, diar_overlap)
         self._device = device
-        self._model = whisperx.load_model(model, device, compute_type=compute_type)
+        self._model_name = model
+        self._compute_type = compute_type
+        self._cache = cache
+        self._history = history
+        self._stats_log = stats_log
+        self.last_stats = None
+        self._history_config = (f"{model}|{device}|{compute_type}|concurrent={concurrent}"
+                                f"|shards={shards}|window={diar_window}"
+                                f"|threads={threads or os.cpu_count()}")
+        # align_cache: an LRUCache for alignment models; default is the
+        # process-wide one above.
+        self._align_cache = align_cache if align_cache is not None else _align_models
+        self._concurrent = concurrent
+        load_kw = {}
+        if concurrent:
+            import torch
+
+            asr_threads, diar_threads = split_threads(threads or os.cpu_count() or 1)
+            load_kw["threads"] = asr_threads
+            # torch's intra-op pool is process-wide: pyannote (and wav2vec2
+            # alignment) share these threads while CTranslate2 uses its own.
+            torch.set_num_threads(diar_threads)
+        elif threads:
+            load_kw["threads"] = threads
+        self._diar_window = diar_window
+        self._diar_overlap = diar_overlap
+        self._diar_link_threshold = diar_link_threshold
+        # Cache / checkpoint keys must differ whenever these change the words.
+        self._settings = {"shards": shards, "diar_window": diar_window,
+                          "diar_overlap": diar_overlap,
+                          "diar_link_threshold": diar_link_threshold}
+        self._sharded = None
+        if shards > 1:
+            # The shard workers hold the whisper models; none is needed here.
+            self._sharded = ShardedASR(model, device, compute_type, shards,
+                                       threads=load_kw.get("threads", threads))
+            self._model = None
+        else:
+            self._model = whisperx.load_model(model, device, compute_type=compute_type,
+                                              **load_kw)
         # token=None: the gated models load from the local cache (offline mode
         # is set at import), so no HF token is required.
         self._diarize = DiarizationPipeline(token=None, device=device)
 
-    def transcribe(self, audio_path: str, progress=None) -> list:
+    def _align_model(self, language):
+        """(model, metadata) for `language`, loaded once per process and device."""
+        return self._align_cache.get_or_load(
+            (language, self._device),
+            lambda: whisperx.load_align_model(language_code=language, device=self._device),
+        )
+
+    def _diarize_audio(self, audio, tracker=None):
+        """Diarization dataframe (start/end/speaker) for the whole buffer.
+        Windowed diarization reports windows done to `tracker`."""
+        if self._diar_window is None:
+            return self._diarize(audio)
+        plan = plan_windows(len(audio), self._diar_window, self._diar_overlap, SAMPLE_RATE)
+        if len(plan) == 1:
+            return self._diarize(audio)
+        windows = []
+        for k, (a, b) in enumerate(plan):
+            if tracker is not None:
+                tracker.advance(k, len(plan), "windows")
+            # Windows run one at a time: peak memory is one window's worth.
+            df, embeddings = self._diarize(audio[a:b], return_embeddings=True)
+            windows.append({
+                "start": a / SAMPLE_RATE,
+                "end": b / SAMPLE_RATE,
+                "segments": list(zip(df["start"], df["end"], df["speaker"])),
+                "embeddings": embeddings,
+            })
+        turns = link_windows(windows, threshold=self._diar_link_threshold)
+        return pd.DataFrame(turns, columns=["start", "end", "speaker"])
+
+    def _asr_and_align(self, audio, _p, ckpt, tracker=None, st=NULL_STATS):
+        def advance(done, total, unit):
+            if tracker is not None:
+                tracker.advance(done, total, unit)
+
+        if self._sharded is not None:
+            # ASR and alignment happen together inside each shard worker.
+            _p("transcribing")
+            with st.stage("asr"):
+                result = _checkpointed(ckpt, "aligned", lambda: self._sharded.transcribe(
+                    audio, progress=lambda done, total: advance(done, total, "audio_sec")))
+            _p("aligning")
+            return result
+        _p("transcribing")
+
+        def asr():
+            kwargs = {}
+            # whisperx reports the percentage of VAD chunks transcribed, when
+            # the installed version supports it; as audio seconds here.
+            if tracker is not None and accepts_kwarg(self._model.transcribe, "progress_callback"):
+                total = len(audio) / SAMPLE_RATE
+                kwargs["progress_callback"] = lambda pct: advance(
+                    min(pct, 100.0) / 100.0 * total, total, "audio_sec")
+            return self._model.transcribe(audio, batch_size=8, **kwargs)
+
+        with st.stage("asr"):
+            result = _checkpointed(ckpt, "asr", asr)
+        _p("aligning")
+
+        def align():
+            with st.stage("align_model_load"):
+                align_model, meta = self._align_model(result["language"])
+            segments = result["segments"]
+            aligned = {"segments": [], "word_segments": []}
+            with st.stage("align"):
+                for i in range(0, len(segments), ALIGN_BATCH):
+                    advance(i, len(segments), "segments")
+                    part = whisperx.align(segments[i:i + ALIGN_BATCH], align_model, meta,
+                                          audio, self._device)
+                    aligned["segments"].extend(part["segments"])
+                    aligned["word_segments"].extend(part.get("word_segments", []))
+            advance(len(segments), len(segments), "segments")
+            return aligned
+
+        return _checkpointed(ckpt, "aligned", align)
+
+    def transcribe(self, audio_path: str, progress=None, checkpoint_dir=None,
+                   events=None) -> list:
         """Return [{"word", "start", "end", "speaker"}] for the audio file.
 
         progress: optional callback(stage_name) invoked at each coarse pipeline
         stage ("transcribing"/"aligning"/"diarizing"/"finishing"). Default None
-        (the CLI passes nothing -> unchanged behavior).
+        (the CLI passes nothing -> unchanged behavior). A result-cache hit
+        returns immediately without firing any stage.
+
+        events: optional callback(dict) receiving fine-grained progress (the
+        fraction of the current stage done and an ETA for the run; see
+        tathurell.progress) at each stage change and as each stage advances.
+
+        checkpoint_dir: optional root for stage checkpoints (tathurell.checkpoint).
+        ASR, aligned and diarization outputs are saved under a per-audio job
+        directory as they complete, so a rerun after a crash resumes from the
+        last completed stage. The job directory is removed once words are built.
         """
+        st = TranscriptionStats() if self._stats_log else NULL_STATS
+        return self._transcribe(audio_path, progress, checkpoint_dir, events, st)
+
+    def transcribe_with_stats(self, audio_path, progress=None, checkpoint_dir=None,
+                              events=None):
+        """transcribe(), also returning a tathurell.stats.TranscriptionStats
+        with each stage's wall time, CPU time and peak RSS: (words, stats)."""
+        st = TranscriptionStats()
+        words = self._transcribe(audio_path, progress, checkpoint_dir, events, st)
+        return words, st
+
+    def _transcribe(self, audio_path, progress, checkpoint_dir, events, st):
+        try:
+            return self._transcribe_stages(audio_path, progress, checkpoint_dir, events, st)
+        except BaseException as exc:
+            st.set(error=repr(exc))
+            raise
+        finally:
+            if st.enabled:
+                st.close()
+                st.set(audio=audio_path, model=self._model_name, device=self._device,
+                       compute_type=self._compute_type, concurrent=self._concurrent,
+                       sharded=self._sharded is not None)
+                self.last_stats = st
+                if self._stats_log:
+                    st.write_jsonl(self._stats_log)
+
+    def _transcribe_stages(self, audio_path, progress, checkpoint_dir, events, st):
+        key = None
+        if self._cache is not None or checkpoint_dir is not None:
+            key = transcription_key(audio_path, self._model_name, self._compute_type,
+                                    self._device, self._settings)
+        if self._cache is not None:
+            words = self._cache.get(key)
+            st.set(cache_hit=words is not None)
+            if words is not None:
+                return words
+        ckpt = StageCheckpoint(checkpoint_dir, key) if checkpoint_dir is not None else None
+        # A resumed run's stage times say nothing about this machine's speed.
+        resumed = ckpt is not None and any(ckpt.has(stage) for stage in STAGES)
+        tracker = ProgressTracker(emit=events, history=self._history,
+                                  config=self._history_config, record=not resumed)
+
         def _p(stage):
+            tracker.stage(stage)
             if progress is not None:
                 progress(stage)
 
-        ensure_ffmpeg_on_path()  # bundled ffmpeg shadows any system one for load_audio
-        audio = whisperx.load_audio(audio_path)
-        _p("transcribing")
-        result = self._model.transcribe(audio, batch_size=8)
-        _p("aligning")
-        align_model, meta = whisperx.load_align_model(
-            language_code=result["language"], device=self._device
-        )
-        result = whisperx.align(result["segments"], align_model, meta, audio, self._device)
-        _p("diarizing")
-        diar = self._diarize(audio)
-        _p("finishing")
-        # fill_nearest=True so words in a diarization gap get the nearest speaker
-        # instead of None (whisperx default leaves them unassigned).
-        result = whisperx.assign_word_speakers(diar, result, fill_nearest=True)
-        words = []
-        for seg in result["segments"]:
-            for w in seg.get("words", []):
-                if "start" not in w:  # alignment dropped timing for this token
-                    continue
-                words.append({
-                    "word": w["word"],
-                    "start": float(w["start"]),
-                    "end": float(w["end"]),
-                    "speaker": w.get("speaker"),
-                })
-        # whisperx assigns each word independently, so a single word at a turn
-        # boundary can flip speaker mid-sentence. Realign per sentence by majority.
-        words = realign_speakers(words)
-        # Attach per-word diarization confidence (overlap dominance of the final
-        # speaker) so the UI can flag uncertain runs.
-        diar_segments = list(zip(diar["start"], diar["end"], diar["speaker"]))
-        for w, c in zip(words, word_confidences(words, diar_segments)):
-            w["confidence"] = c
+        try:
+            words = self._run(audio_path, _p, ckpt, tracker, st)
+        except BaseException:
+            if ckpt is not None:
+                ckpt.release()  # keep the completed stages for the rerun
+            raise
+        tracker.finish()
+        if self._cache is not None:
+            self._cache.put(key, words)
+        if ckpt is not None:
+            ckpt.clear()
         return words
+
+    def _run(self, audio_path, _p, ckpt=None, tracker=None, st=NULL_STATS):
+        """The full pipeline: decode -> ASR -> align -> diarize -> assign -> realign -> confidence."""
+        audio = None
+        if ckpt is None or not all(ckpt.has(stage) for stage in STAGES):
+            # Decoded once into the shared .npy store and memory-mapped; the web
+            # app's sample/span clips slice the same file. Writable (a private
+            # copy-on-write map): the torch stages wrap it with torch.from_numpy.
+            with st.stage("decode"):
+                audio = load_audio(audio_path, writable=True)
+            st.set(audio_sec=len(audio) / SAMPLE_RATE)
+            if tracker is not None:
+                tracker.audio_sec = len(audio) / SAMPLE_RATE
+
+        def diarize(tracker=None):
+            with st.stage("diarize"):
+                return _checkpointed(ckpt, "diarization",
+                                     lambda: self._diarize_audio(audio, tracker))
+
+        if self._concurrent:
+            # Same buffer, read-only in both stages. Stage callbacks still fire
+            # in pipeline order; "diarizing" now means waiting for the join
+            # (so windows are not reported: they'd land in another stage).
+            with ThreadPoolExecutor(max_workers=1) as pool:
+                diar_future = pool.submit(diarize)
+                result = self._asr_and_align(audio, _p, ckpt, tracker, st)
+                _p("diarizing")
+                diar = diar_future.result()
+        else:
+            result = self._asr_and_align(audio, _p, ckpt, tracker, st)
+            _p("diarizing")
+            diar = diarize(tracker)
+        _p("finishing")
+        with st.stage("assign"):
+            # fill_nearest=True so words in a diarization gap get the nearest
+            # speaker instead of None (whisperx default leaves them unassigned).
+            result = whisperx.assign_word_speakers(diar, result, fill_nearest=True)
+            # Post-ASR stages run on a columnar WordTable (no dict per word); the
+            # public result stays the plain word-dict list.
+            timed = [w for seg in result["segments"] for w in seg.get("words", [])
+                     if "start" in w]  # alignment can drop timing for a token
+            words = WordTable([w["word"] for w in timed], [float(w["start"]) for w in timed],
+                              [float(w["end"]) for w in timed],
+                              [w.get("speaker") for w in timed])
+        with st.stage("realign"):
+            # whisperx assigns each word independently, so a single word at a turn
+            # boundary can flip speaker mid-sentence. Realign per sentence by majority.
+            realign_speakers(words, inplace=True)
+        with st.stage("confidence"):
+            # Attach per-word diarization confidence (overlap dominance of the
+            # final speaker) so the UI can flag uncertain runs.
+            diar_segments = list(zip(diar["start"], diar["end"], diar["speaker"]))
+            words.set_confidence(word_confidences(words, diar_segments))
+        st.set(words=len(words))
+        return words.to_dicts()
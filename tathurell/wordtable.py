@@ -0,0 +1,174 @@
+"""Columnar word table: the post-ASR word list without a dict per word.
+
+The pipeline's word list is [{"word", "start", "end", "speaker",
+"confidence"?}]. As dicts that is ~400+ bytes a word, and every stage that
+returns a modified list copies them. WordTable keeps the same data as columns:
+
+  words        list of str
+  start, end   float64 arrays (seconds)
+  codes        int32 array of indices into `speakers` (-1 = no speaker)
+  speakers     list of distinct speaker labels, in order of first appearance
+  confidence   float64 array, or None when no confidence has been attached
+
+The hot stages (realign_speakers, word_confidences, group_by_speaker,
+pick_speaker_samples, eval's words_to_hyp / words_to_rttm) accept a WordTable
+natively. Anything else can index or iterate it: each row is a WordView, a
+read-mostly Mapping over one row that behaves like the word dict (w["word"],
+w.get("confidence", 1.0), dict(w), and w["speaker"] = ... all work).
+to_dicts() gives back the plain list, e.g. for JSON.
+"""
+import sys
+from collections.abc import Mapping
+
+import numpy as np
+
+_KEYS = ("word", "start", "end", "speaker")
+
+
+class WordView(Mapping):
+    """Dict-compatible view of row `i` of a WordTable (no copy)."""
+
+    __slots__ = ("_table", "_i")
+
+    def __init__(self, table, i):
+        self._table = table
+        self._i = i
+
+    def __getitem__(self, key):
+        t, i = self._table, self._i
+        if key == "word":
+            return t.words[i]
+        if key == "start":
+            return float(t.start[i])
+        if key == "end":
+            return float(t.end[i])
+        if key == "speaker":
+            return t.speaker_at(i)
+        if key == "confidence" and t.confidence is not None:
+            return float(t.confidence[i])
+        raise KeyError(key)
+
+    def __setitem__(self, key, value):
+        t, i = self._table, self._i
+        if key == "speaker":
+            t.codes[i] = t.speaker_code(value)
+        elif key == "confidence":
+            if t.confidence is None:
+                t.set_confidence(np.full(len(t), np.nan))
+            t.confidence[i] = value
+        elif key in ("start", "end"):
+            getattr(t, key)[i] = value
+        elif key == "word":
+            t.words[i] = value
+        else:
+            raise KeyError(f"WordTable has no column {key!r}")
+
+    def __iter__(self):
+        yield from _KEYS
+        if self._table.confidence is not None:
+            yield "confidence"
+
+    def __len__(self):
+        return len(_KEYS) + (self._table.confidence is not None)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
+class WordTable:
+    """Columns of a word list; see the module docstring."""
+
+    __slots__ = ("words", "start", "end", "codes", "speakers", "confidence", "_code_of")
+
+    def __init__(self, words, start, end, speakers, confidence=None):
+        """words, start, end: parallel sequences; speakers: per-word labels
+        (None allowed); confidence: per-word floats or None."""
+        self.words = list(words)
+        self.start = np.asarray(start, dtype=np.float64)
+        self.end = np.asarray(end, dtype=np.float64)
+        self.speakers = []
+        self._code_of = {}
+        self.codes = np.fromiter((self.speaker_code(s) for s in speakers),
+                                 dtype=np.int32, count=len(self.words))
+        self.confidence = (None if confidence is None
+                           else np.asarray(confidence, dtype=np.float64))
+
+    @classmethod
+    def from_dicts(cls, words):
+        """Build from [{"word", "start", "end", "speaker", "confidence"?}].
+        The confidence column is kept only if every word has one."""
+        words = list(words)
+        conf = None
+        if words and all("confidence" in w for w in words):
+            conf = [w["confidence"] for w in words]
+        return cls([w["word"] for w in words], [w["start"] for w in words],
+                   [w["end"] for w in words], [w["speaker"] for w in words], conf)
+
+    def to_dicts(self):
+        """The plain word-dict list (Python floats, labels, confidence if set)."""
+        labels = self.speaker_labels()
+        cols = [self.words, self.start.tolist(), self.end.tolist(), labels]
+        if self.confidence is None:
+            return [dict(zip(_KEYS, row)) for row in zip(*cols)]
+        keys = _KEYS + ("confidence",)
+        return [dict(zip(keys, row)) for row in zip(*cols, self.confidence.tolist())]
+
+    def speaker_code(self, label):
+        """Code for label, registering a new label if needed (None -> -1)."""
+        if label is None:
+            return -1
+        code = self._code_of.get(label)
+        if code is None:
+            code = self._code_of[label] = len(self.speakers)
+            self.speakers.append(label)
+        return code
+
+    def speaker_at(self, i):
+        code = int(self.codes[i])
+        return None if code < 0 else self.speakers[code]
+
+    def speaker_labels(self):
+        """Per-word speaker labels (None where unassigned), as a list."""
+        lookup = self.speakers + [None]  # code -1 indexes the trailing None
+        return [lookup[c] for c in self.codes.tolist()]
+
+    def set_speaker_labels(self, labels):
+        """Replace every word's speaker from a per-word label sequence."""
+        self.codes = np.fromiter((self.speaker_code(s) for s in labels),
+                                 dtype=np.int32, count=len(self.words))
+
+    def set_confidence(self, values):
+        """Attach (or replace) the per-word confidence column."""
+        self.confidence = np.asarray(values, dtype=np.float64)
+
+    def copy(self):
+        out = WordTable.__new__(WordTable)
+        out.words = list(self.words)
+        out.start, out.end, out.codes = self.start.copy(), self.end.copy(), self.codes.copy()
+        out.speakers, out._code_of = list(self.speakers), dict(self._code_of)
+        out.confidence = None if self.confidence is None else self.confidence.copy()
+        return out
+
+    def nbytes(self):
+        """Approximate memory held by the table (column buffers + word strings)."""
+        n = self.start.nbytes + self.end.nbytes + self.codes.nbytes
+        if self.confidence is not None:
+            n += self.confidence.nbytes
+        n += sys.getsizeof(self.words) + sum(sys.getsizeof(w) for w in self.words)
+        return n
+
+    def __len__(self):
+        return len(self.words)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            raise TypeError("WordTable does not support slicing; index rows or use to_dicts()")
+        n = len(self.words)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("word index out of range")
+        return WordView(self, i)
+
+    def __iter__(self):
+        return (WordView(self, i) for i in range(len(self.words)))
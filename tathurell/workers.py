@@ -0,0 +1,208 @@
+"""Transcription in long-lived worker processes instead of server threads.
+
+In-thread jobs share the web server's GIL: realign, confidence and grouping
+(pure Python over every word) slow request handling down while they run, and a
+runaway job can be neither stopped nor made to give its memory back.
+
+A ProcessWorker owns one spawned child that builds `factory()` once and then
+serves jobs over a pipe, so the models stay warm across jobs exactly as in a
+ModelPool. For each job the child runs transcribe, group_by_speaker and
+pick_speaker_samples and sends back only the small results; stage changes are
+sent as they happen, and so are progress events if the transcriber takes
+`events=`. cancel() kills the child, which stops compute at once and
+returns all of its memory; the next job starts a fresh one. With max_rss_mb, a
+child whose resident size exceeds the ceiling after a job is retired the same
+way (allocator fragmentation and caches that only grow stay bounded).
+
+`factory` must be picklable (a module-level class or function), as the child
+is started with the spawn method.
+"""
+import multiprocessing
+import threading
+import time
+import weakref
+from multiprocessing import util
+
+from tathurell.model_pool import current_rss_mb
+from tathurell.naming import group_by_speaker
+from tathurell.progress import accepts_kwarg
+from tathurell.sampling import pick_speaker_samples
+
+
+class JobCancelled(Exception):
+    """The job was cancelled (its worker process killed) while running."""
+
+
+def _serve(conn, factory):
+    """Child process: build the transcriber, then run jobs until told to stop."""
+    t0 = time.perf_counter()
+    try:
+        transcriber = factory()
+    except Exception as exc:  # noqa: BLE001 - reported to the parent
+        conn.send(("error", f"model load failed: {exc}", current_rss_mb()))
+        return
+    conn.send(("ready", time.perf_counter() - t0, current_rss_mb()))
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:  # parent went away
+            return
+        if msg is None:
+            return
+        audio_path, kwargs = msg
+        if accepts_kwarg(transcriber.transcribe, "events"):
+            kwargs["events"] = lambda event: conn.send(("event", event))
+        try:
+            t0 = time.perf_counter()
+            words = transcriber.transcribe(
+                audio_path, progress=lambda stage: conn.send(("stage", stage)), **kwargs)
+            infer_sec = time.perf_counter() - t0
+            result = (group_by_speaker(words), pick_speaker_samples(words), infer_sec)
+        except Exception as exc:  # noqa: BLE001 - reported to the parent
+            conn.send(("error", str(exc), current_rss_mb()))
+        else:
+            conn.send(("done", result, current_rss_mb()))
+
+
+_live = weakref.WeakSet()
+
+
+def _close_all():
+    for worker in list(_live):
+        worker.close()
+
+
+# Children are not daemonic (a daemon may not start the sharded ASR pool), so
+# multiprocessing's exit handler joins them; this finalizer runs before that
+# join and tells them to stop.
+util.Finalize(None, _close_all, exitpriority=10)
+
+
+class ProcessWorker:
+    """One warm transcription process, spawned on first use.
+
+    preload() and run() may be called from any thread: they take turns on the
+    one child (a run() during a preload() waits for the models, then uses
+    them). cancel() may be called at any time, and stays in force until
+    clear_cancel(): a run() started after it raises JobCancelled at once, so
+    a cancel that lands just before dispatch can't be lost.
+    Load cost is recorded per child in `load_sec` / `load_rss_mb` (the child's
+    RSS once loaded); `recycled` counts children retired for exceeding
+    max_rss_mb.
+    """
+
+    def __init__(self, factory, max_rss_mb=None):
+        self._factory = factory
+        self.max_rss_mb = max_rss_mb
+        self._proc = None
+        self._conn = None
+        self._lock = threading.Lock()  # held by preload() and run()
+        self._cancelled = False
+        self.load_sec = []
+        self.load_rss_mb = []
+        self.recycled = 0
+        self.rss_mb = None  # child's RSS after its last job
+        _live.add(self)
+
+    @property
+    def pid(self):
+        """The live child's pid, or None."""
+        proc = self._proc
+        return proc.pid if proc is not None and proc.is_alive() else None
+
+    def _start(self):
+        ctx = multiprocessing.get_context("spawn")
+        conn, child = ctx.Pipe()
+        proc = ctx.Process(target=_serve, args=(child, self._factory),
+                           name="tathurell-worker", daemon=False)
+        proc.start()
+        child.close()
+        self._proc, self._conn = proc, conn
+        kind, *rest = conn.recv()  # blocks until the models are loaded
+        if kind == "error":
+            self._stop()
+            raise RuntimeError(rest[0])
+        self.load_sec.append(rest[0])
+        self.load_rss_mb.append(rest[1])
+
+    def _stop(self):
+        proc, conn = self._proc, self._conn
+        self._proc = self._conn = None
+        if conn is not None:
+            try:
+                conn.send(None)
+            except OSError:
+                pass
+            conn.close()
+        if proc is not None:
+            proc.join(5)
+            if proc.is_alive():
+                proc.kill()
+                proc.join()
+
+    def preload(self):
+        """Start the child and load its models now (no-op if running)."""
+        with self._lock:
+            if self.pid is None:
+                self._start()
+
+    def run(self, audio_path, progress=None, events=None, **kwargs):
+        """(groups, samples, infer_sec) for audio_path, computed in the child.
+
+        progress(stage) and events(event) are called here as the child reports
+        each stage and each fine-grained progress event (tathurell.progress).
+        Raises JobCancelled if cancel() was called (and not cleared) before or
+        during the job, RuntimeError if the job failed or the child died.
+        """
+        with self._lock:
+            return self._run(audio_path, progress, events, kwargs)
+
+    def _run(self, audio_path, progress, events, kwargs):
+        if self._cancelled:
+            raise JobCancelled()
+        try:
+            if self.pid is None:
+                self._start()
+            if self._cancelled:  # arrived while no child was there to kill
+                raise JobCancelled()
+            self._conn.send((audio_path, kwargs))
+            while True:
+                kind, *rest = self._conn.recv()
+                if kind == "stage":
+                    if progress is not None:
+                        progress(rest[0])
+                    continue
+                if kind == "event":
+                    if events is not None:
+                        events(rest[0])
+                    continue
+                self.rss_mb = rest[1]
+                if self.max_rss_mb is not None and self.rss_mb > self.max_rss_mb:
+                    self.recycled += 1
+                    self._stop()
+                if kind == "error":
+                    raise RuntimeError(rest[0])
+                return rest[0]
+        except (EOFError, OSError):
+            self._stop()
+            if self._cancelled:
+                raise JobCancelled() from None
+            raise RuntimeError("transcription worker process exited unexpectedly") from None
+
+    def cancel(self):
+        """Kill the child mid-job; the running (or next) run() raises JobCancelled."""
+        self._cancelled = True
+        proc = self._proc
+        if proc is not None and proc.is_alive():
+            proc.kill()
+
+    def clear_cancel(self):
+        """Let run() work again after cancel() (call between jobs). A child the
+        cancel killed is reaped, so the next run() starts a fresh one."""
+        with self._lock:
+            if self._cancelled:
+                self._cancelled = False
+                self._stop()
+
+    def close(self):
+        self._stop()
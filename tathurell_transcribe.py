@@ -3,12 +3,31 @@
 
 Output: "<name>: <text>" lines, one per speaker run, to <audio>.transcription.txt
 (or --output). Runs in the tathurell-eval venv. Needs HF_TOKEN (see whisperx_core).
+For many files with one model load, see tathurell.batch.
 """
 import argparse
+import os
 import sys
+import time
 
+from tathurell import daemon
+from tathurell.diar_windows import check_window
 from tathurell.naming import apply_names, group_by_speaker
-from tathurell.whisperx_core import WhisperXTranscriber
+from tathurell.progress import RtfHistory, format_eta
+from tathurell.result_cache import ResultCache
+from tathurell.stats import TranscriptionStats
+
+# Imported on first use: whisperx/torch take seconds to import, and neither a
+# cache hit nor a run served by the daemon needs them.
+WhisperXTranscriber = None
+
+
+def _transcriber_class():
+    global WhisperXTranscriber
+    if WhisperXTranscriber is None:
+        from tathurell.whisperx_core import WhisperXTranscriber as cls
+        WhisperXTranscriber = cls
+    return WhisperXTranscriber
 
 
 def prompt_names(groups):
@@ -27,6 +46,29 @@ def prompt_names(groups):
     return names
 
 
+class ProgressPrinter:
+    """Progress events -> one stderr line per stage change, and at most one
+    every `interval` seconds within a stage."""
+
+    def __init__(self, interval=10.0, out=sys.stderr):
+        self.interval = interval
+        self.out = out
+        self._stage = None
+        self._last = 0.0
+
+    def __call__(self, event):
+        now = time.monotonic()
+        if event["stage"] == self._stage and now - self._last < self.interval:
+            return
+        self._stage, self._last = event["stage"], now
+        line = f"[tathurell] {event['stage']}"
+        if event["fraction"] is not None:
+            line += f" {event['fraction']:.0%}"
+        if event["eta_sec"] is not None:
+            line += f" (about {format_eta(event['eta_sec'])} left)"
+        print(line, file=self.out)
+
+
 def resolve_names(words, groups, audio_path, no_ui):
     """Get {speaker: name}: browser modal by default; terminal prompts on --no-ui
     or if the modal can't run (headless/no browser)."""
@@ -42,17 +84,93 @@ def resolve_names(words, groups, audio_path, no_ui):
         return prompt_names(groups)
 
 
+def transcribe(args, cache):
+    """Words for args.audio_path: from the daemon if one is running (warm
+    models), else from a transcriber loaded in this process."""
+    events = ProgressPrinter()
+    options = {"model": args.model, "concurrent": args.concurrent, "threads": args.threads,
+               "shards": args.shards, "diar_window": args.diar_window}
+    if not args.no_daemon:
+        try:
+            words, stats = daemon.transcribe(
+                args.audio_path, events=events, checkpoint_dir=args.checkpoint_dir,
+                stats=args.stats, cache=cache is not None,
+                stats_log=args.stats_log and os.path.abspath(args.stats_log), **options)
+        except daemon.DaemonUnavailable:
+            pass
+        else:
+            print("[tathurell] transcribed by the daemon", file=sys.stderr)
+            if args.stats:
+                print(TranscriptionStats.from_dict(stats).table(), file=sys.stderr)
+            return words
+    transcriber = _transcriber_class()(cache=cache, history=RtfHistory(),
+                                       stats_log=args.stats_log, **options)
+    kwargs = {"checkpoint_dir": args.checkpoint_dir, "events": events}
+    if args.stats:
+        words, stats = transcriber.transcribe_with_stats(args.audio_path, **kwargs)
+        print(stats.table(), file=sys.stderr)
+        return words
+    return transcriber.transcribe(args.audio_path, **kwargs)
+
+
 def main(argv=None):
     ap = argparse.ArgumentParser(description="Transcribe + diarize audio with WhisperX.")
-    ap.add_argument("audio_path")
+    ap.add_argument("audio_path", nargs="?")
     ap.add_argument("--output", default=None,
                     help="output path (default: <audio_path>.transcription.txt)")
     ap.add_argument("--model", default="large-v3", help="Whisper model (default: large-v3)")
+    ap.add_argument("--concurrent", action="store_true",
+                    help="run diarization alongside ASR + alignment (faster on many-core machines)")
+    ap.add_argument("--threads", type=int, default=None,
+                    help="total CPU threads for the models (default: all cores with "
+                         "--concurrent, whisperx's default otherwise)")
+    ap.add_argument("--shards", type=int, default=1,
+                    help="split long audio into N shards transcribed in parallel processes")
+    ap.add_argument("--diar-window", type=float, default=None, metavar="SECONDS",
+                    help="diarize in overlapping windows of this length (over the 30s "
+                         "overlap) and link speakers across them (bounds memory on "
+                         "multi-hour recordings)")
+    ap.add_argument("--no-cache", action="store_true",
+                    help="ignore the transcription result cache (always re-run the models)")
+    ap.add_argument("--clear-cache", action="store_true",
+                    help="delete every cached transcription result first")
+    ap.add_argument("--checkpoint-dir", default=None,
+                    help="save each pipeline stage here as it completes; a rerun after a "
+                         "crash resumes from the last completed stage")
+    ap.add_argument("--stats", action="store_true",
+                    help="print a per-stage wall time / CPU time / peak RSS breakdown")
+    ap.add_argument("--stats-log", default=None, metavar="PATH",
+                    help="append each run's per-stage stats to this JSONL file")
+    ap.add_argument("--no-daemon", action="store_true",
+                    help="transcribe in this process even if the daemon (python -m "
+                         "tathurell.daemon) is running")
     ap.add_argument("--no-ui", action="store_true",
                     help="skip the browser naming modal; name speakers via terminal prompts")
     args = ap.parse_args(argv)
+    if args.diar_window is not None:
+        try:
+            check_window(args.diar_window)
+        except ValueError as exc:
+            ap.error(str(exc))
+
+    cache = None if args.no_cache else ResultCache()
+    if args.clear_cache:
+        (cache or ResultCache()).clear()
+        print("[tathurell] cleared the result cache", file=sys.stderr)
+        if args.audio_path is None:
+            return
+    if args.audio_path is None:
+        ap.error("audio_path is required")
 
-    words = WhisperXTranscriber(model=args.model).transcribe(args.audio_path)
+    # Check the cache before building the transcriber: a hit skips the model
+    # load as well as the pipeline.
+    settings = {"shards": args.shards, "diar_window": args.diar_window}
+    words = (cache.get(cache.key(args.audio_path, model=args.model, settings=settings))
+             if cache else None)
+    if words is None:
+        words = transcribe(args, cache)
+    else:
+        print("[tathurell] using cached transcription", file=sys.stderr)
     if not words:
         print("[tathurell] WARNING: no words transcribed.", file=sys.stderr)
 
@@ -19,3 +19,11 @@ def words():
         {"word": "there", "start": 6.0, "end": 6.4},   # inside B
         {"word": "bye", "start": 16.0, "end": 16.5},   # past last turn -> nearest A
     ]
+
+
+@pytest.fixture(autouse=True)
+def _isolated_decoded_audio(tmp_path, monkeypatch):
+    # Keep decode-once .npy files (tathurell.audio) out of the user's cache dir.
+    from tathurell import audio
+
+    monkeypatch.setattr(audio, "_default", audio.DecodedAudio(root=str(tmp_path / "audio")))
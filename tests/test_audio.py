@@ -0,0 +1,169 @@
+import io
+import os
+import shutil
+import threading
+import time
+import wave
+
+import numpy as np
+
+from tathurell import audio
+from tathurell.audio import DecodedAudio, clip, write_wav
+from tathurell.sampling import extract_clip
+
+MP3 = "dollop_test_a.mp3"
+
+
+def _count_decodes(monkeypatch):
+    calls = []
+    real = audio.decode
+
+    def counting(path, sr=audio.SAMPLE_RATE):
+        calls.append(path)
+        return real(path, sr)
+
+    monkeypatch.setattr(audio, "decode", counting)
+    return calls
+
+
+def test_decodes_once_and_memory_maps(tmp_path, monkeypatch):
+    calls = _count_decodes(monkeypatch)
+    store = DecodedAudio(root=str(tmp_path / "dec"))
+    a = store.load(MP3)
+    assert isinstance(a, np.memmap) and a.dtype == np.float32
+    assert len(a) > audio.SAMPLE_RATE
+    assert store.load(MP3) is a
+    # A fresh store on the same directory (another process) maps the file too.
+    b = DecodedAudio(root=str(tmp_path / "dec")).load(MP3)
+    assert np.array_equal(a, b)
+    assert calls == [MP3]
+
+
+def test_shared_map_is_read_only_and_writable_maps_are_private(tmp_path):
+    store = DecodedAudio(root=str(tmp_path / "dec"))
+    shared = store.load(MP3)
+    assert not shared.flags.writeable
+    mine = store.load(MP3, writable=True)
+    assert mine is not shared and mine.flags.writeable
+    before = float(shared[100])
+    mine[100] = before + 1.0
+    assert shared[100] == before
+    assert store.load(MP3, writable=True)[100] == before  # another consumer's map
+
+
+def test_same_bytes_under_another_name_reuse_the_decode(tmp_path, monkeypatch):
+    calls = _count_decodes(monkeypatch)
+    store = DecodedAudio(root=str(tmp_path / "dec"))
+    copy = str(tmp_path / "renamed.mp3")
+    shutil.copy(MP3, copy)
+    store.load(MP3)
+    store.load(copy)
+    assert len(calls) == 1
+
+
+def test_clips_slice_the_shared_decode(tmp_path, monkeypatch):
+    calls = _count_decodes(monkeypatch)
+    for i in range(3):
+        extract_clip(MP3, 1.0 + i, 2.5 + i, str(tmp_path / f"c{i}.wav"))
+    audio.load_audio(MP3)
+    assert len(calls) == 1
+    with wave.open(str(tmp_path / "c0.wav")) as w:
+        assert (w.getframerate(), w.getnchannels()) == (16000, 1)
+        assert w.getnframes() == int(1.5 * 16000)
+
+
+def test_evicts_least_recently_used_files(tmp_path):
+    store = DecodedAudio(root=str(tmp_path / "dec"), max_bytes=1)
+    first = store.path(MP3)
+    store.load(MP3)
+    copy = tmp_path / "other.mp3"
+    copy.write_bytes(open(MP3, "rb").read() + b"\0")  # different digest
+    store.load(str(copy))
+    assert not os.path.exists(first)  # over budget: the older file went
+    assert os.path.exists(store.path(str(copy)))  # the file just written is kept
+
+
+def test_different_files_decode_in_parallel_and_each_once(tmp_path, monkeypatch):
+    started = {name: threading.Event() for name in ("a.wav", "b.wav")}
+    calls = []
+
+    def decode(path, sr=audio.SAMPLE_RATE):
+        name = os.path.basename(path)
+        calls.append(name)
+        started[name].set()
+        other = started["b.wav" if name == "a.wav" else "a.wav"]
+        overlapped = other.wait(timeout=5)  # a store-wide lock would time out here
+        time.sleep(0.05)  # let a second load of the same file queue up
+        return np.full(sr, 1.0 if overlapped else 0.0, dtype=np.float32)
+
+    monkeypatch.setattr(audio, "decode", decode)
+    paths = []
+    for name in ("a.wav", "b.wav"):
+        (tmp_path / name).write_bytes(name.encode())
+        paths.append(str(tmp_path / name))
+    store = DecodedAudio(root=str(tmp_path / "dec"))
+    results = []
+    threads = [threading.Thread(target=lambda p=p: results.append(store.load(p)))
+               for p in paths + paths]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(calls) == ["a.wav", "b.wav"]
+    assert all(r[0] == 1.0 for r in results)
+
+
+def test_clip_and_wav_round_trip():
+    samples = np.linspace(-1.0, 1.0, 16000, dtype=np.float32)
+    assert len(clip(samples, 0.25, 0.5)) == 4000
+    assert len(clip(samples, 0.9, 2.0)) == 1600  # clamped to the buffer
+    assert len(clip(samples, 0.5, 0.25)) == 0
+    buf = io.BytesIO()
+    write_wav(samples, buf)
+    buf.seek(0)
+    with wave.open(buf) as w:
+        pcm = np.frombuffer(w.readframes(w.getnframes()), "<i2")
+    assert pcm[0] == -32768 and pcm[-1] == 32767
+
+
+def test_native_wav_decode_matches_ffmpeg(tmp_path, monkeypatch):
+    ref = audio.decode(MP3)[: 3 * audio.SAMPLE_RATE]
+    wav = str(tmp_path / "native.wav")
+    write_wav(ref, wav)
+    via_ffmpeg = audio.decode(str(tmp_path / "native.wav"))  # native path
+    monkeypatch.setattr(audio, "_decode_wav", lambda path, sr: None)
+    assert np.array_equal(via_ffmpeg, audio.decode(wav))
+    assert np.array_equal(via_ffmpeg, ref)  # ref came from s16 / 32768, so it round-trips
+
+
+def test_encode_stream_is_compact_and_falls_back_to_wav(tmp_path, monkeypatch):
+    path, mimetype = audio.encode_stream(MP3, str(tmp_path))
+    assert mimetype == "audio/mp4" and os.path.getsize(path) < os.path.getsize(MP3)
+    monkeypatch.setattr(audio, "ffmpeg_exe", lambda: "false")  # encoder unavailable
+    path, mimetype = audio.encode_stream(MP3, str(tmp_path))  # decode is already cached
+    assert mimetype == "audio/wav"
+    with wave.open(path) as w:
+        assert w.getnframes() == len(audio.load_audio(MP3))
+
+
+def test_stores_sharing_a_directory_decode_once(tmp_path, monkeypatch):
+    # Two stores stand in for two processes (the web app and its worker child):
+    # only the lock file keeps them from both decoding.
+    calls = []
+
+    def decode(path, sr=audio.SAMPLE_RATE):
+        calls.append(path)
+        time.sleep(0.2)
+        return np.zeros(sr, dtype=np.float32)
+
+    monkeypatch.setattr(audio, "decode", decode)
+    src = tmp_path / "a.wav"
+    src.write_bytes(b"audio")
+    stores = [DecodedAudio(root=str(tmp_path / "dec")) for _ in range(2)]
+    threads = [threading.Thread(target=s.load, args=(str(src),)) for s in stores]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert os.listdir(tmp_path / "dec") == [os.path.basename(stores[0].path(str(src)))]
@@ -0,0 +1,108 @@
+import json
+import threading
+
+import numpy as np
+import pytest
+
+from tathurell import batch
+from tathurell.audio import write_wav
+from tathurell.result_cache import ResultCache
+
+
+class FakeTranscriber:
+    def __init__(self, log):
+        self.log = log
+
+    def transcribe(self, audio_path, checkpoint_dir=None):
+        self.log.append(("transcribe", audio_path))
+        if "bad" in audio_path:
+            raise RuntimeError("corrupt file")
+        return [{"word": "hi", "start": 0.0, "end": 0.5, "speaker": "SPEAKER_00"},
+                {"word": "yo", "start": 0.5, "end": 1.0, "speaker": "SPEAKER_01"}]
+
+
+def _wavs(tmp_path, *names):
+    paths = []
+    for i, name in enumerate(names):
+        path = tmp_path / name
+        write_wav(np.full(16000, i / 100, dtype=np.float32), str(path))  # distinct content
+        paths.append(str(path))
+    return paths
+
+
+def test_expand_inputs_globs_manifest_and_duplicates(tmp_path):
+    a, b, c = _wavs(tmp_path, "a.wav", "b.wav", "c.mp3")
+    (tmp_path / "list.txt").write_text("# nightly\nc.mp3\n\na.wav\n")
+    got = batch.expand_inputs([str(tmp_path / "*.wav"), a], [str(tmp_path / "list.txt")])
+    assert got == [a, b, c]
+
+
+def test_names_for_merges_global_and_per_file():
+    names = {"SPEAKER_00": "Alice", "b.wav": {"SPEAKER_01": "Bob", "SPEAKER_00": "Ann"}}
+    assert batch.names_for(names, "/x/a.wav") == {"SPEAKER_00": "Alice"}
+    assert batch.names_for(names, "/x/b.wav") == {"SPEAKER_00": "Ann", "SPEAKER_01": "Bob"}
+
+
+def test_batch_prefetches_next_and_survives_failures(tmp_path):
+    a, bad, c = _wavs(tmp_path, "a.wav", "bad.wav", "c.wav")
+    decoding = {p: threading.Event() for p in (bad, c)}
+    overlapped = []
+
+    class Overlapping(FakeTranscriber):
+        def transcribe(self, audio_path, checkpoint_dir=None):
+            nxt = {a: bad, bad: c}.get(audio_path)
+            if nxt is not None:  # file N+1 decodes while file N is transcribed
+                overlapped.append(decoding[nxt].wait(5))
+            return super().transcribe(audio_path, checkpoint_dir)
+
+    out_dir = tmp_path / "out"
+    summary = tmp_path / "summary.jsonl"
+    records = batch.run_batch(
+        [a, bad, c], Overlapping([]), names={"SPEAKER_00": "Alice"},
+        output_dir=str(out_dir), summary=str(summary),
+        prefetch=lambda p: decoding[p].set())
+    assert overlapped == [True, True]
+    assert [r["status"] for r in records] == ["ok", "error", "ok"]
+    assert records[1]["error"] == "RuntimeError: corrupt file"
+    assert (out_dir / "c.wav.transcription.txt").read_text() == "Alice: hi\nSPEAKER_01: yo"
+    lines = [json.loads(line) for line in summary.read_text().splitlines()]
+    assert [r["path"] for r in lines] == [a, bad, c]
+    assert lines[0]["audio_sec"] == 1.0 and lines[0]["words"] == 2
+    table = batch.format_summary(records)
+    assert "3 files, 1 failed" in table
+
+
+def test_same_name_from_another_directory_does_not_overwrite(tmp_path):
+    (tmp_path / "x").mkdir()
+    (tmp_path / "y").mkdir()
+    first, second = _wavs(tmp_path, "x/call.wav", "y/call.wav")
+    log = []
+    records = batch.run_batch([first, second], FakeTranscriber(log),
+                              output_dir=str(tmp_path / "out"), prefetch=lambda p: None)
+    assert [r["status"] for r in records] == ["ok", "error"]
+    assert first in records[1]["error"]
+    assert log == [("transcribe", first)]
+    assert records[0]["output"] == str(tmp_path / "out" / "call.wav.transcription.txt")
+    # Next to the audio (no --output-dir) the names don't clash.
+    records = batch.run_batch([first, second], FakeTranscriber(log), prefetch=lambda p: None)
+    assert [r["status"] for r in records] == ["ok", "ok"]
+
+
+def test_cached_files_are_not_decoded_or_transcribed(tmp_path, monkeypatch):
+    monkeypatch.setenv("TATHURELL_CACHE_DIR", str(tmp_path / "cache"))
+    a, b = _wavs(tmp_path, "a.wav", "b.wav")
+    cache = ResultCache()
+    cache.put(cache.key(a), [{"word": "cached", "start": 0.0, "end": 1.0, "speaker": "A"}])
+    log = []
+    records = batch.run_batch([b, a], FakeTranscriber(log), cache=cache,
+                              prefetch=lambda p: log.append(("prefetch", p)))
+    assert [r["status"] for r in records] == ["ok", "cached"]
+    assert log == [("transcribe", b)]
+    assert open(f"{a}.transcription.txt").read() == "A: cached"
+
+
+def test_diar_window_within_the_overlap_is_a_usage_error(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exc:
+        batch.main([str(tmp_path / "a.wav"), "--diar-window", "20"])
+    assert exc.value.code == 2
+    assert "longer than its overlap" in capsys.readouterr().err
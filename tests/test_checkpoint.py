@@ -0,0 +1,67 @@
+import os
+
+import pytest
+
+from tathurell.checkpoint import StageCheckpoint
+
+KEY = "ab" * 32
+
+
+def test_save_then_resume_in_a_new_instance(tmp_path):
+    ck = StageCheckpoint(str(tmp_path), KEY)
+    assert ck.load("asr") is None
+    ck.save("asr", {"language": "en", "segments": [{"text": "hi"}]})
+    ck.release()  # the crashed run's lock is gone
+    again = StageCheckpoint(str(tmp_path), KEY)  # e.g. the rerun after a crash
+    assert again.has("asr") and not again.has("aligned")
+    assert again.load("asr") == {"language": "en", "segments": [{"text": "hi"}]}
+
+
+def test_mismatched_key_discards_stale_stages(tmp_path):
+    ck = StageCheckpoint(str(tmp_path), KEY)
+    ck.save("asr", [1])
+    ck.release()
+    # Same 16-char directory prefix, different full key (new model/library version).
+    other = StageCheckpoint(str(tmp_path), KEY[:16] + "cd" * 24)
+    assert other.dir == ck.dir
+    assert other.load("asr") is None
+
+
+def test_corrupt_stage_is_recomputed(tmp_path):
+    ck = StageCheckpoint(str(tmp_path), KEY)
+    with open(os.path.join(ck.dir, "aligned.pkl"), "wb") as f:
+        f.write(b"\x80\x05truncated")
+    assert ck.load("aligned") is None
+    assert not ck.has("aligned")
+
+
+def test_clear_removes_job_dir(tmp_path):
+    ck = StageCheckpoint(str(tmp_path), KEY)
+    ck.save("diarization", [("A", 0.0, 1.0)])
+    ck.clear()
+    assert not os.path.exists(ck.dir)
+
+
+def test_unknown_stage_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        StageCheckpoint(str(tmp_path), KEY).save("bogus", 1)
+
+
+def test_concurrent_runs_get_separate_dirs(tmp_path):
+    first = StageCheckpoint(str(tmp_path), KEY)
+    first.save("asr", [1])
+    second = StageCheckpoint(str(tmp_path), KEY)  # same audio, still running
+    assert second.dir != first.dir
+    assert second.load("asr") is None
+    second.save("asr", [2])
+    second.clear()  # finishing doesn't touch the other run's stages
+    assert first.load("asr") == [1]
+    first.release()
+    assert StageCheckpoint(str(tmp_path), KEY).load("asr") == [1]
+
+
+def test_cleared_dir_is_free_for_the_next_run(tmp_path):
+    StageCheckpoint(str(tmp_path), KEY).clear()
+    ck = StageCheckpoint(str(tmp_path), KEY)
+    assert ck.dir == os.path.join(str(tmp_path), KEY[:16])
+    assert sorted(os.listdir(tmp_path)) == [KEY[:16], KEY[:16] + ".lock"]
@@ -0,0 +1,56 @@
+import importlib
+
+import pytest
+
+
+def test_cache_hit_skips_model_load(tmp_path, monkeypatch):
+    cli = importlib.import_module("tathurell_transcribe")
+    monkeypatch.setenv("TATHURELL_CACHE_DIR", str(tmp_path / "cache"))
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"fake audio")
+    words = [{"word": "hi", "start": 0.0, "end": 0.5, "speaker": "A", "confidence": 1.0}]
+    cache = cli.ResultCache()
+    cache.put(cache.key(str(audio)), words)
+
+    def boom(*a, **k):
+        raise AssertionError("models must not load on a cache hit")
+
+    monkeypatch.setattr(cli, "WhisperXTranscriber", boom)
+    monkeypatch.setattr(cli, "prompt_names", lambda groups: {"A": "Alice"})
+    out = tmp_path / "out.txt"
+    cli.main([str(audio), "--no-ui", "--output", str(out)])
+    assert out.read_text() == "Alice: hi"
+
+
+def test_clear_cache_without_audio(tmp_path, monkeypatch):
+    cli = importlib.import_module("tathurell_transcribe")
+    monkeypatch.setenv("TATHURELL_CACHE_DIR", str(tmp_path))
+    cache = cli.ResultCache()
+    cache.put("k", [])
+    cli.main(["--clear-cache"])
+    assert cache.get("k") is None
+
+
+def test_cache_entry_for_other_settings_is_a_miss(tmp_path, monkeypatch):
+    cli = importlib.import_module("tathurell_transcribe")
+    monkeypatch.setenv("TATHURELL_CACHE_DIR", str(tmp_path / "cache"))
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"fake audio")
+    cache = cli.ResultCache()
+    cache.put(cache.key(str(audio)), [{"word": "unsharded", "start": 0.0, "end": 0.5,
+                                       "speaker": "A", "confidence": 1.0}])
+    fresh = [{"word": "sharded", "start": 0.0, "end": 0.5, "speaker": "A", "confidence": 1.0}]
+    monkeypatch.setattr(cli, "transcribe", lambda args, cache: fresh)
+    monkeypatch.setattr(cli, "prompt_names", lambda groups: {"A": "Alice"})
+    out = tmp_path / "out.txt"
+    cli.main([str(audio), "--shards", "2", "--no-ui", "--output", str(out)])
+    assert out.read_text() == "Alice: sharded"
+
+
+def test_diar_window_within_the_overlap_is_a_usage_error(tmp_path, monkeypatch, capsys):
+    cli = importlib.import_module("tathurell_transcribe")
+    monkeypatch.setattr(cli, "transcribe", lambda args, cache: pytest.fail("must not run"))
+    with pytest.raises(SystemExit) as exc:
+        cli.main([str(tmp_path / "a.wav"), "--diar-window", "30"])
+    assert exc.value.code == 2
+    assert "longer than its overlap" in capsys.readouterr().err
@@ -1,3 +1,5 @@
+import random
+
 from tathurell.confidence import word_confidences
 
 # diar_segments: list of (start, end, speaker)
@@ -38,3 +40,36 @@ def test_order_preserved_for_multiple_words():
         {"start": 0.5, "end": 1.5, "speaker": "B"},   # overlaps A .5, B .5 -> B -> 0.5
     ]
     assert word_confidences(words, DIAR) == [1.0, 0.5]
+
+
+def _reference(words, diar_segments):
+    # The original O(words x segments) scan; the sweep must match it exactly.
+    out = []
+    for w in words:
+        ws, we, spk = w["start"], w["end"], w["speaker"]
+        assigned = total = 0.0
+        for ss, se, s in diar_segments:
+            overlap = min(we, se) - max(ws, ss)
+            if overlap > 0:
+                total += overlap
+                if s == spk:
+                    assigned += overlap
+        out.append(assigned / total if total > 0 else 0.0)
+    return out
+
+
+def test_matches_full_scan_on_random_meetings():
+    rng = random.Random(1234)
+    for _ in range(100):
+        diar = []
+        for _ in range(rng.randint(0, 30)):
+            s = rng.uniform(0, 120)
+            diar.append((s, s + rng.uniform(0.1, 20), rng.choice("ABC")))
+        words = []
+        t = 0.0
+        for _ in range(rng.randint(0, 80)):
+            t += rng.uniform(0, 2)
+            words.append({"start": t, "end": t + rng.uniform(0, 1),
+                          "speaker": rng.choice("ABC")})
+        rng.shuffle(words)  # order must be preserved, not assumed sorted
+        assert word_confidences(words, diar) == _reference(words, diar)
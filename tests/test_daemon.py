@@ -0,0 +1,123 @@
+import importlib
+import os
+import threading
+import time
+
+import pytest
+
+from tathurell import daemon
+from tathurell.stats import TranscriptionStats
+
+WORDS = [{"word": "hi", "start": 0.0, "end": 0.5, "speaker": "A", "confidence": 1.0}]
+
+
+class FakeTranscriber:
+    built = []
+
+    def __init__(self, **options):
+        self.options = options
+        FakeTranscriber.built.append(options)
+
+    def transcribe(self, audio_path, checkpoint_dir=None, events=None):
+        if audio_path.endswith("bad.wav"):
+            raise ValueError("cannot decode")
+        events({"stage": "transcribing", "fraction": 0.5, "eta_sec": None})
+        return WORDS
+
+    def transcribe_with_stats(self, audio_path, **kwargs):
+        st = TranscriptionStats()
+        with st.stage("asr"):
+            words = self.transcribe(audio_path, **kwargs)
+        st.close()
+        return words, st
+
+
+@pytest.fixture
+def served(tmp_path):
+    FakeTranscriber.built = []
+    path = str(tmp_path / "d.sock")
+    d = daemon.TranscriptionDaemon(path, factory=FakeTranscriber)
+    t = threading.Thread(target=d.serve_forever)
+    t.start()
+    deadline = time.monotonic() + 5
+    while daemon.ping(path) is None:
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    yield path
+    d.shutdown()
+    t.join(5)
+
+
+def test_no_daemon_is_unavailable(tmp_path):
+    path = str(tmp_path / "none.sock")
+    assert daemon.ping(path) is None
+    with pytest.raises(daemon.DaemonUnavailable):
+        daemon.transcribe("a.wav", path=path)
+
+
+def test_transcribe_streams_events_and_reuses_the_transcriber(served):
+    events = []
+    words, stats = daemon.transcribe("a.wav", path=served, events=events.append, model="tiny")
+    assert words == WORDS and stats is None
+    assert events == [{"stage": "transcribing", "fraction": 0.5, "eta_sec": None}]
+    daemon.transcribe("b.wav", path=served, model="tiny")
+    daemon.transcribe("c.wav", path=served, model="small")
+    assert [o["model"] for o in FakeTranscriber.built] == ["tiny", "small"]
+    assert FakeTranscriber.built[0]["shards"] == 1  # defaults filled in
+    assert daemon.ping(served)["models"] == 2
+
+
+def test_stats_and_errors_come_back(served):
+    _, stats = daemon.transcribe("a.wav", path=served, stats=True)
+    assert [s["stage"] for s in TranscriptionStats.from_dict(stats).stages] == ["asr"]
+    with pytest.raises(RuntimeError, match="ValueError: cannot decode"):
+        daemon.transcribe("bad.wav", path=served)
+    with pytest.raises(RuntimeError, match="unknown transcriber options"):
+        daemon.transcribe("a.wav", path=served, colour="blue")
+    assert daemon.ping(served) is not None  # still serving
+
+
+def test_socket_is_owner_only_and_stop_removes_it(tmp_path):
+    path = str(tmp_path / "d.sock")
+    open(path, "w").close()  # stale socket file from a dead daemon
+    d = daemon.TranscriptionDaemon(path, factory=FakeTranscriber)
+    t = threading.Thread(target=d.serve_forever)
+    t.start()
+    deadline = time.monotonic() + 5
+    while daemon.ping(path) is None:
+        assert time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.01)
+    assert os.stat(path).st_mode & 0o777 == 0o600
+    assert daemon.stop(path)
+    t.join(5)
+    assert not t.is_alive() and not os.path.exists(path)
+
+
+def test_cli_uses_running_daemon(served, tmp_path, monkeypatch):
+    cli = importlib.import_module("tathurell_transcribe")
+    monkeypatch.setenv("TATHURELL_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("TATHURELL_DAEMON_SOCKET", served)
+
+    def boom(*a, **k):
+        raise AssertionError("models must not load when the daemon is running")
+
+    monkeypatch.setattr(cli, "WhisperXTranscriber", boom)
+    monkeypatch.setattr(cli, "prompt_names", lambda groups: {"A": "Alice"})
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"fake audio")
+    out = tmp_path / "out.txt"
+    cli.main([str(audio), "--no-ui", "--output", str(out)])
+    assert out.read_text() == "Alice: hi"
+
+
+def test_cli_falls_back_in_process(tmp_path, monkeypatch):
+    cli = importlib.import_module("tathurell_transcribe")
+    monkeypatch.setenv("TATHURELL_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.setenv("TATHURELL_DAEMON_SOCKET", str(tmp_path / "none.sock"))
+    monkeypatch.setattr(cli, "WhisperXTranscriber", FakeTranscriber)
+    monkeypatch.setattr(cli, "prompt_names", lambda groups: {"A": "Alice"})
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"fake audio")
+    out = tmp_path / "out.txt"
+    cli.main([str(audio), "--no-ui", "--output", str(out)])
+    assert out.read_text() == "Alice: hi"
@@ -0,0 +1,63 @@
+import pytest
+
+from tathurell.diar_windows import link_windows, plan_windows
+
+A, B = [1.0, 0.0, 0.0], [0.0, 1.0, 0.0]
+
+
+def test_plan_windows_overlap_and_cover():
+    plan = plan_windows(100 * 16000, window_sec=40, overlap_sec=10)
+    assert plan == [(0, 640000), (480000, 1120000), (960000, 1600000)]
+    assert plan_windows(30 * 16000, 40, 10) == [(0, 480000)]  # fits in one window
+
+
+def test_plan_windows_rejects_overlap_ge_window():
+    with pytest.raises(ValueError):
+        plan_windows(10**6, 10, 10)
+
+
+def test_links_speakers_by_embedding_despite_local_label_swap():
+    # Window 2's pyannote calls A "SPEAKER_01" and B "SPEAKER_00"; embeddings
+    # must map them back to the global speakers from window 1.
+    windows = [
+        {"start": 0.0, "end": 40.0,
+         "segments": [(0.0, 10.0, "SPEAKER_00"), (12.0, 25.0, "SPEAKER_01")],
+         "embeddings": {"SPEAKER_00": A, "SPEAKER_01": B}},
+        {"start": 30.0, "end": 70.0,
+         "segments": [(5.0, 20.0, "SPEAKER_01"), (22.0, 40.0, "SPEAKER_00")],
+         "embeddings": {"SPEAKER_00": [0.1, 0.9, 0.0], "SPEAKER_01": [0.95, 0.05, 0.0]}},
+    ]
+    turns = link_windows(windows)
+    assert turns == [
+        (0.0, 10.0, "SPEAKER_00"),
+        (12.0, 25.0, "SPEAKER_01"),
+        (35.0, 50.0, "SPEAKER_00"),  # window 2 owns [35, 70): overlap split at 35
+        (52.0, 70.0, "SPEAKER_01"),
+    ]
+
+
+def test_unmatched_speaker_becomes_new_global_speaker():
+    windows = [
+        {"start": 0.0, "end": 40.0, "segments": [(0.0, 10.0, "S0")],
+         "embeddings": {"S0": A}},
+        {"start": 30.0, "end": 70.0, "segments": [(10.0, 20.0, "S0"), (20.0, 30.0, "S1")],
+         "embeddings": {"S0": A, "S1": [0.0, 0.0, 1.0]}},
+    ]
+    assert {spk for _, _, spk in link_windows(windows)} == {"SPEAKER_00", "SPEAKER_01"}
+    assert link_windows(windows)[-1] == (50.0, 60.0, "SPEAKER_01")
+
+
+def test_turn_spanning_a_cut_is_rejoined():
+    windows = [
+        {"start": 0.0, "end": 40.0, "segments": [(20.0, 40.0, "X")], "embeddings": {"X": A}},
+        {"start": 30.0, "end": 70.0, "segments": [(0.0, 15.0, "Y")], "embeddings": {"Y": A}},
+    ]
+    assert link_windows(windows) == [(20.0, 45.0, "SPEAKER_00")]
+
+
+def test_missing_embeddings_do_not_crash():
+    windows = [
+        {"start": 0.0, "end": 40.0, "segments": [(0.0, 5.0, "S0")], "embeddings": None},
+        {"start": 30.0, "end": 70.0, "segments": [(10.0, 15.0, "S0")], "embeddings": None},
+    ]
+    assert [spk for *_, spk in link_windows(windows)] == ["SPEAKER_00", "SPEAKER_01"]
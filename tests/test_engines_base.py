@@ -19,3 +19,70 @@ def test_overlap_picks_greater_overlap_not_first():
 def test_empty_turns_assigns_none():
     out = assign_speakers_max_overlap([{"word": "w", "start": 0.0, "end": 1.0}], [])
     assert out[0]["speaker"] is None
+
+
+def _reference(words, turns):
+    # The original linear-scan rule; the indexed version must match it exactly.
+    def ov(w, t):
+        return max(0.0, min(w["end"], t["end"]) - max(w["start"], t["start"]))
+
+    out = []
+    for w in words:
+        if not turns:
+            out.append(None)
+            continue
+        best = max(turns, key=lambda t: ov(w, t))
+        if ov(w, best) > 0.0:
+            out.append(best["speaker"])
+        else:
+            wm = (w["start"] + w["end"]) / 2.0
+            out.append(min(turns, key=lambda t: abs(wm - (t["start"] + t["end"]) / 2.0))["speaker"])
+    return out
+
+
+def _random_case(rng):
+    turns = []
+    for k in range(rng.randint(0, 20)):
+        # Coarse grid times make exact overlap and midpoint ties common.
+        s = rng.randint(0, 40) / 2
+        e = s + rng.randint(0, 8) / 2
+        turns.append({"speaker": f"S{k}", "start": s, "end": e})
+        if rng.random() < 0.1:
+            turns.append(dict(turns[-1], speaker=f"D{k}"))  # exact duplicate span
+    words = []
+    for _ in range(rng.randint(0, 30)):
+        s = rng.randint(-4, 50) / 4
+        words.append({"word": "w", "start": s, "end": s + rng.randint(0, 6) / 4})
+    rng.shuffle(words)
+    return words, turns
+
+
+def test_matches_linear_scan_on_random_cases():
+    import random
+
+    rng = random.Random(2024)
+    for _ in range(500):
+        words, turns = _random_case(rng)
+        want = _reference(words, turns)
+        got = [w["speaker"] for w in assign_speakers_max_overlap(words, turns)]
+        assert got == want, (words, turns)
+
+
+def test_overlap_tie_prefers_earlier_turn_in_list_order():
+    turns = [
+        {"speaker": "late", "start": 4.0, "end": 6.0},
+        {"speaker": "early", "start": 0.0, "end": 5.0},
+    ]
+    # [4.0,5.0] overlaps both by 1.0s -> first in list order, as max() would.
+    out = assign_speakers_max_overlap([{"word": "w", "start": 4.0, "end": 5.0}], turns)
+    assert out[0]["speaker"] == "late"
+
+
+def test_gap_midpoint_tie_prefers_earlier_turn_in_list_order():
+    turns = [
+        {"speaker": "after", "start": 6.0, "end": 8.0},
+        {"speaker": "before", "start": 0.0, "end": 2.0},
+    ]
+    # word midpoint 4.0 is 3.0s from both turn midpoints.
+    out = assign_speakers_max_overlap([{"word": "w", "start": 3.5, "end": 4.5}], turns)
+    assert out[0]["speaker"] == "after"
@@ -0,0 +1,24 @@
+import pytest
+
+from eval.bench.importtime import ENTRY_POINTS, heavy_imports, measure, parse_importtime
+
+SAMPLE = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:      1428 |      72888 |   numpy
+import time:       319 |     140855 | tathurell_transcribe
+"""
+
+
+def test_parse_importtime():
+    rows = parse_importtime(SAMPLE)
+    assert rows[-1] == ("tathurell_transcribe", 319, 140855, 0)
+    assert rows[1] == ("numpy", 1428, 72888, 1)
+    assert heavy_imports(rows + [("torch.nn", 1, 1, 2)]) == ["torch"]
+
+
+@pytest.mark.parametrize("entry", sorted(ENTRY_POINTS))
+def test_entry_points_do_not_import_the_model_stack(entry):
+    module, _budget = ENTRY_POINTS[entry]
+    _ms, rows = measure(module)
+    assert heavy_imports(rows) == []
@@ -0,0 +1,39 @@
+import random
+
+from tathurell.intervals import overlap_candidates
+
+
+def _brute(intervals, queries):
+    return [[i for i, (s, e, *_) in enumerate(intervals) if s < qe and e > qs]
+            for qs, qe, *_ in queries]
+
+
+def test_simple_overlaps():
+    turns = [(0.0, 5.0, "A"), (5.0, 10.0, "B"), (10.0, 15.0, "A")]
+    words = [(0.5, 1.0), (4.5, 5.5), (16.0, 16.5), (5.0, 5.0)]
+    assert overlap_candidates(turns, words) == [[0], [0, 1], [], []]
+
+
+def test_includes_every_positive_overlap_randomized():
+    rng = random.Random(7)
+    for _ in range(200):
+        turns = []
+        for _ in range(rng.randint(0, 25)):
+            s = round(rng.uniform(0, 60), 1)
+            turns.append((s, s + round(rng.uniform(0, 15), 1)))  # overlapping, unsorted
+        words = []
+        for _ in range(rng.randint(0, 40)):
+            s = round(rng.uniform(-5, 80), 1)
+            words.append((s, s + round(rng.uniform(0, 2), 1)))
+        got = overlap_candidates(turns, words)
+        for q, (cands, want) in enumerate(zip(got, _brute(turns, words))):
+            assert cands == sorted(cands)
+            assert set(want) <= set(cands), (turns, words[q])
+            qs, qe = words[q]
+            # Candidates never include a turn entirely before the word.
+            assert all(turns[i][1] > qs for i in cands)
+
+
+def test_empty_inputs():
+    assert overlap_candidates([], [(0.0, 1.0)]) == [[]]
+    assert overlap_candidates([(0.0, 1.0)], []) == []
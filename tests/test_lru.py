@@ -0,0 +1,75 @@
+import pytest
+
+from tathurell.lru import LRUCache
+
+
+def test_get_or_load_loads_once_per_key():
+    cache, loads = LRUCache(maxsize=2), []
+    for _ in range(3):
+        assert cache.get_or_load("en", lambda: loads.append("en") or "EN") == "EN"
+    assert loads == ["en"]
+    assert (cache.hits, cache.misses) == (2, 1)
+
+
+def test_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache.put("en", 1)
+    cache.put("fr", 2)
+    cache.get("en")       # en is now most recent
+    cache.put("de", 3)    # evicts fr
+    assert "fr" not in cache
+    assert "en" in cache and "de" in cache
+    assert len(cache) == 2
+
+
+def test_evicted_key_reloads():
+    cache, loads = LRUCache(maxsize=1), []
+    cache.get_or_load("en", lambda: loads.append("en"))
+    cache.get_or_load("fr", lambda: loads.append("fr"))
+    cache.get_or_load("en", lambda: loads.append("en"))
+    assert loads == ["en", "fr", "en"]
+
+
+def test_failed_load_is_not_cached():
+    cache = LRUCache(maxsize=1)
+
+    def boom():
+        raise RuntimeError("no model")
+
+    with pytest.raises(RuntimeError):
+        cache.get_or_load("en", boom)
+    assert "en" not in cache
+
+
+def test_maxsize_must_be_positive():
+    with pytest.raises(ValueError):
+        LRUCache(maxsize=0)
+
+
+def test_weighted_budget_evicts_by_size():
+    cache = LRUCache(maxsize=10, weigh=len)
+    cache.put("a", b"xxxx")
+    cache.put("b", b"xxxx")
+    cache.put("c", b"xxxx")  # 12 bytes > 10 -> evicts a
+    assert "a" not in cache and cache.weight == 8
+    cache.put("b", b"x")     # replacing re-weighs
+    assert cache.weight == 5
+
+
+def test_value_over_budget_is_returned_but_not_cached():
+    cache = LRUCache(maxsize=4, weigh=len)
+    cache.put("small", b"xx")
+    assert cache.get_or_load("big", lambda: b"xxxxxxxx") == b"xxxxxxxx"
+    assert "big" not in cache and "small" in cache
+    cache.clear()
+    assert cache.weight == 0
+
+
+def test_discard_if_drops_matching_keys_and_their_weight():
+    c = LRUCache(maxsize=100, weigh=len)
+    c.put(("a", 1), "xxx")
+    c.put(("a", 2), "yy")
+    c.put(("b", 1), "z")
+    c.discard_if(lambda key: key[0] == "a")
+    assert ("a", 1) not in c and ("a", 2) not in c
+    assert ("b", 1) in c and c.weight == 1
@@ -0,0 +1,109 @@
+import os
+import threading
+
+import pytest
+
+from tathurell.model_pool import ModelPool, shared_pool
+
+
+class Counting:
+    """Factory stand-in that counts how many instances were built."""
+    built = 0
+
+    def __init__(self):
+        type(self).built += 1
+
+
+def _counting():
+    return type("C", (Counting,), {"built": 0})
+
+
+def test_builds_lazily_and_reuses_one_instance():
+    cls = _counting()
+    pool = ModelPool(cls)
+    assert pool.loaded == 0 and cls.built == 0  # nothing loads until first lease
+    with pool.lease() as a:
+        pass
+    with pool.lease() as b:
+        pass
+    assert a is b
+    assert cls.built == 1
+
+
+def test_stats_record_load_cost_per_instance():
+    pool = ModelPool(_counting())
+    pool.preload()
+    pool.preload()  # already warm -> no second build
+    st = pool.stats()
+    assert st["loaded"] == 1
+    assert len(st["load_sec"]) == 1 and st["load_sec"][0] >= 0.0
+    assert len(st["load_rss_mb"]) == 1
+
+
+class Holding:
+    """An instance that keeps 64 MB resident, like a loaded model."""
+
+    def __init__(self):
+        self.weights = bytearray(64 * 1024 * 1024)
+        self.weights[::4096] = b"\1" * len(self.weights[::4096])  # touch every page
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+def test_load_rss_counts_builds_after_an_earlier_peak():
+    spike = bytearray(256 * 1024 * 1024)  # an earlier job pushed the peak up
+    spike[::4096] = b"\1" * len(spike[::4096])
+    del spike
+    pool = ModelPool(Holding)
+    pool.preload()
+    assert pool.stats()["load_rss_mb"][0] > 32
+
+
+def test_concurrent_leases_share_the_cap():
+    cls = _counting()
+    pool = ModelPool(cls, size=2)
+    gate, seen = threading.Barrier(3), []
+
+    def work():
+        with pool.lease() as t:
+            seen.append(t)
+            gate.wait(timeout=5)
+
+    threads = [threading.Thread(target=work) for _ in range(2)]
+    for t in threads:
+        t.start()
+    gate.wait(timeout=5)  # both leases held at once -> two distinct instances
+    for t in threads:
+        t.join()
+    assert cls.built == 2 and seen[0] is not seen[1]
+    with pool.lease():
+        pass
+    assert cls.built == 2  # cap reached; later leases reuse
+
+
+def test_failed_build_frees_the_slot():
+    calls = []
+
+    def flaky():
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("no model")
+        return object()
+
+    pool = ModelPool(flaky)
+    with pytest.raises(RuntimeError):
+        with pool.lease():
+            pass
+    with pool.lease() as t:
+        assert t is not None
+    assert pool.loaded == 1
+
+
+def test_shared_pool_is_process_wide():
+    cls = _counting()
+    assert shared_pool(cls) is shared_pool(cls)
+    assert shared_pool(cls, size=3).size == 3  # a larger ask grows the cap
+
+
+def test_size_must_be_positive():
+    with pytest.raises(ValueError):
+        ModelPool(object, size=0)
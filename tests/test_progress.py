@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from tathurell.progress import ProgressTracker, RtfHistory, accepts_kwarg, format_eta
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_accepts_kwarg():
+    assert accepts_kwarg(lambda a, events=None: None, "events")
+    assert accepts_kwarg(lambda a, **kw: None, "events")
+    assert not accepts_kwarg(lambda a, progress=None: None, "events")
+
+
+@pytest.mark.parametrize("sec, text", [(12.4, "12s"), (250, "4m10s"), (7500, "2h05m")])
+def test_format_eta(sec, text):
+    assert format_eta(sec) == text
+
+
+def test_history_estimates_median_rtf_per_config(tmp_path):
+    h = RtfHistory(str(tmp_path / "h.json"), max_runs=3)
+    assert h.estimate("cfg", "transcribing", 60) is None
+    for sec in (10, 20, 90, 30):  # 600 s of audio each; the first is trimmed
+        h.record("cfg", 600, {"transcribing": sec})
+    assert h.estimate("cfg", "transcribing", 60) == pytest.approx(3.0)  # median 30/600
+    assert h.estimate("other", "transcribing", 60) is None
+    assert len(json.loads((tmp_path / "h.json").read_text())["cfg"]) == 3
+
+
+def test_eta_extrapolates_the_measured_stage_rate():
+    clock, events = Clock(), []
+    t = ProgressTracker(audio_sec=100, emit=events.append, clock=clock, min_interval=0)
+    t.stage("finishing")
+    assert events[-1]["fraction"] is None and events[-1]["eta_sec"] is None
+    clock.now = 10.0
+    t.advance(25, 100, "segments")
+    ev = events[-1]
+    assert (ev["stage"], ev["done"], ev["total"], ev["unit"]) == ("finishing", 25, 100, "segments")
+    assert ev["fraction"] == 0.25
+    assert ev["eta_sec"] == pytest.approx(30.0)  # 10 s for a quarter
+    assert ev["elapsed_sec"] == 10.0
+
+
+def test_eta_adds_later_stages_from_history_and_records_the_run(tmp_path):
+    h = RtfHistory(str(tmp_path / "h.json"))
+    h.record("cfg", 100, {"transcribing": 50, "aligning": 20, "diarizing": 30, "finishing": 1})
+    clock = Clock()
+    t = ProgressTracker(audio_sec=200, history=h, config="cfg", clock=clock)
+    t.stage("transcribing")
+    clock.now = 40.0
+    # Nothing measured yet: 100 s expected for ASR, then 40 + 60 + 2.
+    assert t.eta() == pytest.approx(60 + 40 + 60 + 2)
+    for stage in ("aligning", "diarizing", "finishing"):
+        clock.now += 10
+        t.stage(stage)
+    clock.now += 1
+    t.finish()
+    assert t.stage_sec == {"transcribing": 50, "aligning": 10, "diarizing": 10, "finishing": 1}
+    assert h.estimate("cfg", "aligning", 100) == pytest.approx((20 + 5) / 2)
+
+
+def test_advance_is_throttled_but_stage_changes_and_completion_are_not():
+    clock, events = Clock(), []
+    t = ProgressTracker(emit=events.append, clock=clock, min_interval=0.5)
+    t.stage("aligning")
+    for i in range(1, 10):
+        clock.now = i * 0.1
+        t.advance(i, 10, "segments")
+    t.advance(10, 10, "segments")
+    assert [e["done"] for e in events] == [None, 5, 10]
+
+
+def test_resumed_runs_are_not_recorded(tmp_path):
+    h = RtfHistory(str(tmp_path / "h.json"))
+    t = ProgressTracker(audio_sec=60, history=h, config="cfg", record=False)
+    t.stage("transcribing")
+    t.finish()
+    assert h.estimate("cfg", "transcribing", 60) is None
@@ -42,3 +42,45 @@ def test_single_speaker_unchanged():
     words = [{"word": "a", "speaker": "A"}, {"word": "b.", "speaker": "A"}]
     out = realign_speakers(words)
     assert [w["speaker"] for w in out] == ["A", "A"]
+
+
+def _random_words(rng, n):
+    vocab = ["so", "we", "out", "of", "it", "yes.", "no?", "right!", "and", "then", "", "ok."]
+    speakers = ["A", "B", "C", None]
+    words = []
+    spk = "A"
+    for _ in range(n):
+        if rng.random() < 0.3:
+            spk = rng.choice(speakers)  # runs with frequent flips
+        words.append({"word": rng.choice(vocab), "start": 0.0, "end": 0.0, "speaker": spk})
+    return words
+
+
+def test_linear_labels_match_vendored_on_random_inputs():
+    import random
+
+    from tathurell.realign import (get_realigned_ws_mapping_with_punctuation,
+                                   realigned_speaker_labels)
+
+    rng = random.Random(99)
+    for _ in range(1000):
+        words = [w for w in _random_words(rng, rng.randint(0, 120)) if w["word"]]
+        max_words = rng.choice([50, 50, 8, 3, 1, 0])
+        want = [w["speaker"] for w in get_realigned_ws_mapping_with_punctuation(words, max_words)]
+        got = realigned_speaker_labels([w["word"] for w in words],
+                                       [w["speaker"] for w in words], max_words)
+        assert got == want, (words, max_words)
+
+
+def test_inplace_updates_the_given_dicts():
+    words = [
+        {"word": "out", "speaker": "A"},
+        {"word": "", "speaker": "C"},
+        {"word": "of", "speaker": "B"},
+        {"word": "minds.", "speaker": "A"},
+    ]
+    copied = realign_speakers(words)
+    assert [w["speaker"] for w in words] == ["A", "C", "B", "A"]  # default: untouched
+    out = realign_speakers(words, inplace=True)
+    assert out is words and out[2] is words[2]
+    assert [w["speaker"] for w in out] == [w["speaker"] for w in copied] == ["A", "C", "A", "A"]
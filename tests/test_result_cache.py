@@ -0,0 +1,89 @@
+import os
+
+from tathurell.result_cache import ResultCache, audio_digest
+
+WORDS = [
+    {"word": "hello", "start": 0.1, "end": 0.4, "speaker": "SPEAKER_00", "confidence": 1.0},
+    {"word": "there.", "start": 0.4, "end": 0.9, "speaker": None, "confidence": 0.0},
+]
+
+
+def _audio(tmp_path, name="a.wav", data=b"RIFF....fake audio"):
+    p = tmp_path / name
+    p.write_bytes(data)
+    return str(p)
+
+
+def test_roundtrip_and_miss(tmp_path):
+    cache = ResultCache(root=str(tmp_path / "c"))
+    key = cache.key(_audio(tmp_path))
+    assert cache.get(key) is None
+    cache.put(key, WORDS)
+    assert cache.get(key) == WORDS
+
+
+def test_key_is_content_addressed(tmp_path):
+    cache = ResultCache(root=str(tmp_path / "c"))
+    a = _audio(tmp_path, "a.wav")
+    same = _audio(tmp_path, "copy.mp3")  # same bytes, different name
+    other = _audio(tmp_path, "b.wav", b"different bytes")
+    assert cache.key(a) == cache.key(same)
+    assert cache.key(a) != cache.key(other)
+
+
+def test_key_depends_on_model_settings(tmp_path):
+    cache = ResultCache(root=str(tmp_path / "c"))
+    a = _audio(tmp_path)
+    base = cache.key(a)
+    assert cache.key(a, model="medium") != base
+    assert cache.key(a, compute_type="float32") != base
+    assert cache.key(a, device="cuda") != base
+
+
+def test_key_depends_on_pipeline_settings(tmp_path):
+    cache = ResultCache(root=str(tmp_path / "c"))
+    a = _audio(tmp_path)
+    base = cache.key(a)
+    assert cache.key(a, settings={"shards": 1}) == base  # the defaults
+    assert cache.key(a, settings={"shards": 4}) != base
+    windowed = cache.key(a, settings={"diar_window": 600})
+    assert windowed != base
+    assert cache.key(a, settings={"diar_window": 600, "diar_overlap": 10}) != windowed
+    assert cache.key(a, settings={"diar_window": 600, "diar_link_threshold": 0.7}) != windowed
+    # Without a window the overlap and link threshold are unused.
+    assert cache.key(a, settings={"diar_overlap": 10}) == base
+
+
+def test_digest_tracks_file_changes(tmp_path):
+    a = _audio(tmp_path)
+    before = audio_digest(a)
+    with open(a, "ab") as f:
+        f.write(b"more")
+    assert audio_digest(a) != before
+
+
+def test_evicts_least_recently_used_over_budget(tmp_path):
+    cache = ResultCache(root=str(tmp_path / "c"), max_bytes=10**9)
+    for i, k in enumerate(("old", "mid", "new")):
+        cache.put(k, WORDS)
+        os.utime(cache._path(k), (1000 + i, 1000 + i))
+    cache.get("old")  # a hit refreshes recency -> "mid" is now the LRU entry
+    one = os.path.getsize(cache._path("old"))
+    cache.max_bytes = 3 * one  # the next put pushes the cache over budget by one entry
+    cache.put("newest", WORDS)
+    assert cache.get("mid") is None
+    assert all(cache.get(k) == WORDS for k in ("old", "new", "newest"))
+    assert cache.size_bytes() <= cache.max_bytes
+
+
+def test_clear(tmp_path):
+    cache = ResultCache(root=str(tmp_path / "c"))
+    cache.put("k", WORDS)
+    cache.clear()
+    assert cache.get("k") is None
+    assert cache.size_bytes() == 0
+
+
+def test_default_root_honours_env(tmp_path, monkeypatch):
+    monkeypatch.setenv("TATHURELL_CACHE_DIR", str(tmp_path))
+    assert ResultCache().root == os.path.join(str(tmp_path), "results")
@@ -20,3 +20,21 @@ def test_extract_clip_works_without_system_ffmpeg(tmp_path, monkeypatch):
     with wave.open(str(out)) as w:
         dur = w.getnframes() / w.getframerate()
     assert 2.7 < dur < 3.3
+
+
+def test_clip_wav_bytes_builds_the_wav_in_memory(monkeypatch):
+    import io
+    import subprocess
+
+    from tathurell.audio import load_audio
+    from tathurell.sampling import clip_wav_bytes
+
+    load_audio("dollop_test_a.mp3")  # decode up front; clips must not spawn ffmpeg
+
+    def no_subprocess(*a, **k):
+        raise AssertionError("clip extraction started a subprocess")
+
+    monkeypatch.setattr(subprocess, "run", no_subprocess)
+    data = clip_wav_bytes("dollop_test_a.mp3", 1.0, 4.0)
+    with wave.open(io.BytesIO(data)) as w:
+        assert abs(w.getnframes() / w.getframerate() - 3.0) < 0.01
@@ -0,0 +1,94 @@
+import json
+import os
+import threading
+import time
+
+from tathurell.spool import Spool, SpoolWorker, run_local_fleet
+
+
+class Slow:
+    """Module-level (picklable) transcriber for the local-fleet test."""
+
+    def transcribe(self, audio_path):
+        time.sleep(0.2)
+        return [{"word": os.path.basename(audio_path), "start": 0.0, "end": 1.0,
+                 "speaker": "SPEAKER_00"}]
+
+
+class Flaky:
+    calls = 0
+
+    def transcribe(self, audio_path):
+        Flaky.calls += 1
+        if "bad" in audio_path:
+            raise RuntimeError("corrupt file")
+        return [{"word": "hi", "start": 0.0, "end": 1.0, "speaker": "SPEAKER_00"}]
+
+
+def test_claim_is_exclusive_and_fifo(tmp_path):
+    spool = Spool(str(tmp_path / "spool"))
+    jobs = [spool.submit(f"/audio/{i}.wav") for i in range(20)]
+    claimed = []
+    lock = threading.Lock()
+
+    def grab(worker):
+        while (lease := spool.claim(worker)) is not None:
+            with lock:
+                claimed.append(lease.job_id)
+
+    threads = [threading.Thread(target=grab, args=(f"w{i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sorted(claimed) == jobs and len(claimed) == 20
+    assert spool.claim("late") is None
+    assert spool.status()["leased"] == 20
+
+
+def test_expired_lease_is_retried_then_failed(tmp_path):
+    spool = Spool(str(tmp_path / "spool"))
+    job = spool.submit("/audio/a.wav")
+    lease = spool.claim("crashed")
+    assert lease.attempt == 1
+    assert spool.reap(lease_sec=60) == []  # heartbeat is fresh
+    assert spool.reap(lease_sec=60, max_attempts=2, now=time.time() + 61) == [(job, "queued")]
+    assert not lease.heartbeat()
+    # The crashed worker turns out to be alive and finishes: its result is dropped.
+    assert not lease.complete({"worker": "crashed"})
+    retry = spool.claim("other")
+    assert retry.attempt == 2
+    assert spool.reap(lease_sec=60, max_attempts=2, now=time.time() + 61) == [(job, "failed")]
+    with open(os.path.join(spool.root, "failed", f"{job}.json")) as f:
+        failed = json.load(f)
+    assert failed["attempts"] == 2 and "stopped heartbeating" in failed["error"]
+
+
+def test_worker_commits_results_and_retries_failures(tmp_path):
+    Flaky.calls = 0
+    spool = Spool(str(tmp_path / "spool"))
+    ok = spool.submit("/audio/a.wav")
+    bad = spool.submit("/audio/bad.wav")
+    worker = SpoolWorker(spool, Flaky, worker="w1", max_attempts=2, poll_sec=0.01)
+    assert worker.run(exit_when_empty=True) == 1
+    assert Flaky.calls == 3  # a.wav once, bad.wav twice
+    with open(os.path.join(spool.root, "done", f"{ok}.json")) as f:
+        done = json.load(f)
+    assert done["worker"] == "w1" and done["words"] == 1
+    with open(done["result"]) as f:
+        assert f.read() == "SPEAKER_00: hi"
+    assert os.path.exists(os.path.join(spool.root, "failed", f"{bad}.json"))
+    st = spool.status()
+    assert (st["queued"], st["leased"], st["done"], st["failed"]) == (0, 0, 1, 1)
+
+
+def test_local_fleet_shares_the_queue(tmp_path):
+    spool = Spool(str(tmp_path / "spool"))
+    jobs = [spool.submit(f"/audio/{i}.wav") for i in range(8)]
+    run_local_fleet(spool.root, Slow, 3, exit_when_empty=True, poll_sec=0.01)
+    workers = set()
+    for job in jobs:
+        with open(os.path.join(spool.root, "done", f"{job}.json")) as f:
+            workers.add(json.load(f)["worker"])
+    assert len(workers) > 1
+    assert spool.status()["done"] == 8
@@ -0,0 +1,57 @@
+import json
+import time
+
+import numpy as np
+import pytest
+
+from tathurell.stats import NULL_STATS, TranscriptionStats
+
+
+def test_null_stats_hooks_do_nothing():
+    with NULL_STATS.stage("asr"):
+        pass
+    NULL_STATS.set(audio_sec=1.0)
+    assert not NULL_STATS.enabled
+
+
+def test_records_wall_cpu_and_memory_per_stage():
+    st = TranscriptionStats(sample_sec=0.005)
+    with st.stage("decode"):
+        time.sleep(0.05)
+    with st.stage("asr"):
+        block = np.ones(64 * 1024 * 1024 // 8)  # ~64 MB, touched
+        time.sleep(0.05)
+        del block
+    st.close()
+    decode, asr = st.stages
+    assert (decode["stage"], asr["stage"]) == ("decode", "asr")
+    assert decode["wall_sec"] >= 0.05 and decode["cpu_sec"] < decode["wall_sec"]
+    assert asr["peak_rss_mb"] >= decode["peak_rss_mb"] + 50
+    assert st.fields["total_wall_sec"] >= 0.1
+
+
+def test_failed_stage_is_still_recorded():
+    st = TranscriptionStats()
+    with pytest.raises(ValueError):
+        with st.stage("align"):
+            raise ValueError("boom")
+    st.close()
+    assert [s["stage"] for s in st.stages] == ["align"]
+
+
+def test_jsonl_log_and_table(tmp_path):
+    st = TranscriptionStats()
+    st.set(audio="a.wav", audio_sec=5.0)
+    with st.stage("realign"):
+        pass
+    st.close()
+    log = tmp_path / "logs" / "stats.jsonl"
+    st.write_jsonl(str(log))
+    st.write_jsonl(str(log))
+    lines = log.read_text().splitlines()
+    assert len(lines) == 2
+    rec = json.loads(lines[0])
+    assert rec["audio"] == "a.wav" and rec["stages"][0]["stage"] == "realign"
+    table = st.table()
+    assert table.splitlines()[0].startswith("| stage | wall s")
+    assert "| realign |" in table
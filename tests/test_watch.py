@@ -0,0 +1,145 @@
+import os
+import subprocess
+import sys
+import threading
+import time
+
+from tathurell.watch import STALE_SEC, WatchService, Watcher, WorkQueue
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeTranscriber:
+    calls = []
+
+    def transcribe(self, audio_path):
+        FakeTranscriber.calls.append(audio_path)
+        if "bad" in audio_path:
+            raise RuntimeError("corrupt file")
+        return [{"word": "hi", "start": 0.0, "end": 0.5, "speaker": "SPEAKER_00"}]
+
+
+def test_queue_is_fifo_dedupes_versions_and_reports_latency(tmp_path):
+    clock = Clock()
+    q = WorkQueue(str(tmp_path / "q.db"), clock=clock)
+    assert q.enqueue("/a.wav", 10, 1)
+    assert not q.enqueue("/a.wav", 10, 1)  # same version: already queued
+    assert q.enqueue("/b.wav", 20, 1)
+    assert q.enqueue("/a.wav", 11, 2)      # overwritten in place: new work
+    assert q.stats()["depth"] == 3
+    clock.now += 4
+    first = q.claim()
+    assert first[1] == "/a.wav"
+    clock.now += 6
+    q.finish(first[0], "/a.wav.transcription.txt")
+    q.fail(q.claim()[0], "RuntimeError: boom")
+    st = q.stats()
+    assert (st["depth"], st["done"], st["error"]) == (1, 1, 1)
+    assert st["wait_sec"]["median"] == 4 and st["latency_sec"]["median"] == 10
+    assert q.item(first[0])["state"] == "done"
+
+
+def _dead_pid():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    return proc.pid
+
+
+def test_restart_requeues_running_items_only(tmp_path):
+    db = str(tmp_path / "q.db")
+    q = WorkQueue(db, owner=str(_dead_pid()))
+    q.enqueue("/done.wav", 1, 1)
+    q.enqueue("/crashed.wav", 1, 1)
+    q.finish(q.claim()[0], "out")
+    q.claim()  # service dies while this one runs
+    q.close()
+    q = WorkQueue(db)
+    assert q.requeue_running() == 1
+    assert q.claim()[1] == "/crashed.wav"
+    assert q.claim() is None
+
+
+def test_requeue_leaves_items_of_live_services_alone(tmp_path):
+    db, clock = str(tmp_path / "q.db"), Clock()
+    live = WorkQueue(db, clock=clock, owner=str(os.getppid()))
+    live.enqueue("/a.wav", 1, 1)
+    live.claim()
+    starting = WorkQueue(db, clock=clock)  # another service starts meanwhile
+    assert starting.requeue_running() == 0
+    clock.now += STALE_SEC / 2
+    live.heartbeat()
+    clock.now += STALE_SEC / 2 + 1
+    assert starting.requeue_running() == 0  # still beating
+    clock.now += STALE_SEC
+    # The pid exists but nothing beats for it: reused after a crash or reboot.
+    assert starting.requeue_running() == 1
+    assert starting.claim()[1] == "/a.wav"
+
+
+def test_watcher_waits_for_files_to_stop_growing(tmp_path):
+    clock = Clock()
+    q = WorkQueue(str(tmp_path / "q.db"))
+    inbox = tmp_path / "inbox"
+    inbox.mkdir()
+    w = Watcher([str(inbox)], q, settle_sec=5, clock=clock)
+    rec = inbox / "call.wav"
+    rec.write_bytes(b"x" * 10)
+    (inbox / "notes.txt").write_text("not audio")
+    assert w.scan() == []           # first sighting
+    clock.now += 3
+    with open(rec, "ab") as f:      # still being written
+        f.write(b"x" * 10)
+    assert w.scan() == []
+    clock.now += 4
+    assert w.scan() == []           # unchanged, but only for 4 s
+    clock.now += 2
+    assert w.scan() == [str(rec)]
+    clock.now += 10
+    assert w.scan() == []           # queued once
+
+
+def _wait(pred, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not pred():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+def test_service_transcribes_new_files_and_survives_restart(tmp_path):
+    FakeTranscriber.calls = []
+    inbox, out = tmp_path / "inbox", tmp_path / "out"
+    inbox.mkdir()
+    for name in ("a.wav", "bad.mp3"):
+        (inbox / name).write_bytes(b"audio")
+    db = str(tmp_path / "q.db")
+
+    def serve():
+        service = WatchService([str(inbox)], FakeTranscriber, WorkQueue(db), workers=2,
+                               output_dir=str(out), names={"SPEAKER_00": "Alice"},
+                               settle_sec=0, interval=0.02)
+        t = threading.Thread(target=service.run)
+        t.start()
+        return service, t
+
+    service, t = serve()
+    _wait(lambda: service.queue.stats()["done"] + service.queue.stats()["error"] == 2)
+    service.stop()
+    t.join(5)
+    assert (out / "a.wav.transcription.txt").read_text() == "Alice: hi"
+    st = service.queue.stats()
+    assert (st["done"], st["error"], st["depth"]) == (1, 1, 0)
+    assert st["latency_sec"]["median"] >= 0
+    assert sorted(os.path.basename(p) for p in FakeTranscriber.calls) == ["a.wav", "bad.mp3"]
+
+    service, t = serve()  # restart: nothing is processed twice
+    (inbox / "c.wav").write_bytes(b"audio")
+    _wait(lambda: service.queue.stats()["done"] == 2)
+    service.stop()
+    t.join(5)
+    assert len(FakeTranscriber.calls) == 3
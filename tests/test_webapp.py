@@ -1,4 +1,6 @@
+import json
 import os
+import threading
 import time
 
 import pytest
@@ -197,7 +199,7 @@ def test_shell_wires_all_views_and_endpoints():
     html = create_app().test_client().get("/").get_data(as_text=True)
     for view in ("view-upload", "view-working", "view-naming", "view-review", "view-result"):
         assert f'id="{view}"' in html
-    for ep in ("/upload", "/status", "/names", "/review", "/span/", "/result", "/download", "/reset", "/clip/"):
+    for ep in ("/jobs", "/status", "/events", "/names", "/review", "/span/", "/result", "/download", "/reset", "/clip/"):
         assert ep in html
     assert 'id="conf-slider"' in html
 
@@ -213,6 +215,69 @@ def test_span_serves_run_audio_and_404():
     assert r.status_code == 200
     assert r.mimetype == "audio/wav"
     assert c.get("/span/99").status_code == 404
+    # Clips are encoded in memory: nothing besides the upload lands in the job dir.
+    tmpdir = app.config["JOB"].tmpdir
+    assert [n for n in os.listdir(tmpdir) if n.endswith(".wav")] == []
+
+
+def test_models_load_once_across_jobs():
+    built = []
+
+    class CountingTranscriber(FakeTranscriber):
+        def __init__(self):
+            built.append(self)
+
+    app = create_app(transcriber_factory=CountingTranscriber)
+    c = app.test_client()
+    for _ in range(2):
+        assert _upload(c).status_code == 202
+        snap = _poll(c, "naming")
+        assert snap["infer_sec"] >= 0.0  # per-job inference time, load excluded
+        c.post("/reset")
+    assert len(built) == 1
+    models = c.get("/models").get_json()
+    assert models["loaded"] == 1 and len(models["load_sec"]) == 1
+
+
+def test_page_serves_while_models_warm_in_background():
+    release = threading.Event()
+
+    class SlowLoading(FakeTranscriber):
+        def __init__(self):
+            release.wait(10)
+
+    app = create_app(transcriber_factory=SlowLoading)
+    manager = app.config["JOBS"]
+    done = []
+    manager.warm(on_done=done.append)
+    c = app.test_client()
+    assert c.get("/").status_code == 200  # not blocked behind the load
+    models = c.get("/models").get_json()
+    assert models["warmup"] == "loading" and models["loaded"] == 0
+    release.set()
+    for _ in range(200):
+        if done:
+            break
+        time.sleep(0.01)
+    assert done == [None]
+    models = c.get("/models").get_json()
+    assert models["warmup"] == "ready" and models["loaded"] == 1
+
+
+def test_checkpoint_dir_is_passed_to_transcriber(tmp_path):
+    seen = []
+
+    class CheckpointingTranscriber(FakeTranscriber):
+        def transcribe(self, audio_path, progress=None, checkpoint_dir=None):
+            seen.append(checkpoint_dir)
+            return super().transcribe(audio_path, progress)
+
+    app = create_app(transcriber_factory=CheckpointingTranscriber,
+                     checkpoint_dir=str(tmp_path))
+    c = app.test_client()
+    _upload(c)
+    _poll(c, "naming")
+    assert seen == [str(tmp_path)]
 
 
 @pytest.mark.skipif(
@@ -249,3 +314,377 @@ def test_real_pipeline_through_webapp():
     assert res["filename"] == "dollop_test_a.transcription.txt"
     assert "Alice:" in res["text"]
     assert len(res["text"]) > 100
+
+
+class ShakyTranscriber(FakeTranscriber):
+    """SPEAKER_01's words come back with low diarization confidence."""
+
+    def transcribe(self, audio_path, progress=None):
+        words = super().transcribe(audio_path, progress)
+        for w in words:
+            w["confidence"] = 0.1 if w["speaker"] == "SPEAKER_01" else 0.95
+        return words
+
+
+def _to_review(c):
+    _upload(c)
+    _poll(c, "naming")
+    c.post("/names", json={"SPEAKER_00": "Alice", "SPEAKER_01": "Bob"})
+    return _poll(c, "review")
+
+
+def test_span_supports_etag_and_range():
+    app = create_app(transcriber_factory=FakeTranscriber)
+    c = app.test_client()
+    _to_review(c)
+    full = c.get("/span/0")
+    etag = full.headers["ETag"]
+    assert full.headers["Accept-Ranges"] == "bytes"
+    assert c.get("/span/0", headers={"If-None-Match": etag}).status_code == 304
+    part = c.get("/span/0", headers={"Range": "bytes=44-143"})
+    assert part.status_code == 206
+    assert part.data == full.data[44:144]
+    assert part.headers["Content-Range"] == f"bytes 44-143/{len(full.data)}"
+
+
+def test_replayed_span_is_served_from_the_clip_cache(monkeypatch):
+    import tathurell.webapp as webapp
+
+    app = create_app(transcriber_factory=FakeTranscriber)
+    c = app.test_client()
+    _to_review(c)
+    encoded = []
+    real = webapp.clip_wav_bytes
+    monkeypatch.setattr(webapp, "clip_wav_bytes",
+                        lambda *a: encoded.append(a) or real(*a))
+    first = c.get("/span/0").data
+    assert c.get("/span/0").data == first
+    assert len(encoded) <= 1  # at most once (zero if the prefetch got there first)
+
+
+def test_low_confidence_runs_prefetched_and_reset_clears_clips():
+    app = create_app(transcriber_factory=ShakyTranscriber)
+    c = app.test_client()
+    snap = _to_review(c)
+    clips = app.config["CLIPS"]
+    low = [r for r in snap["runs"] if r["confidence"] < 0.4]
+    assert low
+    audio_path = app.config["JOB"].audio_path
+    for _ in range(200):
+        if all((audio_path, r["start"], r["end"]) in clips for r in low):
+            break
+        time.sleep(0.02)
+    else:
+        raise AssertionError("low-confidence clips were not prefetched")
+    c.post("/reset")
+    assert len(clips) == 0 and clips.weight == 0
+
+
+def test_review_audio_is_one_compact_seekable_stream():
+    app = create_app(transcriber_factory=FakeTranscriber)
+    c = app.test_client()
+    assert c.get("/audio").status_code == 404  # nothing uploaded yet
+    _to_review(c)
+    full = c.get("/audio")
+    assert full.status_code == 200
+    assert full.mimetype in ("audio/mp4", "audio/wav")
+    assert full.headers["Accept-Ranges"] == "bytes"
+    part = c.get("/audio", headers={"Range": "bytes=0-1023"})
+    assert part.status_code == 206 and part.data == full.data[:1024]
+    # 5 s of speech: far below the old 44.1 kHz stereo PCM (~176 KB/s).
+    if full.mimetype == "audio/mp4":
+        assert len(full.data) < 5 * 8 * 1024
+    c.post("/reset")
+    assert c.get("/audio").status_code == 404
+
+
+def _submit(client, path="dollop_test_a.mp3"):
+    """POST /jobs; return the new job's id."""
+    with open(path, "rb") as f:
+        r = client.post("/jobs", data={"audio": (f, path)}, content_type="multipart/form-data")
+    assert r.status_code == 202
+    return r.get_json()["id"]
+
+
+def _poll_job(client, job_id, target, tries=200, delay=0.05):
+    snap = None
+    for _ in range(tries):
+        snap = client.get(f"/jobs/{job_id}/status").get_json()
+        if snap["stage"] in (target, "error"):
+            return snap
+        time.sleep(delay)
+    raise AssertionError(f"job {job_id} never reached {target!r}; last={snap}")
+
+
+def test_jobs_run_concurrently_up_to_workers():
+    both_running = threading.Barrier(2, timeout=5)
+
+    class MeetingTranscriber(FakeTranscriber):
+        def transcribe(self, audio_path, progress=None):
+            both_running.wait()  # breaks (-> job error) unless two run at once
+            return super().transcribe(audio_path, progress)
+
+    app = create_app(transcriber_factory=MeetingTranscriber, workers=2)
+    c = app.test_client()
+    ids = [_submit(c), _submit(c)]
+    assert ids[0] != ids[1]
+    for job_id in ids:
+        assert _poll_job(c, job_id, "naming")["stage"] == "naming"
+    assert app.config["POOL"].stats()["loaded"] == 2
+
+
+def test_jobs_queue_fifo_behind_busy_worker():
+    gate = threading.Event()
+    order = []
+
+    class GatedTranscriber(FakeTranscriber):
+        def transcribe(self, audio_path, progress=None):
+            order.append(audio_path)
+            gate.wait(5)
+            return super().transcribe(audio_path, progress)
+
+    app = create_app(transcriber_factory=GatedTranscriber, workers=1)
+    c = app.test_client()
+    first, second, third = _submit(c), _submit(c), _submit(c)
+    _poll_job(c, first, "transcribing")
+    snap = c.get(f"/jobs/{third}/status").get_json()
+    assert snap == {"stage": "queued", "id": third, "position": 1}
+    gate.set()
+    for job_id in (first, second, third):
+        _poll_job(c, job_id, "naming")
+    manager = app.config["JOBS"]
+    assert order == [manager.get(j).audio_path for j in (first, second, third)]
+
+
+def test_per_job_endpoints_are_independent():
+    app = create_app(transcriber_factory=FakeTranscriber)
+    c = app.test_client()
+    a, b = _submit(c), _submit(c)
+    _poll_job(c, a, "naming")
+    _poll_job(c, b, "naming")
+    assert c.get(f"/jobs/{a}/clip/SPEAKER_00").mimetype == "audio/wav"
+    c.post(f"/jobs/{a}/names", json={"SPEAKER_00": "Alice", "SPEAKER_01": "Bob"})
+    runs = _poll_job(c, a, "review")["runs"]
+    c.post(f"/jobs/{a}/review", json={"speakers": [r["speaker"] for r in runs]})
+    assert "Alice:" in c.get(f"/jobs/{a}/result").get_json()["text"]
+    assert c.get(f"/jobs/{b}/status").get_json()["stage"] == "naming"
+    assert c.get(f"/jobs/{b}/result").status_code == 409
+    assert c.get("/status").get_json() == {"stage": "idle"}  # legacy job untouched
+    listed = {j["id"]: j["stage"] for j in c.get("/jobs").get_json()}
+    assert listed == {a: "done", b: "naming"}
+    assert c.get("/jobs/nope/status").status_code == 404
+
+
+def test_reset_removes_only_that_jobs_clips():
+    app = create_app(transcriber_factory=FakeTranscriber)
+    c = app.test_client()
+    a, b = _submit(c), _submit(c)
+    for job_id in (a, b):
+        _poll_job(c, job_id, "naming")
+        c.get(f"/jobs/{job_id}/clip/SPEAKER_00")
+    clips = app.config["CLIPS"]
+    assert len(clips) == 2
+    assert c.post(f"/jobs/{a}/reset").status_code == 200
+    assert c.get(f"/jobs/{a}/status").status_code == 404
+    assert len(clips) == 1
+    assert c.get(f"/jobs/{b}/clip/SPEAKER_00").status_code == 200
+
+
+def test_idle_jobs_expire_and_temp_dirs_are_removed():
+    app = create_app(transcriber_factory=FakeTranscriber)
+    c = app.test_client()
+    job_id = _submit(c)
+    _poll_job(c, job_id, "naming")
+    manager = app.config["JOBS"]
+    tmpdir = manager.get(job_id).tmpdir
+    assert os.path.isdir(tmpdir)
+    manager.ttl = 0.0
+    time.sleep(0.01)
+    assert c.get(f"/jobs/{job_id}/status").status_code == 404
+    assert not os.path.exists(tmpdir)
+    assert c.get("/jobs").get_json() == []
+
+
+class StuckTranscriber(FakeTranscriber):
+    def transcribe(self, audio_path, progress=None):
+        progress("transcribing")
+        time.sleep(60)
+
+
+def test_process_workers_run_jobs_and_cancel_kills_compute():
+    app = create_app(transcriber_factory=FakeTranscriber, processes=True)
+    c = app.test_client()
+    job_id = _submit(c)
+    assert _poll_job(c, job_id, "naming")["speakers"]
+    assert c.get("/models").get_json()["loaded"] == 1
+
+    app = create_app(transcriber_factory=StuckTranscriber, processes=True)
+    c = app.test_client()
+    job_id = _submit(c)
+    _poll_job(c, job_id, "transcribing", tries=600)
+    worker = app.config["JOBS"].procs[0]
+    for _ in range(200):  # wait for the worker process to come up
+        if worker.pid is not None:
+            break
+        time.sleep(0.05)
+    pid = worker.pid
+    assert c.post(f"/jobs/{job_id}/cancel").status_code == 200
+    assert c.get(f"/jobs/{job_id}/status").get_json()["stage"] == "cancelled"
+    assert c.post(f"/jobs/{job_id}/cancel").status_code == 409
+    for _ in range(100):
+        if worker.pid is None:
+            break
+        time.sleep(0.05)
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_cancel_drops_a_queued_job():
+    gate = threading.Event()
+
+    class GatedTranscriber(FakeTranscriber):
+        def transcribe(self, audio_path, progress=None):
+            gate.wait(5)
+            return super().transcribe(audio_path, progress)
+
+    app = create_app(transcriber_factory=GatedTranscriber)
+    c = app.test_client()
+    first, second = _submit(c), _submit(c)
+    assert c.post(f"/jobs/{second}/cancel").status_code == 200
+    gate.set()
+    _poll_job(c, first, "naming")
+    time.sleep(0.1)
+    assert c.get(f"/jobs/{second}/status").get_json()["stage"] == "cancelled"
+
+
+def _events(resp):
+    """Parse an SSE body chunk by chunk: yields ("data", id, snapshot) or
+    ("comment", text, None)."""
+    for chunk in resp.response:
+        text = chunk.decode() if isinstance(chunk, bytes) else chunk
+        for block in filter(None, text.split("\n\n")):
+            if block.startswith(":"):
+                yield "comment", block[1:].strip(), None
+                continue
+            fields = dict(line.split(": ", 1) for line in block.splitlines())
+            yield "data", int(fields["id"]), json.loads(fields["data"])
+
+
+def test_events_push_each_change_and_end_when_user_input_is_needed():
+    app = create_app(transcriber_factory=FakeTranscriber)
+    c = app.test_client()
+    job_id = _submit(c)
+    resp = c.get(f"/jobs/{job_id}/events", buffered=False)
+    assert resp.mimetype == "text/event-stream"
+    got = list(_events(resp))
+    assert all(kind == "data" for kind, _, _ in got)
+    ids = [i for _, i, _ in got]
+    assert ids == sorted(set(ids))
+    assert got[-1][2]["stage"] == "naming" and got[-1][2]["speakers"]
+
+
+def test_events_stream_is_quiet_but_kept_alive_while_nothing_changes(monkeypatch):
+    import tathurell.webapp as webapp
+
+    monkeypatch.setattr(webapp, "EVENTS_KEEPALIVE_SEC", 0.05)
+    gate = threading.Event()
+
+    class GatedTranscriber(FakeTranscriber):
+        def transcribe(self, audio_path, progress=None):
+            progress("transcribing")
+            gate.wait(5)
+            return super().transcribe(audio_path, progress)
+
+    app = create_app(transcriber_factory=GatedTranscriber)
+    c = app.test_client()
+    job_id = _submit(c)
+    _poll_job(c, job_id, "transcribing")
+    job = app.config["JOBS"].get(job_id)
+    version = job.version
+    stream = _events(c.get(f"/jobs/{job_id}/events", buffered=False))
+    assert next(stream)[2]["stage"] == "transcribing"
+    assert next(stream) == ("comment", "keep-alive", None)
+    assert job.version == version  # nothing changed, nothing was sent
+    gate.set()
+    assert [s["stage"] for kind, _, s in stream if kind == "data"][-1] == "naming"
+
+
+def test_reset_mid_run_keeps_the_job_idle():
+    # The in-thread run can't be interrupted: it must finish without reviving
+    # the reset job or blocking the next upload.
+    started, gate, finished = threading.Event(), threading.Event(), threading.Event()
+
+    class SlowTranscriber(FakeTranscriber):
+        def transcribe(self, audio_path, progress=None):
+            progress("transcribing")
+            started.set()
+            gate.wait(5)
+            try:
+                return super().transcribe(audio_path, progress)
+            finally:
+                finished.set()
+
+    app = create_app(transcriber_factory=SlowTranscriber)
+    c = app.test_client()
+    assert _upload(c).status_code == 202
+    assert started.wait(5)
+    assert c.post("/reset").status_code == 200
+    assert c.get("/status").get_json()["stage"] == "idle"
+    gate.set()
+    assert finished.wait(5)
+    time.sleep(0.2)  # let the old run reach its final set_naming
+    assert c.get("/status").get_json() == {"stage": "idle"}
+    started.clear()
+    assert _upload(c).status_code == 202
+    assert _poll(c, "naming")["stage"] == "naming"
+
+
+def test_job_cancelled_after_claim_is_never_dispatched(tmp_path):
+    from tathurell.webapp import _run_job
+
+    class Worker:
+        def run(self, *a, **kw):
+            raise AssertionError("a cancelled job must not reach the worker")
+
+    job = Job()
+    job.start(str(tmp_path), "a.wav", str(tmp_path / "a.wav"), stage="queued")
+    run = job.claim()
+    assert job.cancel()  # lands between claim() and dispatch
+    _run_job(job, None, job.audio_path, worker=Worker(), run=run)
+    assert job.snapshot()["stage"] == "cancelled"
+
+
+def test_wait_changed_wakes_on_update_and_times_out():
+    job = Job()
+    v = job.version
+    assert job.wait_changed(v, timeout=0.01) == v
+    threading.Timer(0.05, job.set_stage, args=("aligning",)).start()
+    t0 = time.monotonic()
+    assert job.wait_changed(v, timeout=5) == v + 1
+    assert time.monotonic() - t0 < 1
+
+
+def test_progress_events_reach_the_job_snapshot():
+    gate = threading.Event()
+
+    class ReportingTranscriber(FakeTranscriber):
+        def transcribe(self, audio_path, progress=None, events=None):
+            progress("aligning")
+            events({"stage": "aligning", "done": 3, "total": 12, "unit": "segments",
+                    "fraction": 0.25, "elapsed_sec": 4.0, "eta_sec": 30.0})
+            gate.wait(5)
+            return super().transcribe(audio_path)
+
+    app = create_app(transcriber_factory=ReportingTranscriber)
+    c = app.test_client()
+    job_id = _submit(c)
+    snap = _poll_job(c, job_id, "aligning")
+    for _ in range(100):
+        if "progress" in snap:
+            break
+        time.sleep(0.02)
+        snap = c.get(f"/jobs/{job_id}/status").get_json()
+    assert snap["progress"] == {"fraction": 0.25, "done": 3, "total": 12,
+                                "unit": "segments", "eta_sec": 30.0}
+    gate.set()
+    assert "progress" not in _poll_job(c, job_id, "naming")
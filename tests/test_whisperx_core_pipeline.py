@@ -0,0 +1,139 @@
+"""WhisperXTranscriber's own pipeline logic, with whisperx replaced by fakes."""
+import importlib.machinery
+import importlib.util
+import sys
+import types
+
+import numpy as np
+import pytest
+
+import tathurell
+from tathurell.sharding import SAMPLE_RATE
+
+pd = pytest.importorskip("pandas")
+
+
+@pytest.fixture
+def core(monkeypatch):
+    """tathurell.whisperx_core loaded against a fake `whisperx` module."""
+    fake = types.ModuleType("whisperx")
+    fake.load_model = lambda *a, **k: None
+    fake.DiarizationPipeline = lambda **k: None
+    monkeypatch.setitem(sys.modules, "whisperx", fake)
+    monkeypatch.setenv("HF_HUB_OFFLINE", "1")
+    monkeypatch.setenv("TRANSFORMERS_OFFLINE", "1")
+    # A private copy: sys.modules keeps whatever whisperx_core it had.
+    spec = importlib.machinery.PathFinder.find_spec("tathurell.whisperx_core",
+                                                    tathurell.__path__)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+class _Tracker:
+    def __init__(self):
+        self.advances = []
+
+    def advance(self, done, total, unit):
+        self.advances.append((done, total, unit))
+
+
+def test_windowed_diarization_links_speakers_across_windows(core):
+    # Speaker X (audio 0.0) talks for the first 12.5 s, then Y (audio 1.0).
+    # Every window labels its speakers in order of appearance, with the labels
+    # swapped in odd windows; only the embeddings say who is who.
+    audio = np.zeros(25 * SAMPLE_RATE, dtype=np.float32)
+    audio[int(12.5 * SAMPLE_RATE):] = 1.0
+    true_embedding = {0.0: [1.0, 0.0], 1.0: [0.0, 1.0]}
+    calls = []
+
+    def diarize(chunk, return_embeddings=False):
+        k = len(calls)
+        calls.append((len(chunk), return_embeddings))
+        cuts = [0, *np.flatnonzero(np.diff(chunk)) + 1, len(chunk)]
+        rows, embeddings = [], {}
+        for rank, (a, b) in enumerate(zip(cuts, cuts[1:])):
+            label = f"SPEAKER_{(rank + k) % 2:02d}"
+            rows.append((a / SAMPLE_RATE, b / SAMPLE_RATE, label))
+            embeddings[label] = true_embedding[float(chunk[a])]
+        return pd.DataFrame(rows, columns=["start", "end", "speaker"]), embeddings
+
+    tr = core.WhisperXTranscriber(diar_window=10.0, diar_overlap=2.0)
+    tr._diarize = diarize
+    tracker = _Tracker()
+    df = tr._diarize_audio(audio, tracker)
+
+    assert calls == [(10 * SAMPLE_RATE, True), (10 * SAMPLE_RATE, True),
+                     (9 * SAMPLE_RATE, True)]
+    assert tracker.advances == [(0, 3, "windows"), (1, 3, "windows"), (2, 3, "windows")]
+    assert list(df.columns) == ["start", "end", "speaker"]
+    turns = list(df.itertuples(index=False, name=None))
+    assert [spk for _, _, spk in turns] == ["SPEAKER_00", "SPEAKER_01"]
+    assert turns[0][:2] == pytest.approx((0.0, 12.5))
+    assert turns[1][:2] == pytest.approx((12.5, 25.0))
+
+
+def test_window_not_longer_than_its_overlap_is_rejected_before_loading(core):
+    def load_model(*a, **k):
+        raise AssertionError("validated after the model load")
+
+    core.whisperx.load_model = load_model
+    with pytest.raises(ValueError, match="longer than its overlap"):
+        core.WhisperXTranscriber(diar_window=30.0)
+
+
+def test_short_audio_is_diarized_in_one_pass(core):
+    calls = []
+    tr = core.WhisperXTranscriber(diar_window=10.0, diar_overlap=2.0)
+    tr._diarize = lambda chunk, **kw: calls.append(kw) or "whole"
+    assert tr._diarize_audio(np.zeros(5 * SAMPLE_RATE, dtype=np.float32)) == "whole"
+    assert calls == [{}]
+
+
+def test_rerun_after_a_diarization_crash_resumes_from_checkpoints(core, tmp_path, monkeypatch):
+    calls = {"asr": 0, "align": 0, "diarize": 0}
+
+    class Model:
+        def transcribe(self, audio, batch_size):
+            calls["asr"] += 1
+            return {"language": "en",
+                    "segments": [{"start": 0.0, "end": 1.0, "text": "hello there."}]}
+
+    def align(segments, model, meta, audio, device):
+        calls["align"] += 1
+        words = [{"word": "hello", "start": 0.1, "end": 0.4},
+                 {"word": "there.", "start": 0.5, "end": 0.9}]
+        return {"segments": [{"start": 0.0, "end": 1.0, "words": words}]}
+
+    def assign_word_speakers(diar, result, fill_nearest):
+        for seg in result["segments"]:
+            for w in seg["words"]:
+                w["speaker"] = "SPEAKER_00"
+        return result
+
+    def diarize(audio):
+        calls["diarize"] += 1
+        if calls["diarize"] == 1:
+            raise RuntimeError("diarizer crashed")
+        return pd.DataFrame([(0.0, 1.0, "SPEAKER_00")], columns=["start", "end", "speaker"])
+
+    core.whisperx.load_model = lambda *a, **k: Model()
+    core.whisperx.load_align_model = lambda language_code, device: (object(), {})
+    core.whisperx.align = align
+    core.whisperx.assign_word_speakers = assign_word_speakers
+    monkeypatch.setattr(core, "load_audio",
+                        lambda path, writable=False: np.zeros(SAMPLE_RATE, dtype=np.float32))
+    audio = tmp_path / "a.wav"
+    audio.write_bytes(b"fake audio")
+    ckpt_dir = tmp_path / "ckpt"
+    tr = core.WhisperXTranscriber()
+    tr._diarize = diarize
+
+    with pytest.raises(RuntimeError, match="diarizer crashed"):
+        tr.transcribe(str(audio), checkpoint_dir=str(ckpt_dir))
+    words = tr.transcribe(str(audio), checkpoint_dir=str(ckpt_dir))
+
+    assert [(w["word"], w["speaker"]) for w in words] == [("hello", "SPEAKER_00"),
+                                                          ("there.", "SPEAKER_00")]
+    assert calls == {"asr": 1, "align": 1, "diarize": 2}
+    assert list(ckpt_dir.iterdir()) == []  # cleared once the words exist
@@ -3,7 +3,7 @@ import os
 
 import pytest
 
-from tathurell.whisperx_core import WhisperXTranscriber
+from tathurell.whisperx_core import WhisperXTranscriber, split_threads
 
 
 def test_transcribe_accepts_progress_param():
@@ -13,6 +13,15 @@ def test_transcribe_accepts_progress_param():
     assert sig.parameters["progress"].default is None
 
 
+def test_split_threads_never_oversubscribes():
+    assert split_threads(32) == (16, 16)
+    assert split_threads(7) == (3, 4)
+    for total in range(2, 65):
+        asr, diar = split_threads(total)
+        assert asr >= 1 and diar >= 1 and asr + diar == total
+    assert split_threads(1) == (1, 1)  # one core: both stages still get a thread
+
+
 @pytest.mark.skipif(
     not os.environ.get("TATHURELL_E2E"),
     reason="slow real-model run (~2-3 min); set TATHURELL_E2E=1 to enable. "
@@ -27,3 +36,16 @@ def test_transcriber_runs_on_clip_and_reports_progress():
     assert stages == ["transcribing", "aligning", "diarizing", "finishing"]
     # Every word carries a diarization confidence in [0, 1].
     assert all(0.0 <= w["confidence"] <= 1.0 for w in words)
+
+
+@pytest.mark.skipif(
+    not os.environ.get("TATHURELL_E2E"),
+    reason="slow real-model run; set TATHURELL_E2E=1 to enable.",
+)
+def test_concurrent_mode_matches_sequential_words():
+    seq = WhisperXTranscriber().transcribe("dollop_test_a.mp3")
+    stages = []
+    con = WhisperXTranscriber(concurrent=True).transcribe(
+        "dollop_test_a.mp3", progress=stages.append)
+    assert stages == ["transcribing", "aligning", "diarizing", "finishing"]
+    assert [w["word"] for w in con] == [w["word"] for w in seq]
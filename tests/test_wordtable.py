@@ -0,0 +1,75 @@
+import json
+import random
+
+import pytest
+
+from eval.run_bakeoff import words_to_hyp, words_to_rttm
+from tathurell.confidence import word_confidences
+from tathurell.naming import group_by_speaker
+from tathurell.realign import realign_speakers
+from tathurell.sampling import pick_speaker_samples
+from tathurell.wordtable import WordTable
+
+
+def _words(n=200, seed=3, confidence=True):
+    rng = random.Random(seed)
+    out, t = [], 0.0
+    for i in range(n):
+        d = rng.uniform(0.1, 0.6)
+        w = {"word": rng.choice(["so", "we", "out", "of", "yes.", "no?", "ok"]),
+             "start": t, "end": t + d,
+             "speaker": rng.choice(["SPEAKER_00", "SPEAKER_01", "SPEAKER_02", None])}
+        if confidence:
+            w["confidence"] = rng.random()
+        out.append(w)
+        t += d + rng.uniform(0, 0.3)
+    return out
+
+
+def test_round_trips_word_dicts():
+    words = _words()
+    assert WordTable.from_dicts(words).to_dicts() == words
+    bare = _words(confidence=False)
+    table = WordTable.from_dicts(bare)
+    assert table.confidence is None and table.to_dicts() == bare
+    assert json.dumps(table.to_dicts()) == json.dumps(bare)
+
+
+def test_rows_behave_like_word_dicts():
+    words = _words(5)
+    table = WordTable.from_dicts(words)
+    assert [dict(w) for w in table] == words
+    assert table[-1]["speaker"] == words[-1]["speaker"]
+    assert table[0].get("missing", "x") == "x"
+    table[1]["speaker"] = "SPEAKER_09"
+    assert table.speaker_labels()[1] == "SPEAKER_09"
+    with pytest.raises(KeyError):
+        table[0]["color"] = "red"
+    with pytest.raises(IndexError):
+        table[5]
+
+
+def test_hot_functions_accept_a_table():
+    words = _words()
+    table = WordTable.from_dicts(words)
+    diar = [(w["start"], w["end"] + 0.2, w["speaker"] or "SPEAKER_00") for w in words[::4]]
+
+    assert group_by_speaker(table) == group_by_speaker(words)
+    assert pick_speaker_samples(table) == pick_speaker_samples(words)
+    assert word_confidences(table, diar) == word_confidences(words, diar)
+    assert words_to_hyp(table) == words_to_hyp(words)
+    assert words_to_rttm(table, "u") == words_to_rttm(words, "u")
+
+    fixed = realign_speakers(table)
+    assert fixed is not table and table.to_dicts() == words  # default copies
+    assert fixed.to_dicts() == realign_speakers(words)
+    assert realign_speakers(table, inplace=True) is table
+    assert table.to_dicts() == fixed.to_dicts()
+
+
+def test_table_is_smaller_than_dicts():
+    import sys
+
+    words = _words(2000)
+    dict_bytes = sum(sys.getsizeof(w) for w in words) + sys.getsizeof(words)
+    assert WordTable.from_dicts(words).nbytes() < dict_bytes / 2
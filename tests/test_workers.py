@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+
+import pytest
+
+from tathurell.workers import JobCancelled, ProcessWorker
+
+# Factories must be importable from the spawned child, so they live at module
+# level.
+
+WORDS = [
+    {"word": "hi", "start": 0.0, "end": 0.5, "speaker": "SPEAKER_00"},
+    {"word": "there", "start": 0.5, "end": 1.0, "speaker": "SPEAKER_00"},
+    {"word": "bye", "start": 1.5, "end": 2.0, "speaker": "SPEAKER_01"},
+]
+
+
+class Quick:
+    def transcribe(self, audio_path, progress=None):
+        for stage in ("transcribing", "aligning"):
+            progress(stage)
+        return WORDS
+
+
+class Stuck:
+    def transcribe(self, audio_path, progress=None):
+        progress("transcribing")
+        time.sleep(60)
+
+
+class Broken:
+    def transcribe(self, audio_path, progress=None):
+        raise ValueError(f"cannot read {audio_path}")
+
+
+@pytest.fixture
+def worker_for():
+    made = []
+
+    def make(factory, **kw):
+        made.append(ProcessWorker(factory, **kw))
+        return made[-1]
+
+    yield make
+    for w in made:
+        w.close()
+
+
+def test_runs_jobs_in_one_warm_child_and_streams_stages(worker_for):
+    w = worker_for(Quick)
+    stages = []
+    groups, samples, infer_sec = w.run("a.wav", stages.append)
+    assert stages == ["transcribing", "aligning"]
+    assert [g["speaker"] for g in groups] == ["SPEAKER_00", "SPEAKER_01"]
+    assert groups[0]["text"] == "hi there"
+    assert set(samples) == {"SPEAKER_00", "SPEAKER_01"}
+    assert infer_sec >= 0.0
+    pid = w.pid
+    assert pid is not None and pid != os.getpid()
+    w.run("b.wav")
+    assert w.pid == pid and len(w.load_sec) == 1  # models loaded once
+
+
+def test_run_during_preload_waits_for_the_same_child(worker_for):
+    w = worker_for(Quick)
+    start = w._start
+
+    def slow_start():
+        time.sleep(0.5)  # a model load in progress
+        start()
+
+    w._start = slow_start
+    warm = threading.Thread(target=w.preload)
+    warm.start()
+    time.sleep(0.1)
+    groups, _, _ = w.run("a.wav")
+    warm.join(30)
+    assert groups[0]["text"] == "hi there"
+    assert len(w.load_sec) == 1
+
+
+def test_cancel_kills_the_child_and_the_next_job_gets_a_fresh_one(worker_for):
+    w = worker_for(Stuck)
+    started = threading.Event()
+    outcome = []
+
+    def job():
+        try:
+            w.run("a.wav", lambda stage: started.set())
+        except JobCancelled:
+            outcome.append("cancelled")
+
+    t = threading.Thread(target=job)
+    t.start()
+    assert started.wait(30)
+    pid = w.pid
+    w.cancel()
+    t.join(10)
+    assert outcome == ["cancelled"]
+    assert w.pid is None
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
+
+
+def test_cancel_before_dispatch_stays_pending_until_cleared(worker_for):
+    w = worker_for(Quick)
+    w.run("a.wav")
+    w.cancel()  # lands between jobs: kills the idle child
+    with pytest.raises(JobCancelled):
+        w.run("b.wav")
+    assert len(w.load_sec) == 1  # no child spawned for it
+    w.clear_cancel()
+    w.run("c.wav")
+    assert len(w.load_sec) == 2
+
+
+def test_job_errors_are_raised_and_the_child_survives(worker_for):
+    w = worker_for(Broken)
+    with pytest.raises(RuntimeError, match="cannot read x.wav"):
+        w.run("x.wav")
+    pid = w.pid
+    assert pid is not None
+    with pytest.raises(RuntimeError):
+        w.run("y.wav")
+    assert w.pid == pid
+
+
+def test_child_above_rss_ceiling_is_recycled(worker_for):
+    w = worker_for(Quick, max_rss_mb=1)
+    w.run("a.wav")
+    assert w.recycled == 1 and w.pid is None and w.rss_mb > 1
+    w.run("b.wav")
+    assert len(w.load_sec) == 2
+
+
+class Reporting(Quick):
+    def transcribe(self, audio_path, progress=None, events=None):
+        events({"stage": "transcribing", "fraction": 0.5})
+        return super().transcribe(audio_path, progress)
+
+
+def test_progress_events_are_forwarded_from_the_child(worker_for):
+    w = worker_for(Reporting)
+    events = []
+    w.run("a.wav", events=events.append)
+    assert events == [{"stage": "transcribing", "fraction": 0.5}]